@@ -0,0 +1,46 @@
+import functools
+
+import django
+from django.conf import settings
+from django.db import connection, models
+
+from .common import Item, load_items
+
+# Rows inserted per query while filling the table.
+INSERT_BATCH_SIZE = 10_000
+
+
+@functools.cache
+def get_order_model() -> type[models.Model]:
+    # An in-memory database is enough to time converting column values to objects.
+    if not settings.configured:
+        settings.configure(
+            DATABASES={
+                "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+            }
+        )
+        django.setup()
+
+    from dict_model.django import DictModelField
+
+    class Order(models.Model):
+        item = DictModelField(Item)
+        other_item = DictModelField(Item)
+
+        class Meta:
+            app_label = "benchmarks"
+
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(Order)
+    return Order
+
+
+def bench_from_db_value(rows: int):
+    load_items(rows)
+    Order = get_order_model()
+    Order.objects.all().delete()
+    Order.objects.bulk_create(
+        (Order(item=id, other_item=rows + 1 - id) for id in range(1, rows + 1)),
+        batch_size=INSERT_BATCH_SIZE,
+    )
+    return lambda: list(Order.objects.all())
@@ -0,0 +1,33 @@
+import json
+import tempfile
+from pathlib import Path
+
+import dict_model
+
+from .common import Item, get_item_data, load_items
+
+# Benchmarks return the operation to time, having done any setup it needs.
+
+
+def bench_init(rows: int):
+    object_data = get_item_data(rows)
+
+    def init():
+        # `init` consumes the data of each object.
+        Item.init({id: dict(data) for id, data in object_data.items()}, force=True)
+
+    return init
+
+
+def bench_from_json_file(rows: int):
+    path = Path(tempfile.mkdtemp()) / "items.json"
+    path.write_text(
+        json.dumps({"dict_model_name": "Item", "object_data": get_item_data(rows)})
+    )
+    return lambda: dict_model.DictModel.from_json_file(path, force=True)
+
+
+def bench_to_json_file(rows: int):
+    load_items(rows)
+    path = Path(tempfile.mkdtemp()) / "items.json"
+    return lambda: Item.to_json_file(path)
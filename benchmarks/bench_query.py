@@ -0,0 +1,62 @@
+import random
+
+from .common import CATEGORIES, COLORS, Item, load_items
+
+# Lookups repeated within one timed operation, for operations too quick to time alone.
+LOOKUPS = 1000
+
+
+def bench_get_id(rows: int):
+    load_items(rows)
+    ids = random.Random(rows).choices(range(1, rows + 1), k=LOOKUPS)
+
+    def get_id():
+        for id in ids:
+            Item.objects.get(id=id)
+
+    return get_id
+
+
+def bench_filter_exact_indexed(rows: int):
+    load_items(rows)
+    return lambda: len(Item.objects.filter(category=CATEGORIES[0]))
+
+
+def bench_filter_exact(rows: int):
+    load_items(rows)
+    return lambda: len(Item.objects.filter(color=COLORS[0]))
+
+
+def bench_filter_in_indexed(rows: int):
+    load_items(rows)
+    return lambda: len(Item.objects.filter(category__in=CATEGORIES[:5]))
+
+
+def bench_filter_in(rows: int):
+    load_items(rows)
+    return lambda: len(Item.objects.filter(color__in=COLORS[:2]))
+
+
+def bench_order_by_indexed(rows: int):
+    load_items(rows)
+    return lambda: Item.objects.order_by("-rank").first()
+
+
+def bench_order_by(rows: int):
+    load_items(rows)
+    return lambda: len(Item.objects.filter(active=True).order_by("name"))
+
+
+def bench_filter_exact_cached(rows: int):
+    load_items(rows)
+
+    def filter_exact_cached():
+        # Only this benchmark caches queries; the others measure running them.
+        Item.query_cache_size = 1
+        try:
+            for _ in range(LOOKUPS):
+                len(Item.objects.filter(color=COLORS[0]))
+        finally:
+            del Item.query_cache_size, Item._query_cache
+
+    return filter_exact_cached
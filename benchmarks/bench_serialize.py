@@ -0,0 +1,16 @@
+from .common import Item, load_items
+
+
+def bench_to_dict(rows: int):
+    load_items(rows)
+
+    def to_dict():
+        for obj in Item.object_lookup.values():
+            obj.to_dict()
+
+    return to_dict
+
+
+def bench_values_list(rows: int):
+    load_items(rows)
+    return lambda: Item.objects.values_list("name", "rank")
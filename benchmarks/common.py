@@ -0,0 +1,64 @@
+import dataclasses
+import functools
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import dict_model
+
+CATEGORIES = [f"category {number}" for number in range(50)]
+COLORS = ["red", "green", "blue", "cyan", "magenta", "yellow", "black", "white"]
+
+
+@dataclasses.dataclass
+class Item(dict_model.DictModel):
+    """
+    The synthetic model benchmarks load, query and serialize: `category` and `rank`
+    are indexed, `color` is not.
+    """
+
+    name: str
+    category: str
+    color: str
+    rank: int
+    price: Decimal
+    created: datetime
+    active: bool = True
+
+    indexes = ("category", dict_model.SortedIndex("rank"))
+
+
+@functools.lru_cache(maxsize=1)
+def get_item_data(rows: int) -> dict:
+    """
+    Return `object_data` for `rows` items, the same on every run. The data is shared
+    by callers, which must not change it.
+    """
+    randomizer = random.Random(rows)
+    start = datetime(2020, 1, 1)
+    return {
+        id: {
+            "name": f"item {id}",
+            "category": randomizer.choice(CATEGORIES),
+            "color": randomizer.choice(COLORS),
+            "rank": randomizer.randrange(rows),
+            "price": str(Decimal(randomizer.randrange(100_000)) / 100),
+            "created": (start + timedelta(minutes=id)).isoformat(),
+            "active": randomizer.random() < 0.9,
+        }
+        for id in range(1, rows + 1)
+    }
+
+
+def load_items(rows: int) -> None:
+    """
+    Load `rows` items, unless they are loaded (and unchanged) already.
+    """
+    global _loaded
+    if _loaded == (rows, Item.generation):
+        return
+    Item.init(get_item_data(rows), force=True)
+    _loaded = (rows, Item.generation)
+
+
+_loaded = None
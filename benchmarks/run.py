@@ -0,0 +1,147 @@
+"""
+Time the load, query and serialization paths of DictModel on synthetic models, and
+compare the results with a baseline from an earlier run:
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline results.json
+
+Benchmarks are the `bench_*` functions of the `bench_*` modules next to this one.
+Each takes a number of rows, does its setup and returns the operation to time.
+Slower times or higher peak memory than the baseline (beyond `--tolerance`) are
+reported as regressions, and make the run exit with status 1.
+"""
+import argparse
+import importlib
+import json
+import pkgutil
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import typing
+from pathlib import Path
+
+import dict_model
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+# Operations are repeated until they have taken this long in total (or `max_repeat`
+# times), keeping the best time.
+MIN_TOTAL_SECONDS = 1.0
+# Differences smaller than these are noise, however large relative to the baseline.
+NOISE_FLOORS = {"seconds": 0.00001, "peak_bytes": 16 * 1024}
+
+
+def find_benchmarks(
+    selected: typing.Sequence[str] = (),
+) -> typing.Dict[str, typing.Callable]:
+    benchmarks = {}
+    package = Path(__file__).parent
+    for module_info in pkgutil.iter_modules([str(package)]):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"{__package__}.{module_info.name}")
+        for name, function in vars(module).items():
+            if not name.startswith("bench_") or not callable(function):
+                continue
+            name = name.removeprefix("bench_")
+            if not selected or any(part in name for part in selected):
+                benchmarks[name] = function
+    return benchmarks
+
+
+def measure(
+    benchmark: typing.Callable, rows: int, max_repeat: int
+) -> typing.Dict[str, float]:
+    operation = benchmark(rows)
+    times = []
+    while len(times) < max_repeat and sum(times) < MIN_TOTAL_SECONDS:
+        start = time.perf_counter()
+        operation()
+        times.append(time.perf_counter() - start)
+
+    # Tracing allocations slows everything down, so memory is measured on its own run.
+    tracemalloc.start()
+    try:
+        operation()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": min(times),
+        "median_seconds": statistics.median(times),
+        "repeat": len(times),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> typing.List[str]:
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric, noise_floor in NOISE_FLOORS.items():
+            limit = base[metric] * (1 + tolerance) + noise_floor
+            if result[metric] > limit:
+                regressions.append(
+                    f"{key}: {metric} {base[metric]:.6g} -> {result[metric]:.6g}"
+                )
+    return regressions
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="numbers of rows"
+    )
+    parser.add_argument(
+        "--only", nargs="+", default=(), help="run benchmarks with these in their name"
+    )
+    parser.add_argument("--max-repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare with this JSON file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="fraction by which results may exceed the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    results = {}
+    for rows in args.sizes:
+        for name, benchmark in find_benchmarks(args.only).items():
+            key = f"{name}[{rows}]"
+            results[key] = result = measure(benchmark, rows, args.max_repeat)
+            print(
+                f"{key:40} {result['seconds'] * 1000:12.3f} ms "
+                f"{result['peak_bytes'] / 2**20:10.1f} MiB peak",
+                flush=True,
+            )
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "dict_model_version": dict_model.__version__,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
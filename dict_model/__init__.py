@@ -1,19 +1,40 @@
+import asyncio
+import contextlib
 import dataclasses
+import enum
 import functools
+import itertools
 import json
 import re
+import threading
 import typing
 from copy import copy
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
 from pathlib import Path
 
 from django.utils.functional import classproperty
 
-from . import deserializers, lookup, serializers
+from . import (
+    deserializers,
+    instrumentation,
+    lazy,
+    lookup,
+    mapped,
+    records,
+    serializers,
+    snapshots,
+)
+from .indexes import HashIndex, IdIndex, SortedIndex, build_index
+from .query_cache import QueryCache
 from .query_sets import DictModelQuerySet
+from .schema import DictModelSchema
+from .sequences import IdSequence
 
 __version__ = "0.0.8"
 
+SNAKE_CASE_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
+
 
 @dataclasses.dataclass
 class DictModelObjectManager:
@@ -25,18 +46,78 @@ class DictModelObjectManager:
 
     def all(self) -> "DictModelQuerySet":
         return DictModelQuerySet(
-            sorted(
-                [obj for obj in self.dict_model_class.object_lookup.values()],
-                key=lambda obj: obj.id,
-            ),
-            dict_model_class=self.dict_model_class,
+            dict_model_class=self.dict_model_class, covers_dict_model=True
         )
 
+    def bulk_create(
+        self,
+        objs: typing.Iterable["DictModel"],
+        batch_size: typing.Optional[int] = None,
+    ) -> typing.List["DictModel"]:
+        model = self.dict_model_class
+        if not model.has_been_initialized:
+            model.init()
+
+        objs = list(objs)
+        model._check_index_values(objs)
+        model._assign_ids(objs)
+        batch_size = batch_size or len(objs) or 1
+        for start in range(0, len(objs), batch_size):
+            end = start + batch_size
+            model._save_objects_data(objs[start:end])
+        return objs
+
+    def bulk_delete(self, objs: typing.Iterable["DictModel"]) -> int:
+        ids = list(dict.fromkeys(obj.id for obj in objs))
+        self.dict_model_class._delete_objects_data(ids)
+        return len(ids)
+
+    def bulk_update(
+        self, objs: typing.Iterable["DictModel"], fields: typing.Iterable[str]
+    ) -> int:
+        """
+        Save the given `fields` of `objs`, updating only the indexes on those fields.
+        Objects that are not the saved instances have the fields copied over to them.
+        """
+        model = self.dict_model_class
+        fields = tuple(fields)
+        model._validate_update_fields(fields)
+        objs = list(objs)
+        model._check_index_values(objs, fields)
+
+        saved_objs = []
+        for obj in objs:
+            try:
+                saved_obj = model.object_lookup[obj.id]
+            except KeyError:
+                raise DictModel.NotPersisted(obj.id)
+            if saved_obj is not obj:
+                for field in fields:
+                    setattr(saved_obj, field, getattr(obj, field))
+            saved_objs.append(saved_obj)
+
+        model._reindex(saved_objs, fields)
+        return len(saved_objs)
+
     def create(self, **kwargs) -> "DictModel":
         obj = self.dict_model_class(**kwargs)
         obj.save()
         return obj
 
+    async def acreate(self, **kwargs) -> "DictModel":
+        obj = self.dict_model_class(**kwargs)
+        await obj.asave()
+        return obj
+
+    async def acount(self) -> int:
+        return await self.all().acount()
+
+    async def afirst(self) -> typing.Optional["DictModel"]:
+        return await self.all().afirst()
+
+    async def aget(self, **kwargs) -> "DictModel":
+        return await self.all().aget(**kwargs)
+
     def exclude(self, **kwargs) -> "DictModelQuerySet":
         return self.all().exclude(**kwargs)
 
@@ -52,9 +133,25 @@ class DictModelObjectManager:
     def last(self, **kwargs) -> typing.Optional["DictModel"]:
         return self.all().last()
 
+    def order_by(self, field: str) -> "DictModelQuerySet":
+        return self.all().order_by(field)
+
+    def query_stats(self) -> instrumentation.QueryStats:
+        """
+        Return the totals of the queries run against the objects of the model since
+        `instrumentation.collect_stats` was called.
+        """
+        return instrumentation.get_stats(self.dict_model_class)
+
+    def values(self, *fields: str) -> typing.List[dict]:
+        return self.all().values(*fields)
+
+    def values_list(self, *fields: str, flat: bool = False) -> list:
+        return self.all().values_list(*fields, flat=flat)
+
 
 @dataclasses.dataclass(kw_only=True)
-class DictModel:
+class DictModel(metaclass=lazy.DictModelMeta):
     class AlreadyInitialized(Exception):
         pass
 
@@ -79,8 +176,43 @@ class DictModel:
     class NotPersisted(Exception):
         pass
 
+    class UnknownField(Exception):
+        pass
+
+    class UnknownIndexField(Exception):
+        pass
+
+    class CannotUpdatePrimaryKey(Exception):
+        pass
+
+    class IncompatibleSnapshot(Exception):
+        pass
+
+    class IncompatibleMappedFile(Exception):
+        pass
+
+    class ReadOnlyModel(Exception):
+        pass
+
     objects = DictModelObjectManager()
 
+    # Fields to index: a field name for a `HashIndex` (equality and `__in` filters), or
+    # a `SortedIndex` (also comparison and range filters, and `order_by`).
+    indexes: typing.ClassVar[
+        typing.Tuple[typing.Union[str, HashIndex, SortedIndex], ...]
+    ] = ()
+
+    # Whether saving and deleting objects changes copies of `object_lookup` and the
+    # indexes, published together once done, rather than changing them in place. Each
+    # write then takes time in proportion to the number of objects, but queries never
+    # see a write halfway done, and need no locks to run while other threads write.
+    copy_on_write: typing.ClassVar[bool] = False
+
+    # How many query results to keep, for the most recently used queries, so running
+    # the same query again is a lookup until the objects change. Cached results are
+    # kept as tuples, and copied into a list for each query set. `0` keeps none.
+    query_cache_size: typing.ClassVar[int] = 0
+
     id: typing.Optional[int] = None
 
     @classmethod
@@ -88,22 +220,16 @@ class DictModel:
         cls,
         object_data: typing.Optional[typing.Union[list, dict]] = None,
         force: bool = False,
+        lazy: bool = False,
+        lazy_rows: bool = False,
     ) -> type["DictModel"]:
-        if not force and cls.has_been_initialized:
-            raise DictModel.AlreadyInitialized(cls.__name__)
-
-        # Do not share a single instance of `DictModelObjectManager` across all classes.
-        cls.objects = copy(cls.objects)
-
-        cls.objects.assign(cls)
-        lookup.set_dict_model_class(cls.__name__, cls)
-
-        cls_object_data = getattr(cls, "object_data", None)
-        if cls_object_data is None:
-            cls_object_data = {}
-        else:
-            delattr(cls, "object_data")
-
+        """
+        Load the objects of the class from `object_data` and its `object_data`
+        attribute. When `lazy`, the objects are only loaded when first needed: on
+        the first use of `objects`, `object_lookup` or a lookup constant. When
+        `lazy_rows`, each object is only created from its data when first read.
+        """
+        cls_object_data = cls._start_init(force)
         if object_data:
             if isinstance(object_data, dict):
                 cls_object_data = cls_object_data or {}
@@ -124,34 +250,230 @@ class DictModel:
         else:
             object_data = cls_object_data
 
-        cls.object_lookup = {}
+        load = functools.partial(
+            cls._load_object_data, cls._get_object_items(object_data), lazy_rows
+        )
+        return cls._defer_load(load) if lazy else load()
+
+    @classmethod
+    def _register(cls, force: bool) -> None:
+        if not force and cls.has_been_initialized:
+            raise DictModel.AlreadyInitialized(cls.__name__)
+
+        # A new init replaces a deferred one, unless it is the deferred one running.
+        pending_init = cls.__dict__.get("_pending_init")
+        if pending_init is not None and not pending_init.running:
+            delattr(cls, "_pending_init")
+
+        # Do not share a single instance of `DictModelObjectManager` across all classes.
+        cls.objects = copy(cls.objects)
+        # Keep the lock writers may be holding when initializing again.
+        if "_write_lock" not in cls.__dict__:
+            cls._write_lock = threading.Lock()
+
+        cls.objects.assign(cls)
+        lookup.set_dict_model_class(cls.__name__, cls)
+
+    @classmethod
+    def _defer_load(cls, load: typing.Callable[[], typing.Any]) -> type["DictModel"]:
+        # Replace the objects of an earlier init (or of the parent class), so that
+        # reading them runs `load`.
+        for name in lazy.LAZY_ATTRIBUTE_NAMES:
+            setattr(cls, name, lazy.LazyAttribute(name))
+        cls._pending_init = lazy.PendingInit(load, cls)
+        cls.set_has_been_initialized(True)
+        return cls
+
+    @classmethod
+    def _start_init(cls, force: bool) -> typing.Union[list, dict]:
+        """
+        Register the class and return (and remove) the `object_data` it declares.
+        """
+        cls._register(force)
+        cls_object_data = getattr(cls, "object_data", None)
+        if cls_object_data is None:
+            return {}
+        delattr(cls, "object_data")
+        return cls_object_data
+
+    @staticmethod
+    def _get_object_items(
+        object_data: typing.Union[list, dict]
+    ) -> typing.Iterable[typing.Tuple[typing.Optional[int], dict]]:
         if isinstance(object_data, dict):
-            for id, data in object_data.items():
-                obj = cls.from_dict({**{"id": data.pop("id", id)}, **data})
-                cls._save_object_data(cls, obj)
+            return object_data.items()
         elif isinstance(object_data, list):
-            for idx, data in enumerate(object_data):
-                obj = cls.from_dict({**{"id": data.pop("id", idx + 1)}, **data})
-                cls._save_object_data(cls, obj)
-        else:
-            raise DictModel.MismatchedObjectDataFormat(str(object_data))
+            return enumerate(object_data, start=1)
+        raise DictModel.MismatchedObjectDataFormat(str(object_data))
 
+    @classmethod
+    def _load_object_data(
+        cls,
+        object_items: typing.Iterable[typing.Tuple[typing.Optional[int], dict]],
+        lazy_rows: bool = False,
+    ) -> type["DictModel"]:
+        """
+        Replace the objects of the class with ones created from `(id, data)` pairs,
+        where an `id` in `data` takes precedence. The pairs are consumed one at a time,
+        so they can be streamed. When `lazy_rows`, the data is kept as it is and each
+        object is only created when first read.
+        """
+        # Recompute the schema, in case the class changed since it was last used.
+        cls._schema = DictModelSchema.from_dict_model_class(cls)
+        indexes = cls._build_indexes()
+
+        # Indexes are built in bulk, once all objects have been loaded.
+        id_sequence = IdSequence()
+        cls._lookup_constant_ids = {}
         cls.set_has_been_initialized(True)
+        # The objects are only published once all are loaded, so other threads keep
+        # querying the objects loaded before until then. Queries run by this thread,
+        # as objects may refer to each other, read the objects loaded so far.
+        if lazy_rows:
+            object_lookup = records.RecordLookup(cls)
+            for id, data in object_items:
+                id = data.pop("id", id)
+                if id is None:
+                    id = id_sequence.next_id()
+                else:
+                    id_sequence.observe(id)
+                object_lookup.add_record(id, data)
+                cls._set_lookup_constant_for_record(id, data)
+            cls._drop_replaced_lookup_constants()
+            indexes["id"] = IdIndex(sorted(object_lookup))
+            for index in indexes.values():
+                if index.field_name != "id":
+                    index.build(object_lookup.partial_objects(index.field_name))
+        else:
+            object_lookup = {}
+            with lazy.loading(cls, object_lookup):
+                for id, data in object_items:
+                    obj = cls.from_dict({**{"id": data.pop("id", id)}, **data})
+                    if obj.id is None:
+                        obj.id = id_sequence.next_id()
+                    else:
+                        id_sequence.observe(obj.id)
+                    object_lookup[obj.id] = obj
+                    cls._set_lookup_constant(obj)
+            for index in indexes.values():
+                index.build(object_lookup.values())
+
+        cls._id_sequence = id_sequence
+        cls._publish_state(object_lookup, indexes)
+        # Queries run while loading saw only some of the objects.
+        cls._bump_generation()
         return cls
 
+    @classmethod
+    def _build_indexes(cls) -> dict:
+        # Return new, empty indexes for the fields declared in `indexes`.
+        field_name_set = cls._get_schema().field_name_set
+        indexes = {}
+        for declaration in cls.indexes:
+            index = build_index(declaration)
+            if index.field_name not in field_name_set:
+                raise DictModel.UnknownIndexField(f"{cls.__name__}.{index.field_name}")
+            indexes[index.field_name] = index
+        # Keeps the objects in id order, so they never need to be sorted by id.
+        indexes["id"] = IdIndex()
+        return indexes
+
+    @classmethod
+    def from_snapshot(cls, path: typing.Union[str, Path], force: bool = False) -> None:
+        """
+        Initialize a model from a snapshot written by `to_snapshot`. Objects are
+        restored with their stored field values, skipping JSON parsing and
+        deserialization, along with the stored indexes. Snapshots of a model whose
+        fields have changed since are rejected with `IncompatibleSnapshot`.
+
+        Snapshots are pickles, and even their header is unpickled before it is checked:
+        loading a file can run arbitrary code, so only load snapshots written by a
+        trusted process.
+        """
+        cls._start_init(force)
+        cls._schema = DictModelSchema.from_dict_model_class(cls)
+        snapshot = snapshots.read(cls, path)
+        object_lookup = {obj.id: obj for obj in snapshot["objects"]}
+
+        indexes = cls._build_indexes()
+        stored_indexes = snapshot["indexes"]
+        if [(index.__class__, name) for name, index in stored_indexes.items()] != [
+            (index.__class__, name) for name, index in indexes.items()
+        ]:
+            # The declared indexes changed since the snapshot was written.
+            for index in indexes.values():
+                index.build(object_lookup.values())
+            stored_indexes = indexes
+
+        cls._publish_state(object_lookup, stored_indexes)
+        cls._id_sequence = IdSequence(snapshot["last_id"])
+        cls.set_has_been_initialized(True)
+        cls._lookup_constant_ids = {}
+        for lookup_constant, id in snapshot["lookup_constants"]:
+            if not hasattr(cls, lookup_constant):
+                setattr(cls, lookup_constant, object_lookup[id])
+
+    @classmethod
+    def from_mapped_file(
+        cls, path: typing.Union[str, Path], force: bool = False
+    ) -> None:
+        """
+        Initialize a model, read-only, from a file written by `to_mapped_file`. The
+        file is memory-mapped and objects are created from it when accessed, so
+        processes using the same file share its memory. Saving or deleting objects of
+        the model raises `ReadOnlyModel`.
+        """
+        cls._start_init(force)
+        cls._schema = DictModelSchema.from_dict_model_class(cls)
+        object_lookup = mapped.MappedObjectLookup(cls, path)
+
+        indexes = cls._build_indexes()
+        indexes["id"] = IdIndex(object_lookup.ids)
+        for field_name, index in indexes.items():
+            if field_name != "id":
+                index.build(object_lookup.partial_objects(field_name))
+
+        cls._publish_state(object_lookup, indexes)
+        cls._id_sequence = IdSequence(object_lookup.header["last_id"])
+        cls.set_has_been_initialized(True)
+        cls._lookup_constant_ids = dict(object_lookup.header["lookup_constants"])
+        cls._drop_replaced_lookup_constants()
+
+    @classmethod
+    def to_mapped_file(cls, path: typing.Union[str, Path]) -> None:
+        """
+        Write the objects of the model to a columnar file for `from_mapped_file`.
+        """
+        mapped.write(cls, path)
+
+    @classmethod
+    def to_snapshot(cls, path: typing.Union[str, Path]) -> None:
+        """
+        Write the objects of the model, with typed field values, and its indexes to a
+        binary snapshot file for `from_snapshot`. Objects of other models are stored
+        by reference, so those models must be initialized before loading it.
+        """
+        snapshots.write(cls, path)
+
     @classmethod
     def from_dict(cls, dict_data: dict) -> "DictModel":
+        schema = cls._get_schema()
+        field_deserializers = schema.field_deserializers
         field_data = {}
         for field, value in dict_data.items():
-            if field not in cls.field_names:
+            if field not in schema.field_name_set:
                 raise DictModel.CannotDeserializeCustomAttributes(field)
-            field_data[field] = cls.deserialize(value)
+            deserializer = field_deserializers.get(field)
+            field_data[field] = value if deserializer is None else deserializer(value)
         return cls(**field_data)
 
     @classmethod
     def object(cls, child: type["DictModel"]) -> "DictModel":
         # TODO: Cleaner way to get non-standard attributes.
-        field_data = {field: getattr(child, field, None) for field in cls.field_names}
+        field_data = {
+            field: getattr(child, field, None)
+            for field in cls._get_schema().field_names
+        }
         obj = cls(**field_data)
 
         for attr in cls.other_attribute_names + cls.get_custom_attributes_of_child(
@@ -176,49 +498,143 @@ class DictModel:
         else:
             other_attrs = dir(other)
 
-        return sorted(
-            [
-                attr
-                for attr in other_attrs
-                if attr not in dir(cls) and attr not in cls.field_names
-            ]
-        )
+        known_attrs = set(dir(cls)) | cls._get_schema().field_name_set
+        return sorted([attr for attr in other_attrs if attr not in known_attrs])
 
     @classmethod
-    def from_json_file(cls, path: typing.Union[str, Path], **kwargs) -> None:
+    def from_json_file(
+        cls, path: typing.Union[str, Path], lazy: bool = False, **kwargs
+    ) -> None:
         path = Path(path)
-        json_data = json.loads(path.read_text())
+        if lazy and cls is not DictModel:
+            # Do not even read the file until the objects are needed.
+            cls._register(kwargs.get("force", False))
+            cls._defer_load(
+                functools.partial(cls.from_json_file, path, **{**kwargs, "force": True})
+            )
+            return
 
-        dict_model_name = json_data.get("dict_model_name")
-        if cls == DictModel:
-            if not dict_model_name:
-                raise DictModel.NoModelSpecified()
-            dict_model_cls = lookup.get_dict_model_class(dict_model_name)
-        else:
-            if dict_model_name and dict_model_name != cls.__name__:
-                raise DictModel.SpecifiedModelsDoNotMatch(
-                    f"{dict_model_name}, {cls.__name__}"
-                )
-            dict_model_cls = cls
+        json_data = json.loads(path.read_text())
+        dict_model_cls = cls._get_specified_class(json_data.get("dict_model_name"))
 
         object_data = json_data["object_data"]
         # Convert JSON string keys into integers.
         if isinstance(object_data, dict):
             object_data = {int(k): v for k, v in object_data.items()}
 
-        dict_model_cls.init(object_data, **kwargs)
+        dict_model_cls.init(object_data, lazy=lazy, **kwargs)
+
+    @classmethod
+    async def afrom_json_file(cls, path: typing.Union[str, Path], **kwargs) -> None:
+        """
+        Like `from_json_file`, reading, parsing and loading the file in a worker
+        thread, so the event loop keeps running meanwhile.
+        """
+        await asyncio.to_thread(cls.from_json_file, path, **kwargs)
+
+    @classmethod
+    def from_jsonl_file(
+        cls,
+        path: typing.Union[str, Path],
+        force: bool = False,
+        lazy: bool = False,
+        lazy_rows: bool = False,
+    ) -> None:
+        """
+        Initialize a model from a JSON Lines file written by `to_jsonl_file`: a header
+        line (naming the model, if specified) followed by one object per line. Lines
+        are parsed and turned into objects one at a time, so the raw file is never
+        held in memory as a whole. `lazy` and `lazy_rows` work as for `init`; when
+        `lazy`, only the header is read until the objects are needed.
+        """
+        path = Path(path)
+        with path.open() as file:
+            header = json.loads(file.readline() or "{}")
+            dict_model_cls = cls._get_specified_class(header.get("dict_model_name"))
+            if lazy:
+                dict_model_cls._register(force)
+                dict_model_cls._defer_load(
+                    functools.partial(
+                        dict_model_cls.from_jsonl_file,
+                        path,
+                        force=True,
+                        lazy_rows=lazy_rows,
+                    )
+                )
+                return
+            cls_object_data = dict_model_cls._start_init(force)
+            lines = ((None, json.loads(line)) for line in file if line.strip())
+            dict_model_cls._load_object_data(
+                itertools.chain(
+                    dict_model_cls._get_object_items(cls_object_data), lines
+                ),
+                lazy_rows,
+            )
+
+    @classmethod
+    def _get_specified_class(
+        cls, dict_model_name: typing.Optional[str]
+    ) -> type["DictModel"]:
+        # Pick the model a file is loaded into, from the model named in the file and
+        # the class it is loaded through.
+        if cls == DictModel:
+            if not dict_model_name:
+                raise DictModel.NoModelSpecified()
+            return lookup.get_dict_model_class(dict_model_name)
+        if dict_model_name and dict_model_name != cls.__name__:
+            raise DictModel.SpecifiedModelsDoNotMatch(
+                f"{dict_model_name}, {cls.__name__}"
+            )
+        return cls
 
     @classmethod
     def to_json_file(
         cls, path: typing.Union[str, Path], specify_model: bool = True
     ) -> None:
-        path = Path(path)
-        json_data = {
-            "object_data": {id: obj.to_dict() for id, obj in cls.object_lookup.items()},
-        }
+        cls._write_json_file(path, cls.object_lookup.items(), specify_model)
+
+    @classmethod
+    async def ato_json_file(
+        cls, path: typing.Union[str, Path], specify_model: bool = True
+    ) -> None:
+        """
+        Like `to_json_file`, serializing and writing the objects in a worker thread,
+        so the event loop keeps running meanwhile.
+        """
+        # Take the objects on the loop, so saving or deleting objects meanwhile does not
+        # change them while the worker thread reads them.
+        items = list(cls._read_state()[0].items())
+        await asyncio.to_thread(cls._write_json_file, path, items, specify_model)
+
+    @classmethod
+    def _write_json_file(
+        cls,
+        path: typing.Union[str, Path],
+        items: typing.Iterable[typing.Tuple[int, "DictModel"]],
+        specify_model: bool,
+    ) -> None:
+        to_dict = cls._get_to_dict()
+        json_data = {"object_data": {id: to_dict(obj) for id, obj in items}}
         if specify_model:
             json_data["dict_model_name"] = cls.__name__
-        path.write_text(json.dumps(json_data))
+        Path(path).write_text(json.dumps(json_data))
+
+    @classmethod
+    def to_jsonl_file(
+        cls, path: typing.Union[str, Path], specify_model: bool = True
+    ) -> None:
+        """
+        Write the objects to a JSON Lines file, one object per line after a header
+        line, serializing them one at a time.
+        """
+        path = Path(path)
+        to_dict = cls._get_to_dict()
+        header = {"dict_model_name": cls.__name__} if specify_model else {}
+        with path.open("w") as file:
+            file.write(json.dumps(header) + "\n")
+            file.writelines(
+                json.dumps(to_dict(obj)) + "\n" for obj in cls.object_lookup.values()
+            )
 
     @classproperty
     def has_been_initialized(cls) -> bool:
@@ -227,10 +643,21 @@ class DictModel:
     @classmethod
     def set_has_been_initialized(cls, value: bool) -> None:
         cls._has_been_initialized = value
+        # (Re)initializing replaces the objects.
+        cls._bump_generation()
+
+    @classproperty
+    def generation(cls) -> int:
+        """
+        A number that changes whenever objects of the class are saved, deleted,
+        updated or (re)loaded, so values derived from them can be cached until then.
+        """
+        # Read the class' own counter: subclasses change on their own.
+        return cls.__dict__.get("_generation", 0)
 
     @classproperty
     def field_names(cls) -> typing.Iterable:
-        return sorted([field.name for field in dataclasses.fields(cls)])
+        return list(cls._get_schema().field_names)
 
     @classproperty
     def other_attribute_names(cls) -> typing.Iterable:
@@ -238,11 +665,20 @@ class DictModel:
             list(
                 (
                     set(dir(cls))
-                    - set(dir(DictModel))
-                    - set(cls.field_names)
+                    - _get_base_attribute_names()
+                    - cls._get_schema().field_name_set
                     - set(
                         [
+                            "_generation",
                             "_has_been_initialized",
+                            "_id_sequence",
+                            "_indexes",
+                            "_lookup_constant_ids",
+                            "_pending_init",
+                            "_query_cache",
+                            "_schema",
+                            "_state",
+                            "_write_lock",
                             "objects",
                             "object_lookup",
                             "object_data",
@@ -272,46 +708,278 @@ class DictModel:
     def serialize(value: typing.Any) -> typing.Any:
         if isinstance(value, datetime):
             return serializers.datetime(value)
+        elif isinstance(value, date):
+            return serializers.date(value)
+        elif isinstance(value, Decimal):
+            return serializers.decimal(value)
+        elif isinstance(value, enum.Enum):
+            return serializers.enum(value)
         elif isinstance(value, DictModel):
             return serializers.dict_model(value)
         return value
 
     @staticmethod
     def snake_case(text: str) -> str:
-        return re.sub(r"(?<!^)(?=[A-Z])", "_", text).replace(" ", "").lower()
+        return SNAKE_CASE_BOUNDARY.sub("_", text).replace(" ", "").lower()
 
     def delete(self) -> None:
-        try:
-            del self.object_lookup[self.id]
-        except KeyError:
-            raise DictModel.NotPersisted(self.id)
+        self._check_writable()
+        with self._write_state() as (object_lookup, indexes):
+            try:
+                del object_lookup[self.id]
+            except KeyError:
+                raise DictModel.NotPersisted(self.id)
+
+            for index in indexes.values():
+                index.remove(self.id)
+        self._bump_generation()
 
     def save(self) -> None:
         self._save_object_data(self.__class__, self)
 
+    async def asave(self) -> None:
+        # Saving changes the objects and indexes in place, quickly, unless it has to
+        # load the objects of the model first, or copy them (see `copy_on_write`): that
+        # runs in a worker thread.
+        cls = self.__class__
+        if (
+            cls.copy_on_write
+            or not cls.has_been_initialized
+            or "_pending_init" in cls.__dict__
+        ):
+            await asyncio.to_thread(self.save)
+        else:
+            self.save()
+
     @staticmethod
     def _save_object_data(model, obj) -> None:
         if not model.has_been_initialized:
             model.init()
+        model._check_writable()
+        model._check_index_values([obj])
 
         if obj.id is None:
-            if model.object_lookup:
-                obj.id = max(model.object_lookup.keys()) + 1
-            else:
-                obj.id = 1
+            obj.id = model._id_sequence.next_id()
+        else:
+            model._id_sequence.observe(obj.id)
+
+        with model._write_state() as (object_lookup, indexes):
+            object_lookup[obj.id] = obj
+            for index in indexes.values():
+                index.add(obj)
+        model._bump_generation()
 
-        model.object_lookup[obj.id] = obj
+        model._set_lookup_constant(obj)
 
+    @classmethod
+    def _save_objects_data(cls, objs: typing.List["DictModel"]) -> None:
+        # Like `_save_object_data`, but for objects that already have ids, updating the
+        # indexes once for all of them.
+        cls._check_writable()
+        with cls._write_state() as (object_lookup, indexes):
+            object_lookup.update((obj.id, obj) for obj in objs)
+            for index in indexes.values():
+                index.build(objs)
+        cls._bump_generation()
+        for obj in objs:
+            cls._set_lookup_constant(obj)
+
+    @classmethod
+    def _check_index_values(
+        cls,
+        objs: typing.Iterable[typing.Any],
+        field_names: typing.Optional[typing.Iterable[str]] = None,
+    ) -> None:
+        """
+        Raise `TypeError` if the indexes (on `field_names`, by default all) cannot hold
+        the field values of `objs`, before saving them changes anything.
+        """
+        for field_name, index in cls._read_state()[1].items():
+            if field_names is None or field_name in field_names:
+                for obj in objs:
+                    index.check(getattr(obj, field_name))
+
+    @classmethod
+    def _assign_ids(cls, objs: typing.List["DictModel"]) -> None:
+        cls._check_writable()
+        explicit_ids = [obj.id for obj in objs if obj.id is not None]
+        if explicit_ids:
+            cls._id_sequence.observe(max(explicit_ids))
+
+        unsaved = [obj for obj in objs if obj.id is None]
+        for obj, id in zip(unsaved, cls._id_sequence.reserve(len(unsaved))):
+            obj.id = id
+
+    @classmethod
+    def _delete_objects_data(cls, ids: typing.List[int]) -> None:
+        cls._check_writable()
+        with cls._write_state() as (object_lookup, indexes):
+            for id in ids:
+                if id not in object_lookup:
+                    raise DictModel.NotPersisted(id)
+
+            for id in ids:
+                del object_lookup[id]
+            for index in indexes.values():
+                index.remove_many(ids)
+        cls._bump_generation()
+
+    @classmethod
+    def _reindex(
+        cls, objs: typing.List["DictModel"], field_names: typing.Iterable[str]
+    ) -> None:
+        with cls._write_state() as (object_lookup, indexes):
+            for index in indexes.values():
+                if index.field_name in field_names:
+                    index.build(objs)
+        cls._bump_generation()
+
+    @classmethod
+    def _read_state(cls) -> typing.Tuple[typing.Mapping[int, "DictModel"], dict]:
+        """
+        Return the objects and indexes for a query to read, as published together, so
+        they always agree with each other. For `copy_on_write` models, they stay as
+        they are while read.
+        """
+        loading_state = lazy.get_loading_state(cls)
+        if loading_state is not None:
+            return loading_state
+        return cls._state
+
+    @classmethod
+    @contextlib.contextmanager
+    def _write_state(
+        cls,
+    ) -> typing.Iterator[typing.Tuple[typing.MutableMapping[int, "DictModel"], dict]]:
+        """
+        Yield the objects and indexes for a write to change. For `copy_on_write`
+        models, these are copies, published when the write is done (and dropped if it
+        fails); writers take turns.
+        """
+        if not cls.copy_on_write:
+            yield cls.object_lookup, cls._indexes
+            return
+
+        with cls._write_lock:
+            object_lookup, indexes = cls._state
+            object_lookup = object_lookup.copy()
+            indexes = {name: index.copy() for name, index in indexes.items()}
+            yield object_lookup, indexes
+            cls._publish_state(object_lookup, indexes)
+
+    @classmethod
+    def _publish_state(
+        cls, object_lookup: typing.Mapping[int, "DictModel"], indexes: dict
+    ) -> None:
+        # Assigning the pair at once makes it visible to queries all at once.
+        cls._state = (object_lookup, indexes)
+        cls.object_lookup = object_lookup
+        cls._indexes = indexes
+
+    @classmethod
+    def _bump_generation(cls) -> None:
+        cls._generation = cls.generation + 1
+
+    @classmethod
+    def _get_query_cache(cls) -> typing.Optional[QueryCache]:
+        if not cls.query_cache_size:
+            return None
+        # Look in the class' own namespace: subclasses cache their own queries.
+        query_cache = cls.__dict__.get("_query_cache")
+        if query_cache is None:
+            query_cache = cls._query_cache = QueryCache(cls.query_cache_size)
+        return query_cache
+
+    @classmethod
+    def _get_to_dict(cls) -> typing.Callable[["DictModel"], dict]:
+        # Serialize objects with the function compiled for the schema, unless the class
+        # overrides `to_dict`.
+        if cls.to_dict is DictModel.to_dict:
+            return cls._get_schema().to_dict
+        return cls.to_dict
+
+    @classmethod
+    def _get_schema(cls) -> DictModelSchema:
+        # Look in the class' own namespace: subclasses have schemas of their own.
+        schema = cls.__dict__.get("_schema")
+        if schema is None:
+            schema = cls._schema = DictModelSchema.from_dict_model_class(cls)
+        return schema
+
+    @classmethod
+    def _get_lookup_constants(cls) -> typing.List[typing.Tuple[str, int]]:
+        # Return the names and ids of the lookup constants set for current objects.
+        object_lookup = cls.object_lookup
+        lookup_constants = [
+            (name, value.id)
+            for name, value in list(vars(cls).items())
+            if name.isupper()
+            and isinstance(value, cls)
+            and object_lookup.get(value.id) is value
+        ]
+        lookup_constants.extend(
+            (name, id)
+            for name, id in cls.__dict__.get("_lookup_constant_ids", {}).items()
+            if name not in vars(cls) and id in object_lookup
+        )
+        return lookup_constants
+
+    @classmethod
+    def _set_lookup_constant_for_record(cls, id: int, record: dict) -> None:
+        # Like `_set_lookup_constant`, for an object not created yet: the constant is
+        # resolved by id (see `DictModelMeta`), so the object is not needed.
+        try:
+            lookup_constant = cls.snake_case(record["name"]).upper()
+        except (KeyError, TypeError):
+            return
+        if cls._can_set_lookup_constant(lookup_constant):
+            cls._lookup_constant_ids.setdefault(lookup_constant, id)
+
+    @classmethod
+    def _drop_replaced_lookup_constants(cls) -> None:
+        # Remove constants set to objects loaded before that would hide constants now
+        # resolved by id, so they neither hide those nor keep old objects alive.
+        lookup_constant_ids = cls._lookup_constant_ids
+        for name, value in list(vars(cls).items()):
+            if name in lookup_constant_ids and isinstance(value, cls):
+                delattr(cls, name)
+
+    @classmethod
+    def _check_writable(cls) -> None:
+        if isinstance(getattr(cls, "object_lookup", None), mapped.MappedObjectLookup):
+            raise DictModel.ReadOnlyModel(cls.__name__)
+
+    @classmethod
+    def _can_set_lookup_constant(cls, lookup_constant: str) -> bool:
+        # Like `not hasattr(cls, lookup_constant)`, without resolving constants set by
+        # id (which could create the object) or raising (which is slow).
+        if lookup_constant in cls.__dict__.get("_lookup_constant_ids", ()):
+            return False
+        return not any(lookup_constant in vars(klass) for klass in cls.__mro__)
+
+    @classmethod
+    def _set_lookup_constant(cls, obj: "DictModel") -> None:
         # When available, set a constant for quick lookup, based on the `name` attribute
         try:
-            lookup_constant = model.snake_case(obj.name).upper()
-            if not hasattr(model, lookup_constant):
-                setattr(model, lookup_constant, obj)
+            lookup_constant = cls.snake_case(obj.name).upper()
+            if cls._can_set_lookup_constant(lookup_constant):
+                setattr(cls, lookup_constant, obj)
         except AttributeError:
             pass
 
+    @classmethod
+    def _validate_update_fields(cls, field_names: typing.Iterable[str]) -> None:
+        cls._check_writable()
+        for field_name in field_names:
+            if field_name in ("id", "pk"):
+                raise DictModel.CannotUpdatePrimaryKey(field_name)
+            if field_name not in cls._get_schema().field_name_set:
+                raise DictModel.UnknownField(f"{cls.__name__}.{field_name}")
+
     def to_dict(self) -> dict:
-        return {
-            field: DictModel.serialize(getattr(self, field))
-            for field in self.__class__.field_names
-        }
+        return self._get_schema().to_dict(self)
+
+
+@functools.cache
+def _get_base_attribute_names() -> typing.FrozenSet[str]:
+    return frozenset(dir(DictModel))
@@ -1,16 +1,101 @@
+import enum
+import types
 import typing
+from datetime import date as d
 from datetime import datetime as dt
+from decimal import Decimal
 
 from .lookup import get_dict_model_class
 
 if typing.TYPE_CHECKING:
     from . import DictModel
 
+Deserializer = typing.Callable[[typing.Any], typing.Any]
+
+# Values of these types come out of JSON as they are.
+PASSTHROUGH_TYPES = (bool, dict, float, int, str, type(None))
+
+
+def date(value: str) -> d:
+    return d.fromisoformat(value)
+
 
 def datetime(value: str) -> dt:
     return dt.fromisoformat(value)
 
 
+def decimal(value: typing.Union[str, int, float]) -> Decimal:
+    # Go through `str`, so floats give the decimal they print as.
+    return Decimal(str(value))
+
+
 def dict_model(value: typing.Any) -> "DictModel":
     dict_model_cls = get_dict_model_class(value["dict_model_name"])
     return dict_model_cls.objects.get(id=value["id"])
+
+
+def _when(
+    kind: typing.Union[type, typing.Tuple[type, ...]], deserializer: Deserializer
+) -> Deserializer:
+    # Only convert values that are still in their serialized form.
+    return lambda value: deserializer(value) if isinstance(value, kind) else value
+
+
+def _dict_model_reference(value: typing.Any) -> typing.Any:
+    if isinstance(value, dict) and "dict_model_name" in value:
+        return dict_model(value)
+    return value
+
+
+def _enum(enum_cls: typing.Type[enum.Enum]) -> Deserializer:
+    return lambda value: (
+        value if value is None or isinstance(value, enum_cls) else enum_cls(value)
+    )
+
+
+def _list(deserializer: Deserializer) -> Deserializer:
+    return _when(list, lambda value: [deserializer(item) for item in value])
+
+
+def for_type(field_type: typing.Any) -> typing.Optional[Deserializer]:
+    """
+    Return a function turning values loaded from JSON into values of `field_type`, or
+    `None` if no conversion is needed. Types that cannot be told apart up front (`Any`,
+    unions of several convertible types, unresolved annotations) fall back to
+    `DictModel.deserialize`.
+    """
+    from . import DictModel
+
+    if field_type in PASSTHROUGH_TYPES:
+        return None
+
+    origin = typing.get_origin(field_type)
+    if origin in (typing.Union, types.UnionType):
+        arg_types = [
+            arg for arg in typing.get_args(field_type) if arg is not type(None)
+        ]
+        if len(arg_types) == 1:
+            return for_type(arg_types[0])
+        if all(for_type(arg) is None for arg in arg_types):
+            return None
+        return DictModel.deserialize
+    elif origin is list:
+        (item_type,) = typing.get_args(field_type) or (typing.Any,)
+        item_deserializer = for_type(item_type)
+        return None if item_deserializer is None else _list(item_deserializer)
+    elif origin is not None:
+        return None
+
+    if field_type is typing.Any or not isinstance(field_type, type):
+        return DictModel.deserialize
+    elif issubclass(field_type, dt):
+        return _when(str, datetime)
+    elif issubclass(field_type, d):
+        return _when(str, date)
+    elif issubclass(field_type, Decimal):
+        return _when((str, int, float), decimal)
+    elif issubclass(field_type, enum.Enum):
+        return _enum(field_type)
+    elif issubclass(field_type, DictModel):
+        return _dict_model_reference
+    return None
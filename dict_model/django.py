@@ -1,13 +1,55 @@
+import functools
 import typing
+import weakref
 
 from django.db import models
+from django.db.models.lookups import In
 
-from . import DictModel
+from . import DictModel, lazy
 from .lookup import get_dict_model_class
+from .query_sets import DictModelQuerySet
 
 UNSET = "__UNSET__"
 
 
+class DictModelChoices:
+    """
+    The choices of the `DictModelField`s for a model, shared by all of them. They are
+    only read from the model when first used, so declaring fields does not load its
+    objects, and then kept until its objects change (see `DictModel.generation`).
+    """
+
+    def __init__(self, dict_model_class: typing.Type[DictModel]) -> None:
+        self.dict_model_class = dict_model_class
+        self._cache = None
+
+    def __iter__(self) -> typing.Iterator[typing.Tuple]:
+        # Loading deferred objects changes the generation, so do that first.
+        lazy.run_pending_init(self.dict_model_class)
+        generation = self.dict_model_class.generation
+        cache = self._cache
+        if cache is None or cache[0] != generation:
+            choices = DictModelField.get_choices_for_dict_model_class(
+                self.dict_model_class
+            )
+            cache = self._cache = (generation, choices)
+        return iter(cache[1])
+
+    @classmethod
+    def for_dict_model_class(
+        cls, dict_model_class: typing.Type[DictModel]
+    ) -> "DictModelChoices":
+        try:
+            return _DICT_MODEL_CHOICES[dict_model_class]
+        except KeyError:
+            return _DICT_MODEL_CHOICES.setdefault(
+                dict_model_class, cls(dict_model_class)
+            )
+
+
+_DICT_MODEL_CHOICES = weakref.WeakKeyDictionary()
+
+
 class DictModelField(models.IntegerField):
     def __init__(
         self,
@@ -19,12 +61,10 @@ class DictModelField(models.IntegerField):
         if isinstance(dict_model_class, str):
             dict_model_class = get_dict_model_class(dict_model_class)
         if not dict_model_class.has_been_initialized:
-            dict_model_class.init()
+            dict_model_class.init(lazy=True)
         self._dict_model_class = dict_model_class
         if choices == UNSET:
-            kwargs["choices"] = DictModelField.get_choices_for_dict_model_class(
-                dict_model_class
-            )
+            kwargs["choices"] = DictModelChoices.for_dict_model_class(dict_model_class)
         else:
             kwargs["choices"] = choices
         super().__init__(*args, **kwargs)
@@ -36,6 +76,13 @@ class DictModelField(models.IntegerField):
             for obj in dict_model_class.objects.all()
         ]
 
+    def _check_choices(self):
+        # Choices taken from the model are valid by construction; checking them would
+        # load its objects on every management command.
+        if isinstance(self.choices, DictModelChoices):
+            return []
+        return super()._check_choices()
+
     @property
     def non_db_attrs(self):
         return super().non_db_attrs + ("_dict_model_class",)
@@ -47,7 +94,17 @@ class DictModelField(models.IntegerField):
         return value
 
     def deconstruct(self):
-        name, path, args, kwargs = super().deconstruct()
+        # Choices taken from the model are set again when the field is rebuilt; keeping
+        # them out of migrations also keeps migrations from changing with the objects.
+        # They are hidden from Django altogether, which would otherwise list them, and
+        # so load the objects of the model.
+        choices = self.choices
+        if isinstance(choices, DictModelChoices):
+            self.choices = None
+        try:
+            name, path, args, kwargs = super().deconstruct()
+        finally:
+            self.choices = choices
         args = [self._dict_model_class.__name__] + args
         return name, path, args, kwargs
 
@@ -56,7 +113,22 @@ class DictModelField(models.IntegerField):
     ) -> typing.Optional[DictModel]:
         if value is None:
             return value
-        return self._dict_model_class.objects.get(id=int(value))
+        return self._get_object(value)
+
+    def from_db_values(
+        self, values: typing.Iterable[typing.Any]
+    ) -> typing.List[typing.Optional[DictModel]]:
+        """
+        Return the objects for a column of ids, e.g. read with `.values()` or
+        `.values_list()` from an expression Django does not convert, keeping `None`.
+        """
+        object_lookup = self._dict_model_class.object_lookup
+        try:
+            return [
+                None if value is None else object_lookup[int(value)] for value in values
+            ]
+        except KeyError as error:
+            raise DictModelQuerySet.DoesNotExist(str({"id": error.args[0]})) from None
 
     def get_prep_value(self, value: typing.Any) -> int:
         try:
@@ -71,4 +143,72 @@ class DictModelField(models.IntegerField):
         if value is None:
             return value
 
-        return self._dict_model_class.objects.get(id=int(value))
+        return self._get_object(value)
+
+    def _get_object(self, value: typing.Any) -> DictModel:
+        # Read the object by id straight from `object_lookup`, as this runs for every
+        # row Django loads; going through a query set is much slower.
+        id = int(value)
+        try:
+            return self._dict_model_class.object_lookup[id]
+        except KeyError:
+            raise DictModelQuerySet.DoesNotExist(str({"id": id})) from None
+
+
+class DictModelAttributeTransform(models.Transform):
+    """
+    `<field>__dm`, making the rest of a filter on a `DictModelField` a filter on the
+    objects of its model, e.g. `size__dm__active=True` or `size__dm__name__in=[...]`.
+    See `DictModelAttributeLookup`.
+    """
+
+    lookup_name = "dm"
+
+    @property
+    def dict_model_filter_path(self) -> typing.Tuple[str, ...]:
+        # The parts of the filter on the objects read so far: each part after `dm` is
+        # a transform of its own, until the last one (see `get_lookup`).
+        if isinstance(self.lhs, DictModelAttributeTransform):
+            return (*self.lhs.dict_model_filter_path, self.lookup_name)
+        return ()
+
+    def as_sql(self, compiler, connection):
+        # This only collects the filter; in SQL it is the column as is.
+        return compiler.compile(self.lhs)
+
+    def get_lookup(self, lookup_name: str) -> typing.Type[models.Lookup]:
+        return _get_dict_model_attribute_class(DictModelAttributeLookup, lookup_name)
+
+    def get_transform(self, lookup_name: str) -> typing.Type[models.Transform]:
+        return _get_dict_model_attribute_class(DictModelAttributeTransform, lookup_name)
+
+
+class DictModelAttributeLookup(models.Lookup):
+    """
+    The end of a `<field>__dm__<filter>` lookup. The filter runs on the objects of the
+    model in memory (using its indexes) when the query is compiled, and the database
+    only matches the column against their ids, as `<field> IN (<ids>)`.
+    """
+
+    can_use_none_as_rhs = True
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        dict_model_filter = "__".join(
+            (*self.lhs.dict_model_filter_path, self.lookup_name)
+        )
+        dict_model_class = self.lhs.output_field._dict_model_class
+        ids = dict_model_class.objects.filter(
+            **{dict_model_filter: self.rhs}
+        ).values_list("id", flat=True)
+        return In(self.lhs, ids).as_sql(compiler, connection)
+
+
+@functools.cache
+def _get_dict_model_attribute_class(base: type, lookup_name: str) -> type:
+    # Django looks lookups and transforms up by name, as classes: make one for each
+    # part of the filters used.
+    return type(base.__name__, (base,), {"lookup_name": lookup_name})
+
+
+DictModelField.register_lookup(DictModelAttributeTransform)
@@ -0,0 +1,242 @@
+import typing
+from operator import attrgetter
+
+LOOKUP_SEPARATOR = "__"
+MAX_CACHED_PREDICATES = 1024
+
+Predicate = typing.Callable[[typing.Any], bool]
+
+_predicate_cache: typing.Dict[tuple, Predicate] = {}
+
+
+class UnhashableFilters(Exception):
+    pass
+
+
+def _exact(value):
+    return lambda attr: attr == value
+
+
+def _iexact(value):
+    if value is None:
+        # Like Django, matching null case-insensitively means `isnull`.
+        return lambda attr: attr is None
+    value = value.lower()
+    return lambda attr: attr is not None and attr.lower() == value
+
+
+def _in(value):
+    if not isinstance(value, (set, frozenset, dict)):
+        value = tuple(value)
+    try:
+        members = frozenset(value)
+    except TypeError:
+        return lambda attr: attr in value
+
+    def test(attr):
+        try:
+            return attr in members
+        except TypeError:
+            return attr in value
+
+    return test
+
+
+def _gt(value):
+    return lambda attr: attr is not None and attr > value
+
+
+def _gte(value):
+    return lambda attr: attr is not None and attr >= value
+
+
+def _lt(value):
+    return lambda attr: attr is not None and attr < value
+
+
+def _lte(value):
+    return lambda attr: attr is not None and attr <= value
+
+
+def _range(value):
+    low, high = value
+    return lambda attr: attr is not None and low <= attr <= high
+
+
+def _isnull(value):
+    if value:
+        return lambda attr: attr is None
+    return lambda attr: attr is not None
+
+
+def _contains(value):
+    return lambda attr: attr is not None and value in attr
+
+
+def _icontains(value):
+    value = value.lower()
+    return lambda attr: attr is not None and value in attr.lower()
+
+
+def _startswith(value):
+    return lambda attr: attr is not None and attr.startswith(value)
+
+
+def _istartswith(value):
+    value = value.lower()
+    return lambda attr: attr is not None and attr.lower().startswith(value)
+
+
+def _endswith(value):
+    return lambda attr: attr is not None and attr.endswith(value)
+
+
+def _iendswith(value):
+    value = value.lower()
+    return lambda attr: attr is not None and attr.lower().endswith(value)
+
+
+LOOKUPS = {
+    "exact": _exact,
+    "iexact": _iexact,
+    "in": _in,
+    "gt": _gt,
+    "gte": _gte,
+    "lt": _lt,
+    "lte": _lte,
+    "range": _range,
+    "isnull": _isnull,
+    "contains": _contains,
+    "icontains": _icontains,
+    "startswith": _startswith,
+    "istartswith": _istartswith,
+    "endswith": _endswith,
+    "iendswith": _iendswith,
+}
+
+
+def parse_lookup(key: str) -> typing.Tuple[typing.Tuple[str, ...], str]:
+    """
+    Split a filter keyword such as `"related__name__in"` into its attribute path,
+    `("related", "name")`, and its lookup, `"in"`. Keywords without a lookup use
+    `"exact"`.
+    """
+    *path, lookup = key.split(LOOKUP_SEPARATOR)
+    if not path or lookup not in LOOKUPS:
+        path, lookup = [*path, lookup], "exact"
+    return tuple(path), lookup
+
+
+def _getter(path: typing.Tuple[str, ...]) -> typing.Callable[[typing.Any], typing.Any]:
+    if len(path) == 1:
+        return attrgetter(path[0])
+
+    def get(obj):
+        # Like a SQL join, a missing related object compares as null.
+        for attr in path:
+            if obj is None:
+                return None
+            obj = getattr(obj, attr)
+        return obj
+
+    return get
+
+
+def _compile_filter(key: str, value: typing.Any) -> Predicate:
+    path, lookup = parse_lookup(key)
+    get, test = _getter(path), LOOKUPS[lookup](value)
+    return lambda obj: test(get(obj))
+
+
+def _compile(filters: dict, negated: bool) -> Predicate:
+    tests = [_compile_filter(key, value) for key, value in filters.items()]
+
+    if len(tests) == 1 and not negated:
+        return tests[0]
+
+    def predicate(obj) -> bool:
+        for test in tests:
+            if not test(obj):
+                return negated
+        return not negated
+
+    return predicate
+
+
+def _freeze(value: typing.Any) -> typing.Hashable:
+    # Tag values with their types, so filters like `a=[1]` and `a=(1,)`, or `a=1` and
+    # `a=True`, do not share a cache entry.
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_freeze(item) for item in value)
+    elif isinstance(value, (set, frozenset)):
+        return type(value), frozenset(_freeze(item) for item in value)
+    elif isinstance(value, dict):
+        return type(value), frozenset(
+            (_freeze(k), _freeze(v)) for k, v in value.items()
+        )
+    try:
+        hash(value)
+    except TypeError:
+        raise UnhashableFilters(repr(value))
+    return type(value), value
+
+
+def _copy(value: typing.Any) -> typing.Any:
+    # Copy the containers of a filter value, so a cached predicate does not change
+    # along with the objects the caller passed (and may change later).
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    elif type(value) is tuple:
+        return tuple(_copy(item) for item in value)
+    elif isinstance(value, set):
+        return set(value)
+    elif isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    return value
+
+
+def freeze_filters(filters: dict) -> frozenset:
+    """
+    Return a hashable form of the keyword arguments of a `filter` (or `exclude`) call,
+    the same regardless of their order. Values are tagged with their types, so `a=[1]`
+    and `a=(1,)` freeze differently. Raises `UnhashableFilters` if a value cannot be
+    hashed.
+    """
+    return frozenset((k, _freeze(v)) for k, v in filters.items())
+
+
+def compile_filters(filters: dict, negated: bool = False) -> Predicate:
+    """
+    Compile the keyword arguments of a `filter` (or, when `negated`, an `exclude`)
+    call into a single predicate. Predicates are cached by their normalized filters.
+    """
+    try:
+        key = (negated, freeze_filters(filters))
+    except UnhashableFilters:
+        return _compile(filters, negated)
+
+    try:
+        predicate = _predicate_cache.pop(key)
+    except KeyError:
+        predicate = _compile({k: _copy(v) for k, v in filters.items()}, negated)
+        if len(_predicate_cache) >= MAX_CACHED_PREDICATES:
+            _predicate_cache.pop(next(iter(_predicate_cache)), None)
+    # (Re)inserting keeps the most recently used predicates at the end of the cache.
+    _predicate_cache[key] = predicate
+    return predicate
+
+
+def combine(predicates: typing.Sequence[Predicate]) -> Predicate:
+    """
+    Combine several predicates into one that passes when all of them do.
+    """
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def predicate(obj) -> bool:
+        for test in predicates:
+            if not test(obj):
+                return False
+        return True
+
+    return predicate
@@ -0,0 +1,354 @@
+import bisect
+import math
+import typing
+
+if typing.TYPE_CHECKING:
+    from . import DictModel
+
+# Removing more than this many ids from a sorted index at once rebuilds its list in one
+# pass, rather than deleting (and shifting the rest of the list for) each id.
+BULK_REMOVE_THRESHOLD = 64
+
+
+class HashIndex:
+    """
+    Maps each value of a field to the ids of the objects holding it, so equality and
+    `__in` filters on that field do not have to look at every object.
+    """
+
+    lookups = ("exact", "in")
+
+    def __init__(self, field_name: str) -> None:
+        self.field_name = field_name
+        self._ids_by_value = {}
+        # Remember what each object was indexed under, so objects that were changed
+        # in place before being saved again can still be removed from the index.
+        self._value_by_id = {}
+
+    def __len__(self) -> int:
+        return len(self._value_by_id)
+
+    def add(self, obj: "DictModel") -> None:
+        self.remove(obj.id)
+        value = getattr(obj, self.field_name)
+        self._ids_by_value.setdefault(value, set()).add(obj.id)
+        self._value_by_id[obj.id] = value
+
+    def build(self, objects: typing.Iterable["DictModel"]) -> None:
+        objects = {obj.id: obj for obj in objects}
+        self.remove_many([id for id in objects if id in self._value_by_id])
+        ids_by_value, value_by_id = self._ids_by_value, self._value_by_id
+        for id, obj in objects.items():
+            value = getattr(obj, self.field_name)
+            ids_by_value.setdefault(value, set()).add(id)
+            value_by_id[id] = value
+
+    def check(self, value: typing.Any) -> None:
+        """
+        Raise `TypeError` if the index cannot hold `value`, i.e. it is unhashable.
+        """
+        hash(value)
+
+    def copy(self) -> "HashIndex":
+        copied = self.__class__(self.field_name)
+        copied._ids_by_value = {
+            value: set(ids) for value, ids in self._ids_by_value.items()
+        }
+        copied._value_by_id = dict(self._value_by_id)
+        return copied
+
+    def get(self, value: typing.Any) -> typing.Set[int]:
+        return set(self._ids_by_value.get(value, ()))
+
+    def get_many(self, values: typing.Iterable) -> typing.Set[int]:
+        ids = set()
+        for value in values:
+            ids.update(self._ids_by_value.get(value, ()))
+        return ids
+
+    def lookup(
+        self, lookup: str, value: typing.Any
+    ) -> typing.Optional[typing.Set[int]]:
+        """
+        Return the ids of the objects matching `<field>__<lookup>=value`, or `None` if
+        the index cannot serve that lookup.
+        """
+        if lookup == "exact":
+            return self.get(value)
+        elif lookup == "in":
+            return self.get_many(value)
+        return None
+
+    def remove(self, id: int) -> None:
+        try:
+            value = self._value_by_id.pop(id)
+        except KeyError:
+            return
+        ids = self._ids_by_value[value]
+        ids.discard(id)
+        if not ids:
+            del self._ids_by_value[value]
+
+    def remove_many(self, ids: typing.Iterable[int]) -> None:
+        for id in ids:
+            self.remove(id)
+
+
+class SortedIndex:
+    """
+    Keeps `(value, id)` pairs of a field sorted, so comparison and range filters can be
+    answered by binary search and `order_by` on that field can read objects in order.
+
+    Field values must be comparable with each other; `None` values are kept apart and
+    are ordered last (or first, when ordering descending).
+    """
+
+    lookups = ("exact", "in", "gt", "gte", "lt", "lte", "range")
+
+    def __init__(self, field_name: str) -> None:
+        self.field_name = field_name
+        self._entries = []
+        self._null_ids = set()
+        self._value_by_id = {}
+
+    def __len__(self) -> int:
+        return len(self._value_by_id)
+
+    def add(self, obj: "DictModel") -> None:
+        self.remove(obj.id)
+        value = getattr(obj, self.field_name)
+        if value is None:
+            self._null_ids.add(obj.id)
+        else:
+            bisect.insort(self._entries, (value, obj.id))
+        self._value_by_id[obj.id] = value
+
+    def build(self, objects: typing.Iterable["DictModel"]) -> None:
+        objects = {obj.id: obj for obj in objects}
+        self.remove_many(objects.keys())
+        objects = objects.values()
+        for obj in objects:
+            value = getattr(obj, self.field_name)
+            if value is None:
+                self._null_ids.add(obj.id)
+            else:
+                self._entries.append((value, obj.id))
+            self._value_by_id[obj.id] = value
+        # Sorting once is much cheaper than inserting every object in order.
+        self._entries.sort()
+
+    def check(self, value: typing.Any) -> None:
+        """
+        Raise `TypeError` if the index cannot hold `value`, i.e. it cannot be compared
+        with the values held already.
+        """
+        if value is not None:
+            bisect.bisect_left(self._entries, (value,))
+
+    def copy(self) -> "SortedIndex":
+        copied = self.__class__(self.field_name)
+        copied._entries = list(self._entries)
+        copied._null_ids = set(self._null_ids)
+        copied._value_by_id = dict(self._value_by_id)
+        return copied
+
+    def get_range(
+        self,
+        low: typing.Any = None,
+        high: typing.Any = None,
+        include_low: bool = True,
+        include_high: bool = True,
+    ) -> typing.Set[int]:
+        """
+        Return the ids of the objects with values between `low` and `high`. Either
+        bound may be `None` to leave that side open.
+        """
+        start, end = 0, len(self._entries)
+        if low is not None:
+            if include_low:
+                start = bisect.bisect_left(self._entries, (low,))
+            else:
+                start = bisect.bisect_right(self._entries, (low, math.inf))
+        if high is not None:
+            if include_high:
+                end = bisect.bisect_right(self._entries, (high, math.inf))
+            else:
+                end = bisect.bisect_left(self._entries, (high,))
+        return {id for _, id in self._entries[start:end]}
+
+    def get(self, value: typing.Any) -> typing.Set[int]:
+        if value is None:
+            return set(self._null_ids)
+        return self.get_range(value, value)
+
+    def get_many(self, values: typing.Iterable) -> typing.Set[int]:
+        ids = set()
+        for value in values:
+            ids.update(self.get(value))
+        return ids
+
+    def lookup(
+        self, lookup: str, value: typing.Any
+    ) -> typing.Optional[typing.Set[int]]:
+        """
+        Return the ids of the objects matching `<field>__<lookup>=value`, or `None` if
+        the index cannot serve that lookup.
+        """
+        if lookup == "exact":
+            return self.get(value)
+        elif lookup == "in":
+            return self.get_many(value)
+        elif value is None:
+            # Comparisons against null are left to the filters.
+            return None
+        elif lookup == "gt":
+            return self.get_range(low=value, include_low=False)
+        elif lookup == "gte":
+            return self.get_range(low=value)
+        elif lookup == "lt":
+            return self.get_range(high=value, include_high=False)
+        elif lookup == "lte":
+            return self.get_range(high=value)
+        elif lookup == "range":
+            low, high = value
+            return self.get_range(low, high)
+        return None
+
+    def ordered_ids(self, reverse: bool = False) -> typing.Iterator[int]:
+        """
+        Yield the ids of all indexed objects ordered by value, matching what a stable
+        sort of objects in id order would give: objects with equal values stay in id
+        order, also when `reverse`.
+        """
+        if not reverse:
+            yield from (id for _, id in self._entries)
+            yield from sorted(self._null_ids)
+            return
+
+        yield from sorted(self._null_ids)
+        end = len(self._entries)
+        while end:
+            value = self._entries[end - 1][0]
+            start = bisect.bisect_left(self._entries, (value,), hi=end)
+            yield from (id for _, id in self._entries[start:end])
+            end = start
+
+    def remove(self, id: int) -> None:
+        try:
+            value = self._value_by_id.pop(id)
+        except KeyError:
+            return
+        if value is None:
+            self._null_ids.discard(id)
+            return
+        position = bisect.bisect_left(self._entries, (value, id))
+        del self._entries[position]
+
+    def remove_many(self, ids: typing.Iterable[int]) -> None:
+        ids = {id for id in ids if id in self._value_by_id}
+        if len(ids) <= BULK_REMOVE_THRESHOLD:
+            for id in ids:
+                self.remove(id)
+            return
+
+        for id in ids:
+            if self._value_by_id.pop(id) is None:
+                self._null_ids.discard(id)
+        self._entries = [entry for entry in self._entries if entry[1] not in ids]
+
+
+class IdIndex:
+    """
+    Keeps the ids of all objects sorted, so objects can be read in id order without
+    sorting `object_lookup`. New objects usually get the highest id so far, in which
+    case adding them is a plain append.
+    """
+
+    field_name = "id"
+    lookups = ("gt", "gte", "lt", "lte", "range")
+
+    def __init__(self, ids: typing.Optional[typing.Sequence[int]] = None) -> None:
+        # Ids given up front must already be sorted. Read-only sequences (like the ids
+        # of a mapped file) are fine, as long as no objects are added or removed.
+        self._ids = [] if ids is None else ids
+
+    def __iter__(self) -> typing.Iterator[int]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __reversed__(self) -> typing.Iterator[int]:
+        return reversed(self._ids)
+
+    def add(self, obj: "DictModel") -> None:
+        if not self._ids or obj.id > self._ids[-1]:
+            self._ids.append(obj.id)
+            return
+        position = bisect.bisect_left(self._ids, obj.id)
+        if position == len(self._ids) or self._ids[position] != obj.id:
+            self._ids.insert(position, obj.id)
+
+    def build(self, objects: typing.Iterable["DictModel"]) -> None:
+        ids = sorted({obj.id for obj in objects})
+        if not self._ids or not ids or ids[0] > self._ids[-1]:
+            self._ids.extend(ids)
+        else:
+            self._ids = sorted({*self._ids, *ids})
+
+    def check(self, value: typing.Any) -> None:
+        if value is not None:
+            bisect.bisect_left(self._ids, value)
+
+    def copy(self) -> "IdIndex":
+        return self.__class__(list(self._ids))
+
+    def lookup(
+        self, lookup: str, value: typing.Any
+    ) -> typing.Optional[typing.Set[int]]:
+        """
+        Return the ids matching `id__<lookup>=value`, or `None` if the index cannot
+        serve that lookup. (Exact and `__in` lookups go straight to `object_lookup`.)
+        """
+        start, end = 0, len(self._ids)
+        if value is None or lookup not in self.lookups:
+            return None
+        elif lookup == "gt":
+            start = bisect.bisect_right(self._ids, value)
+        elif lookup == "gte":
+            start = bisect.bisect_left(self._ids, value)
+        elif lookup == "lt":
+            end = bisect.bisect_left(self._ids, value)
+        elif lookup == "lte":
+            end = bisect.bisect_right(self._ids, value)
+        elif lookup == "range":
+            low, high = value
+            start = bisect.bisect_left(self._ids, low)
+            end = bisect.bisect_right(self._ids, high)
+        return set(self._ids[start:end])
+
+    def ordered_ids(self, reverse: bool = False) -> typing.Iterator[int]:
+        return reversed(self._ids) if reverse else iter(self._ids)
+
+    def remove(self, id: int) -> None:
+        position = bisect.bisect_left(self._ids, id)
+        if position < len(self._ids) and self._ids[position] == id:
+            del self._ids[position]
+
+    def remove_many(self, ids: typing.Iterable[int]) -> None:
+        ids = set(ids)
+        if len(ids) <= BULK_REMOVE_THRESHOLD:
+            for id in ids:
+                self.remove(id)
+            return
+        self._ids = [id for id in self._ids if id not in ids]
+
+
+def build_index(declaration: typing.Union[str, HashIndex, SortedIndex]):
+    """
+    Return a new, empty index for an entry of `DictModel.indexes`: either a field name,
+    for a `HashIndex`, or an index instance to take the type and field from.
+    """
+    if isinstance(declaration, str):
+        return HashIndex(declaration)
+    return declaration.__class__(declaration.field_name)
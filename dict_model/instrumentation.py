@@ -0,0 +1,188 @@
+import contextlib
+import contextvars
+import dataclasses
+import threading
+import time
+import typing
+import weakref
+
+if typing.TYPE_CHECKING:
+    from . import DictModel
+
+# Whether queries are traced at all: only while stats are collected, a listener is
+# added or queries are recorded. Query sets check this before anything else, so queries
+# cost (next to) nothing extra otherwise.
+enabled = False
+
+_lock = threading.Lock()
+_collecting_stats = False
+_stats = weakref.WeakKeyDictionary()
+_listeners = []
+_recorder_count = 0
+# The lists `record_queries` collects queries into, for the current thread or task.
+_recorders = contextvars.ContextVar("recorders", default=())
+
+
+@dataclasses.dataclass(frozen=True)
+class QueryEvent:
+    """
+    A query run against the objects of a model. `filters` holds a `(kwargs, negated)`
+    pair per `filter` or `exclude` step. A `full_scan` is a query that checked every
+    object, as neither primary key filters nor indexes narrowed it down.
+    """
+
+    dict_model_class: type["DictModel"]
+    filters: tuple
+    ordering: tuple
+    full_scan: bool
+    rows_scanned: int
+    rows_returned: int
+    seconds: float
+
+
+@dataclasses.dataclass
+class QueryStats:
+    """
+    Totals of the queries run against the objects of a model.
+    """
+
+    queries: int = 0
+    full_scans: int = 0
+    rows_scanned: int = 0
+    rows_returned: int = 0
+    seconds: float = 0.0
+
+    def add(self, event: QueryEvent) -> None:
+        self.queries += 1
+        self.full_scans += event.full_scan
+        self.rows_scanned += event.rows_scanned
+        self.rows_returned += event.rows_returned
+        self.seconds += event.seconds
+
+
+class QueryTrace:
+    """
+    Counts the objects a query checks and returns, and reports the query once it has
+    returned them all, or stopped early.
+    """
+
+    def __init__(
+        self, dict_model_class: type["DictModel"], filters: tuple, ordering: tuple
+    ) -> None:
+        self.dict_model_class = dict_model_class
+        self.filters = filters
+        self.ordering = ordering
+        self.full_scan = False
+        self.rows_scanned = 0
+        self.rows_returned = 0
+        self.start = time.perf_counter()
+
+    def finish(self) -> None:
+        report(
+            QueryEvent(
+                dict_model_class=self.dict_model_class,
+                filters=self.filters,
+                ordering=self.ordering,
+                full_scan=self.full_scan,
+                rows_scanned=self.rows_scanned,
+                rows_returned=self.rows_returned,
+                seconds=time.perf_counter() - self.start,
+            )
+        )
+
+    def returned(
+        self, objs: typing.Iterable["DictModel"]
+    ) -> typing.Iterator["DictModel"]:
+        try:
+            for obj in objs:
+                self.rows_returned += 1
+                yield obj
+        finally:
+            self.finish()
+
+    def scanned(
+        self, objs: typing.Iterable["DictModel"]
+    ) -> typing.Iterator["DictModel"]:
+        for obj in objs:
+            self.rows_scanned += 1
+            yield obj
+
+
+def add_listener(
+    callback: typing.Callable[[QueryEvent], typing.Any], threshold: float = 0.0
+) -> None:
+    """
+    Call `callback` with each query, of any model, taking at least `threshold` seconds.
+    """
+    global _listeners
+    with _lock:
+        _listeners = [*_listeners, (callback, threshold)]
+        _update_enabled()
+
+
+def remove_listener(callback: typing.Callable[[QueryEvent], typing.Any]) -> None:
+    global _listeners
+    with _lock:
+        _listeners = [listener for listener in _listeners if listener[0] != callback]
+        _update_enabled()
+
+
+@contextlib.contextmanager
+def record_queries(threshold: float = 0.0) -> typing.Iterator[typing.List[QueryEvent]]:
+    """
+    Collect the queries taking at least `threshold` seconds that run within the block,
+    in the current thread (or task), into the list it yields.
+    """
+    global _recorder_count
+    events = []
+    token = _recorders.set((*_recorders.get(), (events, threshold)))
+    with _lock:
+        _recorder_count += 1
+        _update_enabled()
+    try:
+        yield events
+    finally:
+        _recorders.reset(token)
+        with _lock:
+            _recorder_count -= 1
+            _update_enabled()
+
+
+def collect_stats(collect: bool = True) -> None:
+    """
+    Start (or stop) adding up the queries of each model, see `get_stats`.
+    """
+    global _collecting_stats
+    with _lock:
+        _collecting_stats = collect
+        _update_enabled()
+
+
+def get_stats(dict_model_class: type["DictModel"]) -> QueryStats:
+    """
+    Return the totals of the queries of a model, collected since `collect_stats`.
+    """
+    with _lock:
+        return dataclasses.replace(_stats.get(dict_model_class, QueryStats()))
+
+
+def reset_stats() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def report(event: QueryEvent) -> None:
+    if _collecting_stats:
+        with _lock:
+            _stats.setdefault(event.dict_model_class, QueryStats()).add(event)
+    for callback, threshold in _listeners:
+        if event.seconds >= threshold:
+            callback(event)
+    for events, threshold in _recorders.get():
+        if event.seconds >= threshold:
+            events.append(event)
+
+
+def _update_enabled() -> None:
+    global enabled
+    enabled = bool(_collecting_stats or _listeners or _recorder_count)
@@ -0,0 +1,152 @@
+import contextlib
+import threading
+import typing
+
+# Class attributes set when the objects of a `DictModel` are loaded. Reading one of
+# these (or a lookup constant) from a lazily initialized class loads its objects.
+LAZY_ATTRIBUTE_NAMES = frozenset(
+    {"object_lookup", "_id_sequence", "_indexes", "_state"}
+)
+
+# The objects each thread is loading, by class, until they are published: queries the
+# loading thread runs meanwhile (e.g. to resolve references between the objects) read
+# these, while other threads keep reading the objects loaded before.
+_loading = threading.local()
+
+
+@contextlib.contextmanager
+def loading(cls: type, object_lookup: typing.Mapping) -> typing.Iterator[None]:
+    """
+    Have queries the current thread runs on `cls` within the block read the objects
+    in `object_lookup`, which are being loaded (without indexes, until built).
+    """
+    states = _loading.__dict__.setdefault("states", {})
+    previous = states.get(cls)
+    states[cls] = (object_lookup, {})
+    try:
+        yield
+    finally:
+        if previous is None:
+            del states[cls]
+        else:
+            states[cls] = previous
+
+
+def get_loading_state(cls: type) -> typing.Optional[tuple]:
+    """
+    Return the objects (and indexes) the current thread is loading for `cls`, if any.
+    """
+    states = getattr(_loading, "states", None)
+    return states.get(cls) if states else None
+
+
+class PendingInit:
+    """
+    A deferred load of the objects of a `DictModel` class, run once, by the first
+    thread to need them; other threads needing them meanwhile wait for it.
+
+    While loading, the attributes in `LAZY_ATTRIBUTE_NAMES` the load sets on `cls`
+    are `staged`, for only the loading thread to see, and set on `cls` once the load
+    is done, so other threads never see the objects half loaded.
+    """
+
+    def __init__(
+        self, load: typing.Callable[[], typing.Any], cls: typing.Optional[type] = None
+    ) -> None:
+        self._load = load
+        self._lock = threading.RLock()
+        self._loading_thread = None
+        self.cls = cls
+        self.done = False
+        self.running = False
+        self.staged = {}
+
+    def is_loading(self) -> bool:
+        """
+        Return whether the current thread is running the load.
+        """
+        return self._loading_thread == threading.get_ident()
+
+    def run(self) -> bool:
+        """
+        Load the objects, unless that already happened, and return whether they have
+        been loaded. They have not yet when this is called again while loading them,
+        by the thread loading them.
+        """
+        with self._lock:
+            if not self.done and not self.running:
+                self.running = True
+                self._loading_thread = threading.get_ident()
+                self.staged = {}
+                try:
+                    self._load()
+                    for name, value in self.staged.items():
+                        type.__setattr__(self.cls, name, value)
+                    self.done = True
+                finally:
+                    self.running = False
+                    self._loading_thread = None
+                    self.staged = {}
+            return self.done
+
+
+class LazyAttribute:
+    """
+    Stands in for an attribute in `LAZY_ATTRIBUTE_NAMES` of a lazily initialized
+    class until its objects are loaded: reading it loads them (or waits for the thread
+    loading them). It also hides the value the parent class may have.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: typing.Any, owner: type) -> typing.Any:
+        pending_init = owner.__dict__.get("_pending_init")
+        if pending_init is not None:
+            if pending_init.is_loading():
+                # The thread loading the objects sees them as they are loaded.
+                if self.name in pending_init.staged:
+                    return pending_init.staged[self.name]
+            elif run_pending_init(owner):
+                return getattr(owner, self.name)
+        raise AttributeError(
+            f"type object {owner.__name__!r} has no attribute {self.name!r}"
+        )
+
+
+def run_pending_init(cls: type) -> bool:
+    """
+    Load the objects of a lazily initialized class, if they are not yet, and return
+    whether that happened (now or before).
+    """
+    pending_init = cls.__dict__.get("_pending_init")
+    if pending_init is None or not pending_init.run():
+        return False
+    if cls.__dict__.get("_pending_init") is pending_init:
+        delattr(cls, "_pending_init")
+    return True
+
+
+class DictModelMeta(type):
+    def __getattr__(cls, name: str) -> typing.Any:
+        # Only called for attributes that are not set (yet).
+        if name.isupper() and run_pending_init(cls):
+            return getattr(cls, name)
+
+        # Lookup constants of objects that may not exist yet (or only while in use)
+        # are kept as ids, and resolved when read.
+        lookup_constant_ids = cls.__dict__.get("_lookup_constant_ids")
+        if lookup_constant_ids and name in lookup_constant_ids:
+            try:
+                return cls.object_lookup[lookup_constant_ids[name]]
+            except KeyError:
+                pass
+        raise AttributeError(f"type object {cls.__name__!r} has no attribute {name!r}")
+
+    def __setattr__(cls, name: str, value: typing.Any) -> None:
+        if name in LAZY_ATTRIBUTE_NAMES:
+            pending_init = cls.__dict__.get("_pending_init")
+            if pending_init is not None and pending_init.is_loading():
+                pending_init.staged[name] = value
+                return
+        super().__setattr__(name, value)
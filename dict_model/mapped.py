@@ -0,0 +1,252 @@
+import bisect
+import collections.abc
+import json
+import mmap
+import struct
+import types
+import typing
+import weakref
+from array import array
+from pathlib import Path
+
+if typing.TYPE_CHECKING:
+    from . import DictModel
+
+MAGIC = b"DMMAPPED"
+# Bump whenever the layout of mapped files changes; older files are then rejected.
+MAPPED_FILE_VERSION = 1
+# Sections start at multiples of this, so their values can be read in place.
+ALIGNMENT = 8
+HEADER_LENGTH = struct.Struct("<Q")
+INT64_RANGE = range(-(2**63), 2**63)
+# Array type codes of the columns holding fixed-size values.
+FIXED_SIZE_KINDS = {"bool": "b", "int": "q", "float": "d"}
+
+
+def write(dict_model_class: type["DictModel"], path: typing.Union[str, Path]) -> None:
+    """
+    Write the objects of a model to a file for `MappedObjectLookup`: a header, the ids
+    in order, and a column of values (and one of null flags) per field.
+    """
+    schema = dict_model_class._get_schema()
+    object_lookup = dict_model_class.object_lookup
+    objs = [object_lookup[id] for id in sorted(object_lookup)]
+    sections = []
+    position = 0
+
+    def add_section(data: bytes) -> dict:
+        nonlocal position
+        section = {"offset": position, "length": len(data)}
+        sections.append(data + bytes(-len(data) % ALIGNMENT))
+        position += len(sections[-1])
+        return section
+
+    columns = {}
+    for field_name in schema.field_names:
+        if field_name == "id":
+            continue
+        values = [getattr(obj, field_name) for obj in objs]
+        kind = _get_kind(values)
+        nulls = bytes(value is None for value in values)
+        if kind in FIXED_SIZE_KINDS:
+            data = array(FIXED_SIZE_KINDS[kind], (value or 0 for value in values))
+            column = {"values": add_section(data.tobytes())}
+        else:
+            if kind == "json":
+                serializer = schema.field_serializers.get(
+                    field_name, dict_model_class.serialize
+                )
+                values = [serializer(value) for value in values]
+                if all(isinstance(value, str) for value in values if value is not None):
+                    # Values serialized to strings need no JSON encoding.
+                    kind = "text"
+                else:
+                    values = [json.dumps(value) for value in values]
+            encoded = [(value or "").encode() for value in values]
+            offsets = array("Q", [0])
+            for value in encoded:
+                offsets.append(offsets[-1] + len(value))
+            column = {
+                "offsets": add_section(offsets.tobytes()),
+                "values": add_section(b"".join(encoded)),
+            }
+        column.update(kind=kind, nulls=add_section(nulls), has_nulls=any(nulls))
+        columns[field_name] = column
+
+    header = {
+        "version": MAPPED_FILE_VERSION,
+        "dict_model_name": dict_model_class.__name__,
+        "schema_hash": schema.schema_hash,
+        "last_id": dict_model_class._id_sequence.last_id,
+        "lookup_constants": dict_model_class._get_lookup_constants(),
+        "ids": add_section(array("q", (obj.id for obj in objs)).tobytes()),
+        "columns": columns,
+    }
+    header_data = json.dumps(header).encode()
+    with Path(path).open("wb") as file:
+        file.write(MAGIC + HEADER_LENGTH.pack(len(header_data)) + header_data)
+        file.write(bytes(-file.tell() % ALIGNMENT))
+        file.writelines(sections)
+
+
+def _get_kind(values: typing.List[typing.Any]) -> str:
+    # Pick the most compact column type holding all (non-null) values as they are.
+    types = {type(value) for value in values if value is not None}
+    if types == {bool}:
+        return "bool"
+    elif types == {int} and all(v in INT64_RANGE for v in values if v is not None):
+        return "int"
+    elif types == {float}:
+        return "float"
+    elif types == {str}:
+        return "str"
+    return "json"
+
+
+def _identity(value: typing.Any) -> typing.Any:
+    return value
+
+
+class MappedObjectLookup(collections.abc.Mapping):
+    """
+    A read-only `object_lookup` reading objects from a memory-mapped file written by
+    `write`. Objects are created on access and only kept while in use elsewhere, so
+    processes mapping the same file share its pages instead of each holding a copy
+    of every object.
+    """
+
+    def __init__(
+        self, dict_model_class: type["DictModel"], path: typing.Union[str, Path]
+    ) -> None:
+        self._dict_model_class = dict_model_class
+        with Path(path).open("rb") as file:
+            try:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                raise dict_model_class.IncompatibleMappedFile(f"{path}: empty file")
+        view = memoryview(self._mmap)
+
+        magic_end = len(MAGIC)
+        header_start = magic_end + HEADER_LENGTH.size
+        if len(view) < header_start or view[:magic_end] != MAGIC:
+            raise dict_model_class.IncompatibleMappedFile(f"{path}: not a mapped file")
+        (header_length,) = HEADER_LENGTH.unpack(view[magic_end:header_start])
+        header_end = header_start + header_length
+        if len(view) < header_end:
+            raise dict_model_class.IncompatibleMappedFile(f"{path}: truncated file")
+        self.header = header = json.loads(bytes(view[header_start:header_end]))
+        if header["version"] != MAPPED_FILE_VERSION:
+            raise dict_model_class.IncompatibleMappedFile(
+                f"{path}: unsupported version"
+            )
+        elif header["dict_model_name"] != dict_model_class.__name__:
+            raise dict_model_class.IncompatibleMappedFile(
+                f"{path}: written for {header['dict_model_name']}, "
+                f"not {dict_model_class.__name__}"
+            )
+        elif header["schema_hash"] != dict_model_class._get_schema().schema_hash:
+            raise dict_model_class.IncompatibleMappedFile(
+                f"{path}: the fields of the model have changed"
+            )
+
+        data_start = header_end + -header_end % ALIGNMENT
+        self._data = view[data_start:]
+        self.ids = self._get_section(header["ids"], "q")
+        self._readers = [("id", self.ids.__getitem__)] + [
+            (field_name, self._get_reader(field_name, column))
+            for field_name, column in header["columns"].items()
+        ]
+        self._objects = weakref.WeakValueDictionary()
+
+    def __contains__(self, id: typing.Any) -> bool:
+        return self._get_row(id) is not None
+
+    def __getitem__(self, id: int) -> "DictModel":
+        obj = self._objects.get(id)
+        if obj is not None:
+            return obj
+        row = self._get_row(id)
+        if row is None:
+            raise KeyError(id)
+
+        obj = self._dict_model_class.__new__(self._dict_model_class)
+        obj.__dict__.update((name, read(row)) for name, read in self._readers)
+        self._objects[id] = obj
+        return obj
+
+    def __iter__(self) -> typing.Iterator[int]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def partial_objects(
+        self, field_name: str
+    ) -> typing.Iterator[types.SimpleNamespace]:
+        """
+        Yield an object holding only the id and the value of `field_name` for each
+        row, which is much cheaper than creating the objects, e.g. to build indexes.
+        """
+        read = dict(self._readers)[field_name]
+        for row, id in enumerate(self.ids):
+            yield types.SimpleNamespace(**{"id": id, field_name: read(row)})
+
+    def _get_reader(
+        self, field_name: str, column: dict
+    ) -> typing.Callable[[int], typing.Any]:
+        # Return a function reading the value of a field in a given row.
+        nulls = self._get_section(column["nulls"], "B")
+        kind = column["kind"]
+        if kind == "bool":
+            values = self._get_section(column["values"], "b")
+
+            def read(row: int) -> bool:
+                return values[row] == 1
+
+        elif kind in FIXED_SIZE_KINDS:
+            read = self._get_section(
+                column["values"], FIXED_SIZE_KINDS[kind]
+            ).__getitem__
+        else:
+            offsets = self._get_section(column["offsets"], "Q")
+            data = self._get_section(column["values"], "B")
+
+            def read(row: int) -> str:
+                start, end = offsets[row], offsets[row + 1]
+                return str(data[start:end], "utf-8")
+
+            if kind != "str":
+                schema = self._dict_model_class._get_schema()
+                deserializer = schema.field_deserializers.get(field_name, _identity)
+                read_text = read
+                if kind == "text":
+
+                    def read(row: int) -> typing.Any:
+                        return deserializer(read_text(row))
+
+                else:
+
+                    def read(row: int) -> typing.Any:
+                        return deserializer(json.loads(read_text(row)))
+
+        if not column["has_nulls"]:
+            return read
+
+        def read_value(row: int) -> typing.Any:
+            return None if nulls[row] else read(row)
+
+        return read_value
+
+    def _get_row(self, id: typing.Any) -> typing.Optional[int]:
+        if not isinstance(id, int):
+            return None
+        row = bisect.bisect_left(self.ids, id)
+        if row == len(self.ids) or self.ids[row] != id:
+            return None
+        return row
+
+    def _get_section(self, section: dict, type_code: str) -> memoryview:
+        start = section["offset"]
+        end = start + section["length"]
+        return self._data[start:end].cast(type_code)
@@ -0,0 +1,66 @@
+import collections
+import threading
+import typing
+
+from .filters import UnhashableFilters, freeze_filters
+
+
+def get_query_key(filters: tuple, ordering: tuple) -> typing.Optional[tuple]:
+    """
+    Return a hashable signature of a query, the same for queries with the same steps
+    regardless of the order of the keyword arguments of each step, or `None` if a
+    filter value cannot be hashed.
+    """
+    try:
+        return (
+            tuple((freeze_filters(kwargs), negated) for kwargs, negated in filters),
+            ordering,
+        )
+    except UnhashableFilters:
+        return None
+
+
+class QueryCache:
+    """
+    The results of the most recently used queries of a model, by query signature, up
+    to `size` of them. Results are only kept for the `generation` of the model they
+    were computed at: they are all dropped once the objects of the model change.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.generation = None
+        self.hits = 0
+        self.misses = 0
+        self._results = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, generation: int, key: tuple) -> typing.Optional[tuple]:
+        with self._lock:
+            self._set_generation(generation)
+            results = self._results.get(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+            return results
+
+    def set(self, generation: int, key: tuple, results: tuple) -> None:
+        with self._lock:
+            self._set_generation(generation)
+            # Results computed before the objects last changed may be out of date.
+            if generation != self.generation:
+                return
+            self._results[key] = results
+            self._results.move_to_end(key)
+            while len(self._results) > self.size:
+                self._results.popitem(last=False)
+
+    def _set_generation(self, generation: int) -> None:
+        if self.generation is None or generation > self.generation:
+            self._results.clear()
+            self.generation = generation
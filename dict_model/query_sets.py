@@ -1,11 +1,167 @@
+import asyncio
+import contextlib
+import dataclasses
+import types
 import typing
 from collections import UserList
+from operator import attrgetter
+
+from . import instrumentation, lazy
+from .filters import combine, compile_filters, parse_lookup
+from .indexes import IdIndex, SortedIndex
+from .query_cache import get_query_key
+from .schema import get_values
 
 if typing.TYPE_CHECKING:
     from . import DictModel
 
+PK_FIELDS = (("id",), ("pk",))
+PK_LOOKUPS = ("exact", "in")
+# Only walk a sorted index for `order_by` when at least this fraction (1/n) of its
+# objects are candidates; sorting fewer candidates directly is cheaper.
+SORTED_INDEX_MIN_SELECTIVITY = 8
+# Async queries hand control back to the event loop after checking this many objects,
+# so scanning many objects does not hold up other tasks.
+ASYNC_SCAN_BATCH_SIZE = 1000
+
+
+def get_pk_candidates(filters: dict) -> typing.Optional[list]:
+    """
+    Return the ids that primary key filters (`id`, `pk`, `id__in`, `pk__in`) narrow
+    a query down to, in the order given, or `None` if no usable pk filter is present.
+    """
+    ids = None
+    for key, value in filters.items():
+        path, lookup = parse_lookup(key)
+        if path not in PK_FIELDS or lookup not in PK_LOOKUPS:
+            continue
+        values = list(value) if lookup == "in" else [value]
+        try:
+            values = dict.fromkeys(values)
+        except TypeError:
+            # Unhashable values cannot be looked up directly; fall back to a scan.
+            return None
+        ids = values if ids is None else {id: None for id in ids if id in values}
+    return None if ids is None else list(ids)
+
+
+def get_candidate_ids(
+    object_lookup: typing.Mapping[int, "DictModel"],
+    indexes: dict,
+    filters: dict,
+    index_uses: typing.Optional[list] = None,
+) -> typing.Optional[typing.Set[int]]:
+    """
+    Return the ids of the objects in `object_lookup` that can possibly match
+    `filters`, as narrowed down by primary key filters and `indexes`, or `None` if
+    every object has to be checked. When given, `index_uses` gets a `(keys, index,
+    ids)` entry for each lookup narrowing the ids, with `index` `None` for pk filters.
+    """
+    ids = get_pk_candidates(filters)
+    if ids is not None:
+        ids = {id for id in ids if id in object_lookup}
+        if index_uses is not None:
+            lookups = {key: parse_lookup(key) for key in filters}
+            keys = tuple(
+                key
+                for key, (path, lookup) in lookups.items()
+                if path in PK_FIELDS and lookup in PK_LOOKUPS
+            )
+            index_uses.append((keys, None, ids))
+
+    for key, value in filters.items():
+        (field, *related), lookup = parse_lookup(key)
+        index = indexes.get("id" if field == "pk" else field)
+        if related or index is None or lookup not in index.lookups:
+            continue
+        try:
+            matched = index.lookup(lookup, value)
+        except TypeError:
+            continue
+        if matched is not None:
+            ids = matched if ids is None else ids & matched
+            if index_uses is not None:
+                index_uses.append(((key,), index, matched))
+
+    return ids
+
+
+def describe_index(index: typing.Any) -> str:
+    return f"{index.__class__.__name__}({index.field_name!r})"
+
+
+def format_filters(filters: dict) -> str:
+    return ", ".join(f"{key}={value!r}" for key, value in filters.items())
+
+
+@dataclasses.dataclass(frozen=True)
+class IndexUse:
+    """
+    A lookup narrowing down the objects a query checks: the filter `keys` it serves,
+    the index serving them (`"primary key"` for pk filters) and the number of
+    `candidates` it matched. Lookups of `exclude` steps are `negated`; their matches
+    are dropped rather than checked.
+    """
+
+    keys: tuple
+    index: str
+    negated: bool
+    candidates: int
+
+
+@dataclasses.dataclass(frozen=True)
+class QueryPlan:
+    """
+    How a query set runs, as returned by `DictModelQuerySet.explain`. `candidates` is
+    the number of objects the pk filters and indexes narrow the query down to (every
+    object, for a `full_scan`), `residual` holds the filter steps each candidate is
+    still checked against, and `sort` tells how the matches are ordered. The actual
+    `rows_scanned` and `rows_returned` are only known once the query is run, and are
+    `None` otherwise.
+    """
+
+    dict_model_class: type["DictModel"]
+    filters: tuple
+    ordering: tuple
+    full_scan: bool
+    index_uses: typing.Tuple[IndexUse, ...]
+    candidates: int
+    residual: typing.Tuple[str, ...]
+    sort: str
+    rows_scanned: typing.Optional[int] = None
+    rows_returned: typing.Optional[int] = None
+
+    def __str__(self) -> str:
+        lines = [
+            f"{'Full scan' if self.full_scan else 'Index scan'} of "
+            f"{self.dict_model_class.__name__}"
+        ]
+        for use in self.index_uses:
+            keys = ", ".join(use.keys)
+            lines.append(
+                f"  {'exclude' if use.negated else 'filter'} {keys}: {use.index}, "
+                f"{use.candidates} candidates"
+            )
+        candidates = f"  candidates: {self.candidates} estimated"
+        if self.rows_scanned is not None:
+            candidates += f", {self.rows_scanned} actual"
+        lines.append(candidates)
+        lines.extend(f"  check: {step}" for step in self.residual)
+        lines.append(f"  sort: {self.sort}")
+        if self.rows_returned is not None:
+            lines.append(f"  rows: {self.rows_returned}")
+        return "\n".join(lines)
+
 
 class DictModelQuerySet(UserList):
+    """
+    A lazily evaluated list of `DictModel` objects.
+
+    `filter`, `exclude` and `order_by` only record their arguments; the query is run
+    in a single pass, with one combined predicate and the sorting done at the end, the
+    first time the results are needed (iteration, indexing, `len`, `bool`, ...).
+    """
+
     class DoesNotExist(Exception):
         pass
 
@@ -15,10 +171,14 @@ class DictModelQuerySet(UserList):
     class NoDictModelProvided(Exception):
         pass
 
+    class FlatRequiresSingleField(Exception):
+        pass
+
     def __init__(
         self,
         data: typing.Optional[list] = None,
         dict_model_class: typing.Optional[type["DictModel"]] = None,
+        covers_dict_model: bool = False,
     ) -> None:
         data = data or []
         if not dict_model_class:
@@ -27,36 +187,171 @@ class DictModelQuerySet(UserList):
             except IndexError:
                 raise DictModelQuerySet.NoDictModelProvided()
         self._dict_model_class = dict_model_class
-        self.data = data
+        # Whether the query set runs against every object of the model, in which case
+        # `data` is ignored and the objects are read from `object_lookup` (using any
+        # pk filters and indexes to narrow them down) when the query set is evaluated.
+        self._covers_dict_model = covers_dict_model
+        self._source = data
+        self._filters = ()
+        self._ordering = ()
+        self._result_cache = None
+
+    @property
+    def data(self) -> list:
+        results = self._results
+        # Results from the query cache of the model are shared, so they are copied the
+        # first time they could be changed (by a `UserList` method, or through `data`).
+        if isinstance(results, tuple):
+            results = self._result_cache = list(results)
+        return results
+
+    @data.setter
+    def data(self, value: list) -> None:
+        self._result_cache = value
+
+    def __aiter__(self) -> typing.AsyncIterator["DictModel"]:
+        if self._result_cache is not None:
+            return self._abatched(self._result_cache)
+        return self._amatches(self._filters, self._ordering)
+
+    def __copy__(self) -> "DictModelQuerySet":
+        return self._chain()
+
+    def __contains__(self, item: typing.Any) -> bool:
+        return item in self._results
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.__class__(
+                list(self._results[i]), dict_model_class=self._dict_model_class
+            )
+        return self._results[i]
+
+    def __iter__(self) -> typing.Iterator["DictModel"]:
+        return iter(self._results)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    async def acount(self) -> int:
+        if self._result_cache is not None:
+            return len(self._result_cache)
+        count = 0
+        async for _ in self._amatches(self._filters):
+            count += 1
+        return count
+
+    async def afirst(self) -> typing.Optional["DictModel"]:
+        results = aiter(self)
+        async with contextlib.aclosing(results):
+            async for obj in results:
+                return obj
+        return None
+
+    async def aget(self, **kwargs) -> "DictModel":
+        result = None
+        async for obj in self._amatches(self._filters + ((kwargs, False),)):
+            if result:
+                raise DictModelQuerySet.MultipleResultsFound(str(kwargs))
+            result = obj
+
+        if not result:
+            raise DictModelQuerySet.DoesNotExist(str(kwargs))
+
+        return result
 
     def all(self):
         return self
 
+    def delete(self) -> int:
+        count = self._dict_model_class.objects.bulk_delete(self._results)
+        self._result_cache = None
+        return count
+
     def exclude(self, **kwargs) -> "DictModelQuerySet":
-        return DictModelQuerySet(
-            [obj for obj in self.data if not self._passes_filters(obj, **kwargs)],
+        return self._chain(filters=self._filters + ((kwargs, True),))
+
+    def explain(self, analyze: bool = True) -> QueryPlan:
+        """
+        Return how the query set runs: the pk filters and indexes narrowing down the
+        objects to check, the filters left to check them against and how the matches
+        are sorted. When `analyze`, the query is also run (without keeping its
+        results) to count the objects it actually checks and returns.
+        """
+        index_uses = []
+        if not self._covers_dict_model:
+            ids, checks, excluded = None, self._filters, set()
+            sort_index, candidates = None, len(self._source)
+        else:
+            state = self._dict_model_class._read_state()
+            ids, checks, excluded = self._plan(state, self._filters, index_uses)
+            sort_index = self._get_sort_index(self._ordering, ids, state[1])
+            candidates = len(state[0]) if ids is None else len(ids)
+
+        residual = [
+            f"{'exclude' if negated else 'filter'}({format_filters(kwargs)})"
+            for kwargs, negated in checks
+        ]
+        if excluded:
+            residual.append(f"id not in {len(excluded)} excluded ids")
+        if sort_index is not None:
+            sort = f"{describe_index(sort_index)} ({self._ordering[0]})"
+        elif self._ordering:
+            sort = f"sorted({', '.join(self._ordering)})"
+        else:
+            sort = "id order" if self._covers_dict_model else "source order"
+
+        plan = QueryPlan(
             dict_model_class=self._dict_model_class,
+            filters=self._filters,
+            ordering=self._ordering,
+            full_scan=ids is None,
+            index_uses=tuple(
+                IndexUse(
+                    keys=keys,
+                    index="primary key" if index is None else describe_index(index),
+                    negated=negated,
+                    candidates=len(matched),
+                )
+                for keys, index, matched, negated in index_uses
+            ),
+            candidates=candidates,
+            residual=tuple(residual),
+            sort=sort,
+        )
+        if not analyze:
+            return plan
+
+        # Trace the query without reporting it, as it is not one the code runs.
+        trace = self._trace(self._filters, self._ordering)
+        scanned, predicate, _ = self._scan(self._filters, self._ordering, False, trace)
+        if predicate is not None:
+            scanned = filter(predicate, scanned)
+        rows_returned = sum(1 for _ in scanned)
+        return dataclasses.replace(
+            plan, rows_scanned=trace.rows_scanned, rows_returned=rows_returned
         )
 
     def first(self) -> typing.Optional["DictModel"]:
+        # Stop at the first match, unless every match is needed to sort them.
+        if self._result_cache is None and (
+            not self._ordering or self._get_sort_index(self._ordering) is not None
+        ):
+            return next(self._matches(self._filters, self._ordering), None)
         try:
-            return self.data[0]
+            return self._results[0]
         except IndexError:
             return None
 
     def filter(self, **kwargs) -> "DictModelQuerySet":
-        return DictModelQuerySet(
-            [obj for obj in self.data if self._passes_filters(obj, **kwargs)],
-            dict_model_class=self._dict_model_class,
-        )
+        return self._chain(filters=self._filters + ((kwargs, False),))
 
     def get(self, **kwargs) -> "DictModel":
         result = None
-        for obj in self.data:
-            if self._passes_filters(obj, **kwargs):
-                if result:
-                    raise DictModelQuerySet.MultipleResultsFound(str(kwargs))
-                result = obj
+        for obj in self._matches(self._filters + ((kwargs, False),)):
+            if result:
+                raise DictModelQuerySet.MultipleResultsFound(str(kwargs))
+            result = obj
 
         if not result:
             raise DictModelQuerySet.DoesNotExist(str(kwargs))
@@ -64,29 +359,303 @@ class DictModelQuerySet(UserList):
         return result
 
     def last(self) -> typing.Optional["DictModel"]:
+        if self._result_cache is None and not self._ordering:
+            return next(self._matches(self._filters, reverse=True), None)
         try:
-            return self.data[-1]
+            return self._results[-1]
         except IndexError:
             return None
 
+    def values(self, *fields: str) -> typing.List[dict]:
+        """
+        Return a dict of the given fields (by default, all of them) for each match,
+        holding the field values as they are rather than serialized.
+        """
+        fields = fields or self._dict_model_class._get_schema().field_names
+        values = get_values(*self._get_attribute_names(fields))
+        return [dict(zip(fields, values(obj))) for obj in self._iter_results()]
+
+    def values_list(self, *fields: str, flat: bool = False) -> list:
+        """
+        Return a tuple of the given fields (by default, all of them) for each match,
+        or, when `flat`, the values of the single given field.
+        """
+        if flat and len(fields) != 1:
+            raise DictModelQuerySet.FlatRequiresSingleField(str(fields))
+        fields = fields or self._dict_model_class._get_schema().field_names
+        attribute_names = self._get_attribute_names(fields)
+        if flat:
+            return list(map(attrgetter(*attribute_names), self._iter_results()))
+        return list(map(get_values(*attribute_names), self._iter_results()))
+
+    def _chain(self, **plan) -> "DictModelQuerySet":
+        query_set = self.__class__.__new__(self.__class__)
+        query_set.__dict__.update(self.__dict__)
+        for name, value in plan.items():
+            setattr(query_set, f"_{name}", value)
+        query_set._result_cache = None
+        return query_set
+
+    def _candidates(
+        self,
+        ids: typing.Optional[typing.Set[int]],
+        ordering: tuple,
+        sort_index: typing.Optional[typing.Union[IdIndex, SortedIndex]],
+        reverse: bool,
+        state: tuple,
+        snapshot: bool = False,
+    ) -> typing.Iterable["DictModel"]:
+        object_lookup, indexes = state
+        if sort_index is not None:
+            ordered_ids = sort_index.ordered_ids(reverse=ordering[0].startswith("-"))
+            if ids is not None:
+                ordered_ids = (id for id in ordered_ids if id in ids)
+        elif ids is not None:
+            ordered_ids = sorted(ids, reverse=reverse)
+        else:
+            id_index = indexes.get("id")
+            if id_index is None:
+                ordered_ids = sorted(object_lookup, reverse=reverse)
+            else:
+                ordered_ids = id_index.ordered_ids(reverse=reverse)
+        if snapshot:
+            # Objects may be saved or deleted while the candidates are read (by the
+            # caller, or other tasks), which must not change which ids are read: take
+            # them all now, and skip the objects deleted since.
+            objs = map(object_lookup.get, list(ordered_ids))
+            return (obj for obj in objs if obj is not None)
+        return (object_lookup[id] for id in ordered_ids)
+
+    def _evaluate(self) -> typing.Sequence["DictModel"]:
+        if not self._filters and not self._ordering and not self._covers_dict_model:
+            return self._source
+        results = self._get_cached_results()
+        if results is None:
+            results = list(self._matches(self._filters, self._ordering))
+        return results
+
+    def _get_attribute_names(self, fields: typing.Iterable[str]) -> typing.List[str]:
+        field_name_set = self._dict_model_class._get_schema().field_name_set
+        attribute_names = []
+        for field in fields:
+            attribute_name = "id" if field == "pk" else field
+            if attribute_name not in field_name_set:
+                raise self._dict_model_class.UnknownField(field)
+            attribute_names.append(attribute_name)
+        return attribute_names
+
+    def _get_cached_results(self) -> typing.Optional[tuple]:
+        # Return the results of the query from the query cache of the model, running
+        # the query (and caching its results) if needed, or `None` if the model (or
+        # the query) is not cached.
+        if not self._covers_dict_model:
+            return None
+        query_cache = self._dict_model_class._get_query_cache()
+        if query_cache is None:
+            return None
+        key = get_query_key(self._filters, self._ordering)
+        if key is None:
+            return None
+
+        # Loading deferred objects changes the generation, so do that first.
+        lazy.run_pending_init(self._dict_model_class)
+        generation = self._dict_model_class.generation
+        results = query_cache.get(generation, key)
+        if results is None:
+            results = tuple(self._matches(self._filters, self._ordering))
+            query_cache.set(generation, key, results)
+        return results
+
+    @property
+    def _results(self) -> typing.Sequence["DictModel"]:
+        # The results of the query, as a tuple while they are shared with the query
+        # cache of the model.
+        if self._result_cache is None:
+            self._result_cache = self._evaluate()
+        return self._result_cache
+
+    def _get_sort_index(
+        self,
+        ordering: tuple,
+        ids: typing.Optional[typing.Set[int]] = None,
+        indexes: typing.Optional[dict] = None,
+    ) -> typing.Optional[typing.Union[IdIndex, SortedIndex]]:
+        if not self._covers_dict_model or len(ordering) != 1:
+            return None
+        if indexes is None:
+            indexes = self._dict_model_class._read_state()[1]
+        field = ordering[0].removeprefix("-")
+        index = indexes.get("id" if field == "pk" else field)
+        if not hasattr(index, "ordered_ids"):
+            return None
+        # Sorting a handful of candidates beats walking the whole index.
+        if ids is not None and len(ids) * SORTED_INDEX_MIN_SELECTIVITY < len(index):
+            return None
+        return index
+
+    def _iter_results(self) -> typing.Iterable["DictModel"]:
+        # Stream the matches instead of building (and caching) the list of objects.
+        if self._result_cache is not None:
+            return self._result_cache
+        results = self._get_cached_results()
+        if results is None:
+            return self._matches(self._filters, self._ordering)
+        return results
+
+    def _matches(
+        self, filters: tuple, ordering: tuple = (), reverse: bool = False
+    ) -> typing.Iterator["DictModel"]:
+        """
+        Return an iterator over the objects matching `filters`, ordered by `ordering`.
+        Without `ordering`, objects come in id order (or, when `reverse`, backwards).
+        """
+        trace = self._trace(filters, ordering) if instrumentation.enabled else None
+        candidates, predicate, ordering = self._scan(filters, ordering, reverse, trace)
+        if predicate is not None:
+            matches = filter(predicate, candidates)
+        else:
+            matches = iter(candidates)
+
+        if ordering:
+            matches = iter(self._sort(list(matches), ordering))
+        return matches if trace is None else trace.returned(matches)
+
+    async def _amatches(
+        self, filters: tuple, ordering: tuple = (), reverse: bool = False
+    ) -> typing.AsyncIterator["DictModel"]:
+        # Like `_matches`, letting other tasks run every so often while scanning, and
+        # the caller handle each match in between.
+        trace = self._trace(filters, ordering) if instrumentation.enabled else None
+        candidates, predicate, ordering = self._scan(
+            filters, ordering, reverse, trace, snapshot=True
+        )
+        results = []
+        try:
+            async for obj in self._abatched(candidates):
+                if predicate is not None and not predicate(obj):
+                    continue
+                if ordering:
+                    results.append(obj)
+                    continue
+                if trace is not None:
+                    trace.rows_returned += 1
+                yield obj
+            for obj in self._sort(results, ordering):
+                if trace is not None:
+                    trace.rows_returned += 1
+                yield obj
+        finally:
+            if trace is not None:
+                trace.finish()
+
     @staticmethod
-    def _passes_filters(obj, **filters) -> bool:
-        for field, value in filters.items():
-            if field.endswith("__in"):
-                field, *_ = field.split("__in")
-                if getattr(obj, field) not in value:
-                    return False
-            elif getattr(obj, field) != value:
-                return False
-        return True
+    async def _abatched(
+        objs: typing.Iterable["DictModel"],
+    ) -> typing.AsyncIterator["DictModel"]:
+        for count, obj in enumerate(objs, start=1):
+            if not count % ASYNC_SCAN_BATCH_SIZE:
+                await asyncio.sleep(0)
+            yield obj
 
-    def order_by(self, field: str) -> "DictModelQuerySet":
-        if field.startswith("-"):
-            field = field[1:]
-            reverse = True
+    def _scan(
+        self,
+        filters: tuple,
+        ordering: tuple,
+        reverse: bool,
+        trace: typing.Optional[instrumentation.QueryTrace] = None,
+        snapshot: bool = False,
+    ) -> typing.Tuple[
+        typing.Iterable["DictModel"], typing.Optional[typing.Callable], tuple
+    ]:
+        """
+        Return the objects to check against `filters`, the predicate checking them
+        (`None` if every object matches), and the `ordering` left to apply to the
+        matches (none, if the objects already come in order). With `snapshot`, the
+        candidates are fixed up front, for scans that other code runs in between.
+        """
+        if not self._covers_dict_model:
+            candidates = reversed(self._source) if reverse else self._source
+            checks, excluded, sort_index, ids = filters, set(), None, None
         else:
-            reverse = False
-        return DictModelQuerySet(
-            sorted(self.data, key=lambda obj: getattr(obj, field), reverse=reverse),
-            dict_model_class=self._dict_model_class,
+            # Read the objects and indexes once, so the whole query runs against the
+            # same state of the model.
+            state = self._dict_model_class._read_state()
+            ids, checks, excluded = self._plan(state, filters)
+            sort_index = self._get_sort_index(ordering, ids, state[1])
+            candidates = self._candidates(
+                ids, ordering, sort_index, reverse, state, snapshot
+            )
+
+        if trace is not None:
+            trace.full_scan = ids is None
+            candidates = trace.scanned(candidates)
+
+        predicates = [compile_filters(kwargs, negated) for kwargs, negated in checks]
+        if excluded:
+            predicates.append(lambda obj: obj.id not in excluded)
+        predicate = combine(predicates) if predicates else None
+        return candidates, predicate, () if sort_index is not None else ordering
+
+    def _trace(self, filters: tuple, ordering: tuple) -> instrumentation.QueryTrace:
+        return instrumentation.QueryTrace(self._dict_model_class, filters, ordering)
+
+    @staticmethod
+    def _sort(results: list, ordering: tuple) -> list:
+        # Like `SortedIndex.ordered_ids`, null values come last (or first, when
+        # ordering descending) rather than being compared with other values.
+        for field in ordering:
+            get = attrgetter(field.removeprefix("-"))
+
+            def key(obj: "DictModel") -> tuple:
+                value = get(obj)
+                return value is None, value
+
+            results.sort(key=key, reverse=field.startswith("-"))
+        return results
+
+    def _plan(
+        self, state: tuple, filters: tuple, index_uses: typing.Optional[list] = None
+    ) -> tuple[typing.Optional[typing.Set[int]], tuple, typing.Set[int]]:
+        # Narrow the objects down using the pk filters and indexes of every `filter`
+        # step, and use the indexes to find the objects `exclude` steps drop, so that
+        # as few objects as possible are checked against the remaining filters. When
+        # given, `index_uses` gets a `(keys, index, ids, negated)` entry per lookup.
+        object_lookup, indexes = state
+        ids = None
+        checks = []
+        excluded = set()
+        for kwargs, negated in filters:
+            step_uses = None if index_uses is None else []
+            matched = get_candidate_ids(object_lookup, indexes, kwargs, step_uses)
+            if step_uses:
+                index_uses.extend((*use, negated) for use in step_uses)
+            if not negated:
+                if matched is not None:
+                    ids = matched if ids is None else ids & matched
+                checks.append((kwargs, negated))
+            elif matched is None:
+                checks.append((kwargs, negated))
+            else:
+                predicate = compile_filters(kwargs)
+                excluded.update(id for id in matched if predicate(object_lookup[id]))
+        return ids, tuple(checks), excluded
+
+    @staticmethod
+    def _passes_filters(obj, **filters) -> bool:
+        return compile_filters(filters)(obj)
+
+    def update(self, **kwargs) -> int:
+        self._dict_model_class._validate_update_fields(kwargs)
+        self._dict_model_class._check_index_values(
+            [types.SimpleNamespace(**kwargs)], kwargs
         )
+        objs = self._results
+        for obj in objs:
+            for field, value in kwargs.items():
+                setattr(obj, field, value)
+        count = self._dict_model_class.objects.bulk_update(objs, kwargs)
+        self._result_cache = None
+        return count
+
+    def order_by(self, field: str) -> "DictModelQuerySet":
+        return self._chain(ordering=self._ordering + (field,))
@@ -0,0 +1,113 @@
+import collections.abc
+import dataclasses
+import threading
+import types
+import typing
+
+if typing.TYPE_CHECKING:
+    from . import DictModel
+
+
+class RecordLookup(collections.abc.MutableMapping):
+    """
+    An `object_lookup` holding the raw records of objects as loaded, and creating
+    each object from its record (with `from_dict`) when it is first read. Objects are
+    then kept in place of their records, so the same object is returned every time.
+    """
+
+    def __init__(self, dict_model_class: type["DictModel"]) -> None:
+        self._dict_model_class = dict_model_class
+        # Maps ids to objects, or to the records of objects not created yet.
+        self._data = {}
+        # Objects created by this lookup or its copies, once it has been copied, so
+        # each record is only ever made into one object.
+        self._created = None
+        self._lock = threading.Lock()
+
+    def __contains__(self, id: typing.Any) -> bool:
+        return id in self._data
+
+    def __delitem__(self, id: int) -> None:
+        del self._data[id]
+
+    def __getitem__(self, id: int) -> "DictModel":
+        obj = self._data[id]
+        if type(obj) is not dict:
+            return obj
+        with self._lock:
+            # Another thread may have created the object meanwhile.
+            obj = self._data[id]
+            if type(obj) is dict:
+                record = obj
+                obj = None if self._created is None else self._created.get(id)
+                if obj is None:
+                    obj = self._dict_model_class.from_dict({"id": id, **record})
+                    if self._created is not None:
+                        self._created[id] = obj
+                self._data[id] = obj
+            return obj
+
+    def __iter__(self) -> typing.Iterator[int]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __setitem__(self, id: int, obj: "DictModel") -> None:
+        self._data[id] = obj
+
+    def copy(self) -> "RecordLookup":
+        """
+        Return a lookup holding the same objects and records, to be changed on its
+        own. Objects created from the records they share are shared too.
+        """
+        with self._lock:
+            if self._created is None:
+                self._created = {}
+            copied = self.__class__.__new__(self.__class__)
+            copied.__dict__.update(self.__dict__, _data=dict(self._data))
+            return copied
+
+    def add_record(self, id: int, record: dict) -> None:
+        """
+        Add the record of an object, for the object to be created when first read.
+        """
+        self._data[id] = record
+
+    def is_hydrated(self, id: int) -> bool:
+        """
+        Return whether the object with `id` has been created from its record.
+        """
+        return type(self._data[id]) is not dict
+
+    def partial_objects(
+        self, field_name: str
+    ) -> typing.Iterator[typing.Union["DictModel", types.SimpleNamespace]]:
+        """
+        Yield, for each object not created yet, an object holding only its id and the
+        value of `field_name` (as the object would have it), and the objects already
+        created as they are. This is much cheaper than creating every object, e.g.
+        to build indexes.
+        """
+        schema = self._dict_model_class._get_schema()
+        deserializer = schema.field_deserializers.get(field_name)
+        (field,) = [
+            field
+            for field in dataclasses.fields(self._dict_model_class)
+            if field.name == field_name
+        ]
+        for id, obj in self._data.items():
+            if type(obj) is not dict:
+                yield obj
+                continue
+            if field_name == "id":
+                value = id
+            elif field_name in obj:
+                value = obj[field_name]
+                if deserializer is not None:
+                    value = deserializer(value)
+            elif field.default_factory is not dataclasses.MISSING:
+                value = field.default_factory()
+            else:
+                value = None if field.default is dataclasses.MISSING else field.default
+            yield types.SimpleNamespace(**{"id": id, field_name: value})
@@ -0,0 +1,99 @@
+import dataclasses
+import functools
+import hashlib
+import typing
+from operator import attrgetter
+
+from . import deserializers, serializers
+
+if typing.TYPE_CHECKING:
+    from . import DictModel
+
+
+@dataclasses.dataclass(frozen=True)
+class DictModelSchema:
+    """
+    Field metadata of a `DictModel` class, computed once instead of on every access.
+    """
+
+    field_names: typing.Tuple[str, ...]
+    field_name_set: typing.FrozenSet[str]
+    field_types: typing.Mapping[str, typing.Any]
+    # Only fields whose values need converting when loaded (or dumped) have a
+    # deserializer (or serializer).
+    field_deserializers: typing.Mapping[
+        str, deserializers.Deserializer
+    ] = dataclasses.field(compare=False)
+    field_serializers: typing.Mapping[str, serializers.Serializer] = dataclasses.field(
+        compare=False
+    )
+    to_dict: typing.Callable[["DictModel"], dict] = dataclasses.field(compare=False)
+
+    @functools.cached_property
+    def schema_hash(self) -> str:
+        """
+        A digest of the field names and types, to tell whether data stored for a model
+        (e.g. a snapshot) still matches its fields.
+        """
+        fields = [(name, repr(self.field_types[name])) for name in self.field_names]
+        return hashlib.sha256(repr(fields).encode()).hexdigest()
+
+    @classmethod
+    def from_dict_model_class(
+        cls, dict_model_class: typing.Type["DictModel"]
+    ) -> "DictModelSchema":
+        fields = dataclasses.fields(dict_model_class)
+        try:
+            type_hints = typing.get_type_hints(dict_model_class)
+        except (NameError, TypeError):
+            # Annotations that cannot be resolved are kept as written.
+            type_hints = {}
+
+        field_names = tuple(sorted(field.name for field in fields))
+        field_types = {
+            field.name: type_hints.get(field.name, field.type) for field in fields
+        }
+        field_deserializers, field_serializers = {}, {}
+        for field_name, field_type in field_types.items():
+            deserializer = deserializers.for_type(field_type)
+            if deserializer is not None:
+                field_deserializers[field_name] = deserializer
+            serializer = serializers.for_type(field_type)
+            if serializer is not None:
+                field_serializers[field_name] = serializer
+
+        return cls(
+            field_names=field_names,
+            field_name_set=frozenset(field_names),
+            field_types=field_types,
+            field_deserializers=field_deserializers,
+            field_serializers=field_serializers,
+            to_dict=_build_to_dict(field_names, field_serializers),
+        )
+
+
+def get_values(*field_names: str) -> typing.Callable[[typing.Any], tuple]:
+    """
+    Return a function reading the given fields of an object into a tuple.
+    """
+    if len(field_names) == 1:
+        # `attrgetter` returns a bare value, rather than a tuple, for a single name.
+        get_value = attrgetter(field_names[0])
+        return lambda obj: (get_value(obj),)
+    return attrgetter(*field_names)
+
+
+def _build_to_dict(
+    field_names: typing.Tuple[str, ...],
+    field_serializers: typing.Mapping[str, serializers.Serializer],
+) -> typing.Callable[["DictModel"], dict]:
+    values = get_values(*field_names)
+    serialized_fields = tuple(field_serializers.items())
+
+    def to_dict(obj: "DictModel") -> dict:
+        data = dict(zip(field_names, values(obj)))
+        for field_name, serializer in serialized_fields:
+            data[field_name] = serializer(data[field_name])
+        return data
+
+    return to_dict
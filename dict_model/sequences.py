@@ -0,0 +1,36 @@
+import threading
+
+
+class IdSequence:
+    """
+    Hands out ids for new objects of a model in constant time. Ids are never reused:
+    the sequence only moves forward, also past ids that were saved explicitly.
+    """
+
+    def __init__(self, last_id: int = 0) -> None:
+        self.last_id = last_id
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            self.last_id += 1
+            return self.last_id
+
+    def reserve(self, count: int) -> range:
+        """
+        Take `count` consecutive ids at once.
+        """
+        with self._lock:
+            start = self.last_id + 1
+            self.last_id += count
+            return range(start, start + count)
+
+    def observe(self, id: int) -> None:
+        """
+        Make sure `id`, which was assigned without asking the sequence, is not handed
+        out later.
+        """
+        if id <= self.last_id:
+            return
+        with self._lock:
+            self.last_id = max(self.last_id, id)
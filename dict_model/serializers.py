@@ -1,15 +1,86 @@
+import enum as e
+import types
 import typing
+from datetime import date as d
 from datetime import datetime as dt
+from decimal import Decimal
 
 if typing.TYPE_CHECKING:
     from . import DictModel
 
+Serializer = typing.Callable[[typing.Any], typing.Any]
+
+# Values of these types go into JSON as they are.
+PASSTHROUGH_TYPES = (bool, dict, float, int, list, str, type(None))
+
+
+def date(value: d) -> str:
+    return value.isoformat()
+
 
 def datetime(value: dt) -> str:
     return value.isoformat()
 
 
+def decimal(value: Decimal) -> str:
+    return str(value)
+
+
 def dict_model(value: "DictModel") -> dict:
     if value.id is None:
         raise value.NotPersisted(str(value))
     return {"dict_model_name": value.__class__.__name__, "id": value.id}
+
+
+def enum(value: e.Enum) -> typing.Any:
+    return value.value
+
+
+def _when(kind: type, serializer: Serializer) -> Serializer:
+    # Leave `None`, and values that do not match the annotation, alone.
+    return lambda value: serializer(value) if isinstance(value, kind) else value
+
+
+def _list(serializer: Serializer) -> Serializer:
+    return _when(list, lambda value: [serializer(item) for item in value])
+
+
+def for_type(field_type: typing.Any) -> typing.Optional[Serializer]:
+    """
+    Return a function turning values of `field_type` into JSON compatible values, or
+    `None` if they can be used as they are. Types that cannot be told apart up front
+    fall back to `DictModel.serialize`.
+    """
+    from . import DictModel
+
+    if field_type in PASSTHROUGH_TYPES:
+        return None
+
+    origin = typing.get_origin(field_type)
+    if origin in (typing.Union, types.UnionType):
+        arg_types = [
+            arg for arg in typing.get_args(field_type) if arg is not type(None)
+        ]
+        if len(arg_types) == 1:
+            return for_type(arg_types[0])
+        if all(for_type(arg) is None for arg in arg_types):
+            return None
+        return DictModel.serialize
+    elif origin is list:
+        (item_type,) = typing.get_args(field_type) or (typing.Any,)
+        item_serializer = for_type(item_type)
+        return None if item_serializer is None else _list(item_serializer)
+    elif origin is not None:
+        return None
+
+    if field_type is typing.Any or not isinstance(field_type, type):
+        return DictModel.serialize
+    elif issubclass(field_type, d):
+        return _when(d, date)
+    elif issubclass(field_type, Decimal):
+        return _when(Decimal, decimal)
+    elif issubclass(field_type, e.Enum):
+        return _when(e.Enum, enum)
+    elif issubclass(field_type, DictModel):
+        return _when(DictModel, dict_model)
+    return DictModel.serialize
@@ -0,0 +1,96 @@
+import io
+import pickle
+import typing
+from pathlib import Path
+
+from . import lookup
+
+if typing.TYPE_CHECKING:
+    from . import DictModel
+
+# Bump whenever the layout of snapshot files changes; older files are then rejected.
+SNAPSHOT_VERSION = 1
+
+
+class _Pickler(pickle.Pickler):
+    # Store the model class, which may not be importable, and objects of other models
+    # as references: objects of other models are then shared with their own model
+    # when loading, instead of copied.
+    def __init__(self, file: typing.BinaryIO, dict_model_class: type["DictModel"]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.dict_model_class = dict_model_class
+
+    def persistent_id(self, obj: typing.Any) -> typing.Optional[tuple]:
+        from . import DictModel
+
+        if obj is self.dict_model_class:
+            return (None, None)
+        elif isinstance(obj, DictModel) and obj.__class__ is not self.dict_model_class:
+            if obj.id is None:
+                raise obj.NotPersisted(str(obj))
+            return (obj.__class__.__name__, obj.id)
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: typing.BinaryIO, dict_model_class: type["DictModel"]):
+        super().__init__(file)
+        self.dict_model_class = dict_model_class
+
+    def persistent_load(self, pid: tuple) -> typing.Any:
+        dict_model_name, id = pid
+        if dict_model_name is None:
+            return self.dict_model_class
+        return lookup.get_dict_model_class(dict_model_name).objects.get(id=id)
+
+
+def write(dict_model_class: type["DictModel"], path: typing.Union[str, Path]) -> None:
+    """
+    Write the objects of a model, with their field values as they are, its indexes, its
+    id sequence and its lookup constants to a snapshot file.
+    """
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "dict_model_name": dict_model_class.__name__,
+        "schema_hash": dict_model_class._get_schema().schema_hash,
+    }
+    object_lookup, indexes = dict_model_class._read_state()
+    payload = {
+        "objects": list(object_lookup.values()),
+        "indexes": indexes,
+        "last_id": dict_model_class._id_sequence.last_id,
+        "lookup_constants": dict_model_class._get_lookup_constants(),
+    }
+    buffer = io.BytesIO()
+    pickle.dump(header, buffer, protocol=pickle.HIGHEST_PROTOCOL)
+    _Pickler(buffer, dict_model_class).dump(payload)
+    Path(path).write_bytes(buffer.getbuffer())
+
+
+def read(dict_model_class: type["DictModel"], path: typing.Union[str, Path]) -> dict:
+    """
+    Return the `objects`, `indexes`, `last_id` and `lookup_constants` (as names and
+    ids) stored in a snapshot, after checking the snapshot was written for the current
+    schema of `dict_model_class`.
+
+    Snapshots are pickles: only load files written by a trusted process.
+    """
+    with Path(path).open("rb") as file:
+        try:
+            header = pickle.load(file)
+        except (pickle.UnpicklingError, EOFError) as error:
+            raise dict_model_class.IncompatibleSnapshot(f"{path}: {error}")
+        if not isinstance(header, dict) or header.get("version") != SNAPSHOT_VERSION:
+            raise dict_model_class.IncompatibleSnapshot(
+                f"{path}: unsupported snapshot version"
+            )
+        if header["dict_model_name"] != dict_model_class.__name__:
+            raise dict_model_class.IncompatibleSnapshot(
+                f"{path}: written for {header['dict_model_name']}, "
+                f"not {dict_model_class.__name__}"
+            )
+        if header["schema_hash"] != dict_model_class._get_schema().schema_hash:
+            raise dict_model_class.IncompatibleSnapshot(
+                f"{path}: the fields of the model have changed"
+            )
+        return _Unpickler(file, dict_model_class).load()
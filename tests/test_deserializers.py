@@ -1,5 +1,10 @@
+import enum
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Union
+
+import pytest
 
 import dict_model
 
@@ -21,3 +26,57 @@ def test_dict_model_deserializer():
 
     data = {"dict_model_name": "Bar", "id": 2}
     assert dict_model.deserializers.dict_model(data) == Bar(id=2, foo=True)
+
+
+class Size(enum.Enum):
+    SMALL = "S"
+    LARGE = "L"
+
+
+@pytest.mark.parametrize(
+    "field_type, value, expected",
+    [
+        (datetime, "2023-01-01T00:00:00", datetime(2023, 1, 1)),
+        (date, "2023-01-01", date(2023, 1, 1)),
+        (Decimal, "1.10", Decimal("1.10")),
+        (Decimal, 0.1, Decimal("0.1")),
+        (Size, "L", Size.LARGE),
+        (Optional[datetime], None, None),
+        (Optional[Size], None, None),
+        (Optional[Size], "S", Size.SMALL),
+        (datetime | None, "2023-01-01T00:00:00", datetime(2023, 1, 1)),
+        (List[date], ["2023-01-01"], [date(2023, 1, 1)]),
+        (list[Size], ["S", Size.LARGE], [Size.SMALL, Size.LARGE]),
+        (Union[int, datetime], "2023-01-01T00:00:00", datetime(2023, 1, 1)),
+        (Any, "2023-01-01T00:00:00", datetime(2023, 1, 1)),
+        (Any, "not a date", "not a date"),
+    ],
+)
+def test_for_type_converts_values(field_type, value, expected):
+    assert dict_model.deserializers.for_type(field_type)(value) == expected
+
+
+def test_for_type_keeps_already_converted_values():
+    value = datetime(2023, 1, 1)
+    assert dict_model.deserializers.for_type(datetime)(value) is value
+
+
+@pytest.mark.parametrize(
+    "field_type",
+    [str, int, Optional[str], bool, dict, list, List[str], Union[int, str], Dict],
+)
+def test_for_type_returns_none_for_types_without_conversion(field_type):
+    assert dict_model.deserializers.for_type(field_type) is None
+
+
+def test_for_type_deserializes_dict_model_references():
+    @dataclass
+    class Baz(dict_model.DictModel):
+        qux: bool
+
+        object_data = {3: {"qux": False}}
+
+    Baz.init()
+    deserializer = dict_model.deserializers.for_type(Optional[Baz])
+    assert deserializer({"dict_model_name": "Baz", "id": 3}) == Baz(id=3, qux=False)
+    assert deserializer(None) is None
@@ -1,10 +1,17 @@
+import asyncio
+import enum
 import json
+import threading
+import time
 from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
 from typing import Optional
 
 import pytest
 
 import dict_model
+from dict_model.lazy import LazyAttribute
 from dict_model.lookup import DictModelNotFound
 
 from . import TEST_FILES
@@ -497,6 +504,59 @@ def test_dict_model_to_json_file(example_model):
     }
 
 
+def test_dict_model_async_json_files_round_trip(example_model):
+    example_model.init({1: {"foo": "bar"}, 2: {"foo": "baz"}}, force=True)
+
+    async def round_trip():
+        await example_model.ato_json_file(TEST_FILES / "test.json")
+        example_model.objects.create(foo="qux")
+        await dict_model.DictModel.afrom_json_file(TEST_FILES / "test.json", force=True)
+
+    asyncio.run(round_trip())
+    assert example_model.objects.values_list("foo", flat=True) == ["bar", "baz"]
+
+
+def test_dict_model_afrom_json_file_publishes_objects_once_loaded():
+    @dataclass
+    class Reading(dict_model.DictModel):
+        value: str
+
+        indexes = ("value",)
+
+    rows = 20_000
+    Reading.init({id: {"value": "new"} for id in range(1, rows + 1)})
+    Reading.to_json_file(TEST_FILES / "test.json")
+    Reading.init({id: {"value": "old"} for id in range(1, rows + 1)}, force=True)
+
+    async def reload():
+        task = asyncio.create_task(
+            Reading.afrom_json_file(TEST_FILES / "test.json", force=True)
+        )
+        states = set()
+        while not task.done():
+            states.add(
+                (len(Reading.objects.all()), len(Reading.objects.filter(value="new")))
+            )
+            await asyncio.sleep(0)
+        await task
+        return states
+
+    assert asyncio.run(reload()) <= {(rows, 0), (rows, rows)}
+    assert len(Reading.objects.filter(value="new")) == rows
+
+
+def test_dict_model_asave_saves_object(example_model, mocker):
+    obj = example_model(foo="bar")
+    asyncio.run(obj.asave())
+    assert example_model.objects.get(foo="bar") is obj
+
+    # Saving to loaded objects is quick, and runs on the event loop.
+    to_thread = mocker.spy(asyncio, "to_thread")
+    asyncio.run(example_model(foo="baz").asave())
+    assert example_model.objects.get(foo="baz").id == 2
+    assert to_thread.call_count == 0
+
+
 def test_dict_model_to_json_file_does_not_include_model_name_when_specified(
     example_model,
 ):
@@ -527,6 +587,448 @@ def test_dict_model_to_json_file_does_not_include_model_name_when_specified(
     }
 
 
+def test_dict_model_to_jsonl_file_writes_header_and_one_object_per_line(
+    example_model,
+):
+    example_model.init({3: {"foo": "bar"}, 5: {"foo": "baz"}}, force=True)
+
+    example_model.to_jsonl_file(TEST_FILES / "test.jsonl")
+    lines = (TEST_FILES / "test.jsonl").read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"dict_model_name": "Example"},
+        {"id": 3, "foo": "bar", "active": True, "related": None},
+        {"id": 5, "foo": "baz", "active": True, "related": None},
+    ]
+
+    example_model.to_jsonl_file(TEST_FILES / "test.jsonl", specify_model=False)
+    lines = (TEST_FILES / "test.jsonl").read_text().splitlines()
+    assert json.loads(lines[0]) == {}
+
+
+def test_dict_model_file_writers_use_to_dict_overrides():
+    @dataclass
+    class OtherModel(dict_model.DictModel):
+        name: str
+
+        def to_dict(self):
+            return {**super().to_dict(), "shout": self.name.upper()}
+
+    OtherModel.init({1: {"name": "hello"}})
+
+    OtherModel.to_json_file(TEST_FILES / "test.json")
+    data = json.loads((TEST_FILES / "test.json").read_text())
+    assert data["object_data"] == {"1": {"id": 1, "name": "hello", "shout": "HELLO"}}
+
+    OtherModel.to_jsonl_file(TEST_FILES / "test.jsonl")
+    lines = (TEST_FILES / "test.jsonl").read_text().splitlines()
+    assert json.loads(lines[1]) == {"id": 1, "name": "hello", "shout": "HELLO"}
+
+
+def test_dict_model_from_jsonl_file_round_trips_objects(example_model):
+    @dataclass
+    class OtherModel(dict_model.DictModel):
+        name: str
+
+        object_data = {1: {"name": "hello"}}
+
+    OtherModel.init()
+    example_model.init(
+        {
+            2: {"foo": "bar", "related": OtherModel.HELLO},
+            7: {"foo": "baz", "active": False},
+        },
+        force=True,
+    )
+    objects = dict(example_model.object_lookup)
+    example_model.to_jsonl_file(TEST_FILES / "test.jsonl")
+
+    dict_model.DictModel.from_jsonl_file(TEST_FILES / "test.jsonl", force=True)
+    assert example_model.object_lookup == objects
+    assert example_model.objects.create(foo="qux").id == 8
+
+    with pytest.raises(dict_model.DictModel.AlreadyInitialized):
+        example_model.from_jsonl_file(TEST_FILES / "test.jsonl")
+
+
+def test_dict_model_from_jsonl_file_raises_error_if_model_does_not_match(
+    example_model,
+):
+    (TEST_FILES / "test.jsonl").write_text(
+        json.dumps({"dict_model_name": "Other"}) + "\n"
+    )
+    with pytest.raises(dict_model.DictModel.SpecifiedModelsDoNotMatch):
+        example_model.from_jsonl_file(TEST_FILES / "test.jsonl", force=True)
+
+    (TEST_FILES / "test.jsonl").write_text("{}\n")
+    with pytest.raises(dict_model.DictModel.NoModelSpecified):
+        dict_model.DictModel.from_jsonl_file(TEST_FILES / "test.jsonl", force=True)
+
+
+def test_dict_model_from_snapshot_restores_objects_indexes_and_sequence():
+    @dataclass
+    class Owner(dict_model.DictModel):
+        name: str
+
+        object_data = {4: {"name": "ann"}}
+
+    @dataclass
+    class Pet(dict_model.DictModel):
+        name: str
+        born: date
+        owner: Optional[Owner] = None
+
+        indexes = ("name", dict_model.SortedIndex("born"))
+
+        object_data = {
+            1: {
+                "name": "rex",
+                "born": "2020-01-01",
+                "owner": {"dict_model_name": "Owner", "id": 4},
+            },
+            3: {"name": "tom", "born": "2019-05-01"},
+        }
+
+    Owner.init()
+    Pet.init()
+    Pet.objects.create(name="kit", born=date(2021, 1, 1))
+    objects = dict(Pet.object_lookup)
+    Pet.to_snapshot(TEST_FILES / "test.snapshot")
+
+    Pet.from_snapshot(TEST_FILES / "test.snapshot", force=True)
+    assert Pet.object_lookup == objects
+    assert Pet.REX.owner is Owner.ANN
+    assert Pet.objects.filter(owner=Owner.ANN).first().name == "rex"
+    assert [pet.name for pet in Pet.objects.order_by("born")] == ["tom", "rex", "kit"]
+    assert Pet.objects.create(name="sam", born=date(2022, 1, 1)).id == 5
+
+    Pet.indexes = (dict_model.SortedIndex("name"),)
+    Pet.from_snapshot(TEST_FILES / "test.snapshot", force=True)
+    assert isinstance(Pet._indexes["name"], dict_model.SortedIndex)
+    assert "born" not in Pet._indexes
+    assert Pet.objects.get(name="kit").id == 4
+
+
+def test_dict_model_from_snapshot_rejects_snapshot_of_changed_fields():
+    @dataclass
+    class Tree(dict_model.DictModel):
+        name: str
+
+        object_data = [{"name": "oak"}]
+
+    Tree.init()
+    Tree.to_snapshot(TEST_FILES / "test.snapshot")
+
+    @dataclass
+    class Tree(dict_model.DictModel):
+        name: str
+        height: int = 0
+
+    with pytest.raises(dict_model.DictModel.IncompatibleSnapshot):
+        Tree.from_snapshot(TEST_FILES / "test.snapshot", force=True)
+
+
+def test_dict_model_from_mapped_file_initializes_read_only_model():
+    @dataclass
+    class Shelf(dict_model.DictModel):
+        name: str
+
+        object_data = {1: {"name": "top"}}
+
+    @dataclass
+    class Book(dict_model.DictModel):
+        name: str
+        pages: int
+        shelf: Optional[Shelf] = None
+
+        indexes = (dict_model.SortedIndex("pages"),)
+
+        object_data = {
+            1: {"name": "emma", "pages": 474},
+            4: {"name": "dune", "pages": 412},
+            6: {"name": "ubik", "pages": 202},
+        }
+
+    Shelf.init()
+    Book.init()
+    Book.objects.filter(name="dune").update(shelf=Shelf.TOP)
+    objects = dict(Book.object_lookup)
+    Book.to_mapped_file(TEST_FILES / "test.mapped")
+
+    Book.from_mapped_file(TEST_FILES / "test.mapped", force=True)
+    assert dict(Book.object_lookup) == objects
+    assert Book.DUNE == objects[4]
+    assert Book.DUNE is Book.objects.get(shelf=Shelf.TOP)
+    assert Book.DUNE.shelf is Shelf.TOP
+    assert Book.objects.filter(pages__gt=300).values_list("name", flat=True) == [
+        "emma",
+        "dune",
+    ]
+    assert [book.id for book in Book.objects.order_by("pages")] == [6, 4, 1]
+    assert Book.objects.filter(id__gte=4).last().name == "ubik"
+
+    with pytest.raises(dict_model.DictModel.ReadOnlyModel):
+        Book.objects.create(name="it", pages=1138)
+    with pytest.raises(dict_model.DictModel.ReadOnlyModel):
+        Book.EMMA.delete()
+    with pytest.raises(dict_model.DictModel.ReadOnlyModel):
+        Book.objects.filter(name="ubik").update(pages=1)
+    assert Book.UBIK.pages == 202
+
+    Book.init({6: {"name": "emma", "pages": 1}}, force=True)
+    Book.objects.create(name="it", pages=1138)
+    assert Book.EMMA.pages == 1
+
+
+def test_dict_model_init_lazy_loads_objects_when_first_needed(mocker):
+    @dataclass
+    class Planet(dict_model.DictModel):
+        name: str
+
+        object_data = {1: {"name": "Mercury"}, 2: {"name": "Venus"}}
+
+    load = mocker.spy(Planet, "_load_object_data")
+    Planet.init({3: {"name": "Earth"}}, lazy=True)
+    assert Planet.has_been_initialized
+    assert load.call_count == 0
+    with pytest.raises(dict_model.DictModel.AlreadyInitialized):
+        Planet.init()
+
+    assert Planet.EARTH == Planet(id=3, name="Earth")
+    assert load.call_count == 1
+    assert Planet.objects.get(name="Venus").id == 2
+    assert len(Planet.object_lookup) == 3
+    with pytest.raises(AttributeError):
+        Planet.PLUTO
+    assert load.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "first_use",
+    [
+        lambda model: model.objects.first(),
+        lambda model: model.objects.create(name="Mars"),
+        lambda model: model.object_lookup[1],
+        lambda model: model.MERCURY,
+    ],
+)
+def test_dict_model_init_lazy_loads_objects_on_any_first_use(first_use):
+    @dataclass
+    class Planet(dict_model.DictModel):
+        name: str
+
+        object_data = {1: {"name": "Mercury"}}
+
+    Planet.init(lazy=True)
+    first_use(Planet)
+    assert Planet.object_lookup[1] == Planet(id=1, name="Mercury")
+
+
+def test_dict_model_init_lazy_other_threads_wait_for_all_objects():
+    loading = threading.Event()
+
+    @dataclass
+    class Planet(dict_model.DictModel):
+        name: str
+
+        def __post_init__(self):
+            if self.name == "Venus":
+                # Let another thread query while the rest is still to be loaded.
+                loading.set()
+                time.sleep(0.05)
+
+    Planet.init([{"name": name} for name in ["Mercury", "Venus", "Earth"]], lazy=True)
+    counts = []
+    thread = threading.Thread(
+        target=lambda: loading.wait() and counts.append(len(Planet.objects.all()))
+    )
+    thread.start()
+    assert Planet.EARTH.id == 3
+    thread.join()
+    assert counts == [3]
+
+
+def test_dict_model_init_lazy_subclass_does_not_use_objects_of_parent():
+    @dataclass
+    class Planet(dict_model.DictModel):
+        name: str
+
+    @dataclass
+    class DwarfPlanet(Planet):
+        pass
+
+    Planet.init({1: {"name": "Mercury"}})
+    DwarfPlanet.init({1: {"name": "Ceres"}}, lazy=True, force=True)
+    assert DwarfPlanet.object_lookup[1] == DwarfPlanet(id=1, name="Ceres")
+    assert DwarfPlanet.objects.create(name="Pluto").id == 2
+    assert list(Planet.object_lookup) == [1]
+    assert Planet.objects.get(id=1).name == "Mercury"
+
+
+def test_dict_model_init_replaces_lazy_init_not_yet_loaded():
+    @dataclass
+    class Moon(dict_model.DictModel):
+        name: str
+
+        object_data = {1: {"name": "Io"}}
+
+    Moon.init(lazy=True)
+    Moon.init({2: {"name": "Europa"}}, force=True)
+    assert list(Moon.object_lookup) == [2]
+    with pytest.raises(AttributeError):
+        Moon.IO
+
+
+def test_dict_model_from_json_file_lazy_reads_file_when_first_needed(example_model):
+    example_model.init({1: {"foo": "bar"}}, force=True)
+    example_model.to_json_file(TEST_FILES / "test.json")
+    example_model.to_jsonl_file(TEST_FILES / "test.jsonl")
+
+    example_model.from_json_file(TEST_FILES / "test.json", lazy=True, force=True)
+    (TEST_FILES / "test.json").write_text(
+        json.dumps({"object_data": {"2": {"foo": "baz"}}})
+    )
+    assert example_model.objects.get(foo="baz").id == 2
+
+    dict_model.DictModel.from_jsonl_file(
+        TEST_FILES / "test.jsonl", force=True, lazy=True
+    )
+    assert isinstance(vars(example_model)["object_lookup"], LazyAttribute)
+    assert example_model.objects.get(foo="bar").id == 1
+
+
+def test_dict_model_init_lazy_rows_creates_objects_when_first_read():
+    @dataclass
+    class Comet(dict_model.DictModel):
+        name: str
+        period: int
+
+        indexes = ("period",)
+
+        object_data = {
+            1: {"name": "Halley", "period": 76},
+            2: {"name": "Encke", "period": 3},
+            5: {"name": "Tuttle", "period": 14},
+        }
+
+    Comet.init(lazy_rows=True)
+    assert not any(Comet.object_lookup.is_hydrated(id) for id in (1, 2, 5))
+    assert "HALLEY" not in vars(Comet)
+
+    assert Comet.objects.get(period=3).name == "Encke"
+    assert [Comet.object_lookup.is_hydrated(id) for id in (1, 2, 5)] == [
+        False,
+        True,
+        False,
+    ]
+    assert Comet.HALLEY == Comet(id=1, name="Halley", period=76)
+    assert Comet.HALLEY is Comet.object_lookup[1]
+
+    assert Comet.objects.create(name="Biela", period=7).id == 6
+    Comet.TUTTLE.delete()
+    assert Comet.objects.values_list("name", flat=True) == [
+        "Halley",
+        "Encke",
+        "Biela",
+    ]
+    with pytest.raises(AttributeError):
+        Comet.TUTTLE
+
+
+def test_dict_model_from_jsonl_file_lazy_rows_creates_objects_when_first_read(
+    example_model,
+):
+    example_model.init({1: {"foo": "bar"}, 2: {"foo": "baz"}}, force=True)
+    example_model.to_jsonl_file(TEST_FILES / "test.jsonl")
+
+    example_model.from_jsonl_file(TEST_FILES / "test.jsonl", force=True, lazy_rows=True)
+    assert not example_model.object_lookup.is_hydrated(1)
+    assert example_model.objects.get(id=2) == example_model(id=2, foo="baz")
+    assert not example_model.object_lookup.is_hydrated(1)
+    assert len(example_model.objects.all()) == 2
+
+
+def test_dict_model_generation_changes_when_objects_change(example_model):
+    generations = [example_model.generation]
+
+    def changed():
+        generations.append(example_model.generation)
+        return generations[-1] != generations[-2]
+
+    obj = example_model.objects.create(foo="bar")
+    assert changed()
+    example_model.objects.bulk_create([example_model(foo="baz")])
+    assert changed()
+    example_model.objects.filter(foo="baz").update(active=False)
+    assert changed()
+    obj.delete()
+    assert changed()
+    example_model.objects.all().delete()
+    assert changed()
+    example_model.init(force=True)
+    assert changed()
+    example_model.objects.all().values_list("foo")
+    assert not changed()
+    assert dict_model.DictModel.generation != example_model.generation
+
+
+def test_dict_model_copy_on_write_publishes_changed_copies(mocker):
+    @dataclass
+    class Gauge(dict_model.DictModel):
+        name: str
+        level: int
+
+        copy_on_write = True
+        indexes = ("level",)
+
+        object_data = {1: {"name": "oil", "level": 3}, 2: {"name": "fuel", "level": 1}}
+
+    Gauge.init()
+    object_lookup, indexes = Gauge.object_lookup, Gauge._indexes
+    query_set = Gauge.objects.filter(level__in=[1, 3])
+    matches = query_set._matches(query_set._filters)
+
+    Gauge.objects.create(name="water", level=3)
+    Gauge.FUEL.delete()
+    Gauge.objects.filter(name="oil").update(level=1)
+    assert list(object_lookup) == [1, 2]
+    assert indexes["level"].get(3) == {1}
+    assert [gauge.name for gauge in matches] == ["oil", "fuel"]
+    assert Gauge._read_state() == (Gauge.object_lookup, Gauge._indexes)
+    assert Gauge.objects.filter(level=1).values_list("name", flat=True) == ["oil"]
+
+    mocker.patch.object(dict_model.IdIndex, "add", side_effect=RuntimeError)
+    with pytest.raises(RuntimeError):
+        Gauge.objects.create(name="air", level=0)
+    assert Gauge.objects.values_list("name", flat=True) == ["oil", "water"]
+
+
+def test_dict_model_copy_on_write_queries_run_while_other_threads_write():
+    @dataclass
+    class Ticket(dict_model.DictModel):
+        seat: int
+
+        copy_on_write = True
+        indexes = (dict_model.SortedIndex("seat"),)
+
+    Ticket.init()
+    done = threading.Event()
+
+    def write():
+        for seat in range(300):
+            Ticket.objects.bulk_create([Ticket(seat=seat), Ticket(seat=seat)])
+            Ticket.objects.filter(seat=seat).first().delete()
+        done.set()
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    while not done.is_set():
+        # Every state written holds one ticket per seat, but for the last seat taken.
+        seats = Ticket.objects.filter(seat__gte=0).values_list("seat", flat=True)
+        assert len(seats) - len(set(seats)) in (0, 1)
+    thread.join()
+    assert len(Ticket.objects.all()) == 300
+
+
 def test_dict_model_objects_returns_an_object_manager_for_the_class(example_model):
     assert example_model.objects == dict_model.DictModelObjectManager(example_model)
 
@@ -547,3 +1049,139 @@ def test_dict_model_objects_can_be_a_custom_object_manager():
 
     CustomManagement.init()
     assert CustomManagement.objects.funky(1) == "get funky: monkey"
+
+
+@pytest.fixture
+def indexed_model():
+    @dataclass
+    class Country(dict_model.DictModel):
+        code: str
+        continent: str
+
+        indexes = ("code", "continent")
+
+        object_data = {
+            1: {"code": "FR", "continent": "Europe"},
+            2: {"code": "JP", "continent": "Asia"},
+            3: {"code": "DE", "continent": "Europe"},
+        }
+
+    return Country.init()
+
+
+def test_dict_model_init_builds_indexes(indexed_model):
+    assert indexed_model._indexes["code"].get("JP") == {2}
+    assert indexed_model._indexes["continent"].get("Europe") == {1, 3}
+
+
+def test_dict_model_init_raises_error_for_index_on_unknown_field():
+    @dataclass
+    class Mistake(dict_model.DictModel):
+        name: str
+
+        indexes = ("nmae",)
+
+    with pytest.raises(dict_model.DictModel.UnknownIndexField):
+        Mistake.init()
+
+
+def test_dict_model_save_updates_indexes(indexed_model):
+    country = indexed_model.objects.get(id=3)
+    country.code = "DK"
+    country.save()
+    indexed_model.objects.create(code="CN", continent="Asia")
+    assert indexed_model._indexes["code"].get("DE") == set()
+    assert indexed_model._indexes["code"].get("DK") == {3}
+    assert indexed_model._indexes["continent"].get("Asia") == {2, 4}
+
+
+def test_dict_model_delete_updates_indexes(indexed_model):
+    indexed_model.objects.get(id=1).delete()
+    assert indexed_model._indexes["code"].get("FR") == set()
+    assert indexed_model._indexes["continent"].get("Europe") == {3}
+
+
+def test_dict_model_filters_on_indexed_fields_use_index(indexed_model, mocker):
+    plan = mocker.spy(dict_model.DictModelQuerySet, "_plan")
+    assert indexed_model.objects.get(code="JP").id == 2
+    ids, _, _ = plan.spy_return
+    assert ids == {2}
+
+    assert [c.id for c in indexed_model.objects.filter(continent="Europe")] == [1, 3]
+    ids, _, _ = plan.spy_return
+    assert ids == {1, 3}
+
+    assert [c.id for c in indexed_model.objects.exclude(code__in=["FR", "JP"])] == [3]
+    _, checks, excluded = plan.spy_return
+    assert checks == ()
+    assert excluded == {1, 2}
+
+
+def test_dict_model_save_assigns_id_after_highest_explicit_id(example_model):
+    example_model.init({5: {"foo": "bar"}}, force=True)
+    example_model(id=9, foo="baz").save()
+    example = example_model(foo="qux")
+    example.save()
+    assert example.id == 10
+
+
+def test_dict_model_save_does_not_reuse_ids_of_deleted_objects(example_model):
+    example_model.objects.create(foo="bar")
+    example_model.objects.create(foo="baz").delete()
+    assert example_model.objects.create(foo="qux").id == 3
+
+
+def test_dict_model_schema_is_computed_once_per_class(example_model, mocker):
+    from_dict_model_class = mocker.spy(
+        dict_model.schema.DictModelSchema, "from_dict_model_class"
+    )
+
+    class Child(example_model):
+        pass
+
+    for _ in range(3):
+        assert example_model.field_names == ["active", "foo", "id", "related"]
+        example_model.from_dict({"foo": "bar"})
+        Child.from_dict({"foo": "bar"})
+    assert from_dict_model_class.call_count == 1
+
+
+def test_dict_model_init_recomputes_schema(example_model):
+    schema = example_model._get_schema()
+    example_model.init(force=True)
+    assert example_model._get_schema() is not schema
+    assert example_model._get_schema() == schema
+
+
+def test_dict_model_from_dict_converts_values_by_field_type():
+    class Status(enum.Enum):
+        OPEN = "open"
+        CLOSED = "closed"
+
+    @dataclass
+    class Invoice(dict_model.DictModel):
+        number: str
+        status: Status
+        total: Decimal
+        issued: datetime
+        due: Optional[date] = None
+        notes: list = None
+
+    invoice = Invoice.from_dict(
+        {
+            "id": 1,
+            "number": "2023-01-01",
+            "status": "closed",
+            "total": "10.50",
+            "issued": "2023-01-01T12:00:00",
+            "notes": ["2023-01-01"],
+        }
+    )
+    assert invoice == Invoice(
+        id=1,
+        number="2023-01-01",
+        status=Status.CLOSED,
+        total=Decimal("10.50"),
+        issued=datetime(2023, 1, 1, 12),
+        notes=["2023-01-01"],
+    )
@@ -1,11 +1,30 @@
 from dataclasses import dataclass
 
+import django
+import pytest
+from django.conf import settings
+from django.db import models
+
 from dict_model import DictModel
-from dict_model.django import DictModelField
+from dict_model.django import DictModelChoices, DictModelField
+from dict_model.lazy import LazyAttribute
+from dict_model.query_sets import DictModelQuerySet
 
 UNSET = "UNSET"
 
 
+@pytest.fixture
+def django_models():
+    # Enough of a project to declare models and compile their queries.
+    if not settings.configured:
+        settings.configure(
+            DATABASES={
+                "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+            }
+        )
+        django.setup()
+
+
 def test_dict_model_field_get_choices_for_dict_model_class_returns_id_and_choice():
     @dataclass
     class Phony(DictModel):
@@ -80,6 +99,37 @@ def test_dict_model_field_from_db_value_coerces_value_into_int_for_id_lookup():
     assert field.from_db_value("2") == Street(id=2, name="Stone Ave")
 
 
+def test_dict_model_field_from_db_value_raises_does_not_exist_for_unknown_id():
+    @dataclass
+    class Lane(DictModel):
+        name: str
+
+        object_data = {1: {"name": "Fast"}}
+
+    field = DictModelField(Lane)
+    with pytest.raises(DictModelQuerySet.DoesNotExist):
+        field.from_db_value(2)
+
+
+def test_dict_model_field_from_db_values_returns_objects_for_column_of_ids():
+    @dataclass
+    class Coin(DictModel):
+        name: str
+
+        object_data = {1: {"name": "Penny"}, 2: {"name": "Dime"}}
+
+    field = DictModelField(Coin)
+    assert field.from_db_values([2, None, "1", 2]) == [
+        Coin.DIME,
+        None,
+        Coin.PENNY,
+        Coin.DIME,
+    ]
+    assert field.from_db_values([]) == []
+    with pytest.raises(DictModelQuerySet.DoesNotExist):
+        field.from_db_values([1, 3])
+
+
 def test_dict_model_field_get_prep_value_returns_object_id():
     @dataclass
     class Letters(DictModel):
@@ -131,3 +181,105 @@ def test_dict_model_field_to_python_coerces_id_to_int_for_lookup():
 
     field = DictModelField(Creature)
     assert field.to_python("1") == Creature(id=1, name="Turtle")
+
+
+def test_dict_model_field_does_not_load_objects_until_choices_are_used(mocker):
+    @dataclass
+    class Color(DictModel):
+        name: str
+
+        object_data = {1: {"name": "Red"}, 2: {"name": "Blue"}}
+
+    load = mocker.spy(Color, "_load_object_data")
+    field = DictModelField(Color)
+    assert field._check_choices() == []
+    assert load.call_count == 0
+
+    assert list(field.choices) == [(1, "Red"), (2, "Blue")]
+    assert load.call_count == 1
+
+
+def test_dict_model_field_choices_are_shared_and_cached_until_objects_change(mocker):
+    @dataclass
+    class Flavor(DictModel):
+        name: str
+
+        object_data = {1: {"name": "Mint"}, 2: {"name": "Plum"}}
+
+    get_choices = mocker.spy(DictModelField, "get_choices_for_dict_model_class")
+    field, other_field = DictModelField(Flavor), DictModelField(Flavor)
+    assert field.choices is other_field.choices
+    assert list(field.choices) == [(1, "Mint"), (2, "Plum")]
+    assert list(other_field.choices) == [(1, "Mint"), (2, "Plum")]
+    assert get_choices.call_count == 1
+
+    Flavor.objects.create(name="Fig")
+    Flavor.MINT.delete()
+    assert list(field.choices) == [(2, "Plum"), (3, "Fig")]
+    Flavor.objects.filter(id=2).update(name="Pear")
+    assert list(field.choices) == [(2, "Pear"), (3, "Fig")]
+    assert get_choices.call_count == 3
+
+
+def test_dict_model_field_deconstruct_leaves_out_choices_from_model(mocker):
+    @dataclass
+    class Shape(DictModel):
+        name: str
+
+        object_data = {1: {"name": "Circle"}}
+
+    load = mocker.spy(Shape, "_load_object_data")
+    field = DictModelField(Shape)
+    name, path, args, kwargs = field.deconstruct()
+    assert args == ["Shape"]
+    assert "choices" not in kwargs
+    field.clone()
+    assert load.call_count == 0
+    assert isinstance(Shape.__dict__["object_lookup"], LazyAttribute)
+    assert isinstance(field.choices, DictModelChoices)
+
+    name, path, args, kwargs = DictModelField(Shape, choices=[(1, "O")]).deconstruct()
+    assert kwargs["choices"] == [(1, "O")]
+
+
+def test_dict_model_field_dm_lookup_filters_objects_and_matches_their_ids(
+    django_models,
+):
+    @dataclass
+    class Size(DictModel):
+        name: str
+        active: bool = True
+
+        indexes = ("active",)
+
+        object_data = {
+            1: {"name": "S"},
+            2: {"name": "M", "active": False},
+            3: {"name": "L"},
+        }
+
+    class Order(models.Model):
+        size = DictModelField(Size)
+
+        class Meta:
+            app_label = "tests"
+
+    def where(queryset):
+        return str(queryset.query).partition(" WHERE ")[2]
+
+    assert where(Order.objects.filter(size__dm__active=True)) == (
+        '"tests_order"."size" IN (1, 3)'
+    )
+    assert where(Order.objects.filter(size__dm__name__in=["M", "XL"])) == (
+        '"tests_order"."size" IN (2)'
+    )
+    assert where(Order.objects.filter(size__dm__name__startswith="L")) == (
+        '"tests_order"."size" IN (3)'
+    )
+    assert not Order.objects.filter(size__dm__name="XL").exists()
+
+    Size.M.active = True
+    Size.M.save()
+    assert where(Order.objects.filter(size__dm__active=True)) == (
+        '"tests_order"."size" IN (1, 2, 3)'
+    )
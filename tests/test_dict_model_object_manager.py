@@ -1,3 +1,4 @@
+import asyncio
 from dataclasses import dataclass
 
 import pytest
@@ -17,6 +18,31 @@ def test_dict_model_object_manager_create_saves_object():
     assert Empty.object_lookup == {1: obj}
 
 
+def test_dict_model_object_manager_async_methods():
+    @dataclass
+    class Broth(dict_model.DictModel):
+        name: str
+
+        object_data = {1: {"name": "miso"}}
+
+    Broth.init()
+
+    async def use_objects():
+        obj = await Broth.objects.acreate(name="dashi")
+        return (
+            obj,
+            await Broth.objects.acount(),
+            await Broth.objects.afirst(),
+            await Broth.objects.aget(name="dashi"),
+        )
+
+    obj, count, first, got = asyncio.run(use_objects())
+    assert obj.id == 2
+    assert Broth.object_lookup[2] is obj is got
+    assert count == 2
+    assert first is Broth.MISO
+
+
 def test_dict_model_object_manager_all_returns_query_set_of_all_objects_ordered_by_id():
     @dataclass
     class Soda(dict_model.DictModel):
@@ -40,6 +66,7 @@ def test_dict_model_object_manager_all_returns_query_set_of_all_objects_ordered_
         ("filter", {"name": "Fork"}, DictModelQuerySet),
         ("get", {"id": 2}, dict_model.DictModel),
         ("last", {}, dict_model.DictModel),
+        ("order_by", {"field": "name"}, DictModelQuerySet),
     ],
 )
 def test_dict_model_object_manager_delegates_query_set_methods_to_query_set(
@@ -55,3 +82,196 @@ def test_dict_model_object_manager_delegates_query_set_methods_to_query_set(
     object_manager = dict_model.DictModelObjectManager(Silverware)
     query_set_method = getattr(object_manager, method)
     assert isinstance(query_set_method(**kwargs), return_type)
+
+
+@pytest.fixture
+def planet_model():
+    @dataclass
+    class Planet(dict_model.DictModel):
+        name: str
+        rocky: bool
+
+        object_data = {
+            1: {"name": "Mercury", "rocky": True},
+            2: {"name": "Venus", "rocky": True},
+            3: {"name": "Jupiter", "rocky": False},
+        }
+
+    return Planet.init()
+
+
+def test_dict_model_object_manager_get_by_id_does_not_scan_objects(
+    planet_model, mocker
+):
+    plan = mocker.spy(DictModelQuerySet, "_plan")
+    assert planet_model.objects.get(id=2) == planet_model(
+        id=2, name="Venus", rocky=True
+    )
+    ids, _, _ = plan.spy_return
+    assert ids == {2}
+
+    assert planet_model.objects.get(pk=3) == planet_model(
+        id=3, name="Jupiter", rocky=False
+    )
+    ids, _, _ = plan.spy_return
+    assert ids == {3}
+
+
+def test_dict_model_object_manager_get_by_id_applies_remaining_filters(planet_model):
+    with pytest.raises(DictModelQuerySet.DoesNotExist):
+        planet_model.objects.get(id=3, rocky=True)
+
+
+def test_dict_model_object_manager_get_by_missing_id_raises_error(planet_model):
+    with pytest.raises(DictModelQuerySet.DoesNotExist):
+        planet_model.objects.get(id=42)
+
+
+def test_dict_model_object_manager_get_by_id_in_raises_error_for_multiple_results(
+    planet_model,
+):
+    with pytest.raises(DictModelQuerySet.MultipleResultsFound):
+        planet_model.objects.get(id__in=[1, 2])
+
+
+def test_dict_model_object_manager_filter_by_id_in_returns_objects_ordered_by_id(
+    planet_model,
+):
+    assert planet_model.objects.filter(id__in=[3, 42, 1], rocky=True) == (
+        DictModelQuerySet([planet_model(id=1, name="Mercury", rocky=True)])
+    )
+    assert planet_model.objects.filter(pk__in=[3, 1]) == DictModelQuerySet(
+        [
+            planet_model(id=1, name="Mercury", rocky=True),
+            planet_model(id=3, name="Jupiter", rocky=False),
+        ]
+    )
+
+
+def test_dict_model_object_manager_keeps_objects_in_id_order(planet_model):
+    planet_model.objects.create(name="Earth", rocky=True)
+    planet_model(id=0, name="Vulcan", rocky=True).save()
+    planet_model.objects.get(id=2).delete()
+    assert [planet.id for planet in planet_model.objects.all()] == [0, 1, 3, 4]
+    assert [planet.id for planet in planet_model.objects.filter(id__gte=3)] == [3, 4]
+
+
+def test_dict_model_object_manager_first_and_last_do_not_evaluate_query_set(
+    planet_model, mocker
+):
+    evaluate = mocker.spy(DictModelQuerySet, "_evaluate")
+    assert planet_model.objects.first().name == "Mercury"
+    assert planet_model.objects.last().name == "Jupiter"
+    assert planet_model.objects.filter(rocky=True).last().name == "Venus"
+    assert planet_model.objects.filter(name="Pluto").first() is None
+    assert evaluate.call_count == 0
+
+
+@pytest.fixture
+def gem_model():
+    @dataclass
+    class Gem(dict_model.DictModel):
+        name: str
+        carats: int
+
+        indexes = ("name", dict_model.SortedIndex("carats"))
+
+        object_data = {1: {"name": "Ruby", "carats": 3}}
+
+    return Gem.init()
+
+
+def test_dict_model_object_manager_bulk_create_saves_objects_in_batches(gem_model):
+    gems = gem_model.objects.bulk_create(
+        [
+            gem_model(name="Opal", carats=2),
+            gem_model(id=7, name="Jade", carats=5),
+            gem_model(name="Onyx", carats=1),
+        ],
+        batch_size=2,
+    )
+    assert [gem.id for gem in gems] == [8, 7, 9]
+    assert [gem.id for gem in gem_model.objects.all()] == [1, 7, 8, 9]
+    assert [gem.name for gem in gem_model.objects.order_by("carats")] == [
+        "Onyx",
+        "Opal",
+        "Ruby",
+        "Jade",
+    ]
+    assert gem_model.objects.get(name="Jade").id == 7
+    assert gem_model.ONYX is gems[2]
+
+
+def test_dict_model_object_manager_bulk_update_updates_fields_and_indexes(gem_model):
+    gem_model.objects.bulk_create([gem_model(name="Opal", carats=2)])
+    ruby = gem_model.objects.get(id=1)
+    ruby.carats = 4
+    opal = gem_model(id=2, name="Fire opal", carats=6)
+    assert gem_model.objects.bulk_update([ruby, opal], ["carats"]) == 2
+
+    assert gem_model.objects.get(id=2) == gem_model(id=2, name="Opal", carats=6)
+    assert [gem.name for gem in gem_model.objects.filter(carats__gt=3)] == [
+        "Ruby",
+        "Opal",
+    ]
+
+
+@pytest.mark.parametrize(
+    "fields, error",
+    [
+        (["id"], dict_model.DictModel.CannotUpdatePrimaryKey),
+        (["shine"], dict_model.DictModel.UnknownField),
+    ],
+)
+def test_dict_model_object_manager_bulk_update_raises_error_for_invalid_fields(
+    gem_model, fields, error
+):
+    with pytest.raises(error):
+        gem_model.objects.bulk_update([gem_model.objects.get(id=1)], fields)
+
+
+def test_dict_model_object_manager_bulk_update_raises_error_if_not_persisted(
+    gem_model,
+):
+    with pytest.raises(dict_model.DictModel.NotPersisted):
+        gem_model.objects.bulk_update([gem_model(name="Opal", carats=2)], ["carats"])
+
+
+@pytest.mark.parametrize("kwargs", [{"carats": "many"}, {"name": ["Opal"]}])
+def test_dict_model_object_manager_writes_nothing_if_index_rejects_value(
+    gem_model, kwargs
+):
+    values = {"name": "Opal", "carats": 2, **kwargs}
+    with pytest.raises(TypeError):
+        gem_model.objects.create(**values)
+    with pytest.raises(TypeError):
+        gem_model.objects.bulk_create(
+            [gem_model(name="Jade", carats=5), gem_model(**values)]
+        )
+    with pytest.raises(TypeError):
+        gem_model.objects.all().update(**kwargs)
+
+    assert list(gem_model.object_lookup) == [1]
+    assert gem_model.objects.all() == [gem_model(id=1, name="Ruby", carats=3)]
+    with pytest.raises(dict_model.DictModelQuerySet.DoesNotExist):
+        gem_model.objects.get(id=2)
+    assert gem_model.objects.create(name="Opal", carats=2).id == 2
+
+
+def test_dict_model_object_manager_bulk_delete_removes_objects(gem_model):
+    gems = gem_model.objects.bulk_create(
+        [gem_model(name="Opal", carats=2), gem_model(name="Jade", carats=5)]
+    )
+    assert gem_model.objects.bulk_delete([gems[0], gem_model.RUBY]) == 2
+    assert list(gem_model.object_lookup) == [3]
+    assert list(gem_model.objects.filter(carats__lt=5)) == []
+
+
+def test_dict_model_object_manager_bulk_delete_raises_error_if_not_persisted(
+    gem_model,
+):
+    with pytest.raises(dict_model.DictModel.NotPersisted):
+        gem_model.objects.bulk_delete(
+            [gem_model.RUBY, gem_model(id=5, name="", carats=0)]
+        )
+    assert list(gem_model.object_lookup) == [1]
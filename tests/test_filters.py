@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import pytest
+
+from dict_model import DictModel, filters
+
+
+@dataclass
+class Author(DictModel):
+    name: str
+
+
+@dataclass
+class Book(DictModel):
+    title: str
+    pages: int
+    published: Optional[datetime] = None
+    author: Optional[Author] = None
+
+
+BOOK = Book(
+    id=1,
+    title="The Left Hand of Darkness",
+    pages=304,
+    published=datetime(1969, 3, 1),
+    author=Author(id=1, name="Ursula K. Le Guin"),
+)
+
+
+@pytest.mark.parametrize(
+    "key, path, lookup",
+    [
+        ("title", ("title",), "exact"),
+        ("title__iexact", ("title",), "iexact"),
+        ("author__name", ("author", "name"), "exact"),
+        ("author__name__in", ("author", "name"), "in"),
+        ("range", ("range",), "exact"),
+    ],
+)
+def test_parse_lookup(key, path, lookup):
+    assert filters.parse_lookup(key) == (path, lookup)
+
+
+@pytest.mark.parametrize(
+    "kwargs, passes",
+    [
+        ({"pages": 304}, True),
+        ({"pages__exact": 305}, False),
+        ({"title__iexact": "the left hand of darkness"}, True),
+        ({"pages__in": [100, 304]}, True),
+        ({"pages__in": (p for p in [100, 200])}, False),
+        ({"pages__gt": 304}, False),
+        ({"pages__gte": 304}, True),
+        ({"pages__lt": 305}, True),
+        ({"pages__lte": 303}, False),
+        ({"published__range": (datetime(1969, 1, 1), datetime(1970, 1, 1))}, True),
+        ({"published__isnull": True}, False),
+        ({"published__isnull": False}, True),
+        ({"title__contains": "Hand"}, True),
+        ({"title__contains": "hand"}, False),
+        ({"title__icontains": "hand"}, True),
+        ({"title__startswith": "The"}, True),
+        ({"title__istartswith": "the"}, True),
+        ({"title__endswith": "Light"}, False),
+        ({"title__iendswith": "DARKNESS"}, True),
+        ({"author__name__startswith": "Ursula"}, True),
+        ({"pages": 304, "title__contains": "Right"}, False),
+    ],
+)
+def test_compile_filters_lookups(kwargs, passes):
+    assert filters.compile_filters(kwargs)(BOOK) is passes
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"published__gt": datetime(1900, 1, 1)},
+        {"published__range": (datetime(1900, 1, 1), datetime(2000, 1, 1))},
+        {"author__name": "Ursula K. Le Guin"},
+        {"author__name__icontains": "ursula"},
+    ],
+)
+def test_compile_filters_null_values_do_not_match(kwargs):
+    book = Book(id=2, title="Untitled", pages=1)
+    assert filters.compile_filters(kwargs)(book) is False
+
+
+def test_compile_filters_iexact_none_matches_null_values():
+    predicate = filters.compile_filters({"published__iexact": None})
+    assert predicate(Book(id=2, title="Untitled", pages=1)) is True
+    assert predicate(BOOK) is False
+
+
+def test_compile_filters_negated():
+    assert filters.compile_filters({"pages__gt": 300}, negated=True)(BOOK) is False
+    assert filters.compile_filters({"pages__gt": 400}, negated=True)(BOOK) is True
+
+
+def test_compile_filters_in_handles_unhashable_attributes():
+    @dataclass
+    class Tagged(DictModel):
+        tags: list
+
+    tagged = Tagged(id=1, tags=["a", "b"])
+    assert filters.compile_filters({"tags__in": [["a", "b"], ["c"]]})(tagged) is True
+
+
+def test_compile_filters_caches_predicates_by_normalized_filters():
+    predicate = filters.compile_filters({"pages__in": [1, 2], "title": "A"})
+    assert filters.compile_filters({"title": "A", "pages__in": [1, 2]}) is predicate
+    assert filters.compile_filters({"title": "A", "pages__in": (1, 2)}) is not predicate
+    assert filters.compile_filters({"title": "A", "pages__in": [1, 2]}, True) is not (
+        predicate
+    )
+
+
+def test_compile_filters_does_not_cache_unhashable_values():
+    kwargs = {"author": Author(id=1, name="Ursula K. Le Guin")}
+    assert filters.compile_filters(kwargs) is not filters.compile_filters(kwargs)
+
+
+def test_compile_filters_evicts_least_recently_used_predicates(mocker):
+    mocker.patch.object(filters, "MAX_CACHED_PREDICATES", 2)
+    mocker.patch.dict(filters._predicate_cache, clear=True)
+    first = filters.compile_filters({"pages": 1})
+    second = filters.compile_filters({"pages": 2})
+    assert filters.compile_filters({"pages": 1}) is first
+    filters.compile_filters({"pages": 3})
+    assert filters.compile_filters({"pages": 1}) is first
+    assert filters.compile_filters({"pages": 2}) is not second
+
+
+def test_compile_filters_cached_predicates_do_not_change_with_filter_values():
+    @dataclass
+    class Tagged(DictModel):
+        tags: list
+
+    wanted = [1]
+    assert filters.compile_filters({"tags": wanted})(Tagged(id=1, tags=[1])) is True
+    wanted.append(2)
+    predicate = filters.compile_filters({"tags": [1]})
+    assert predicate(Tagged(id=1, tags=[1])) is True
+    assert predicate(Tagged(id=2, tags=[1, 2])) is False
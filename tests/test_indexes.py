@@ -0,0 +1,186 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+from dict_model import DictModel
+from dict_model.indexes import HashIndex, IdIndex, SortedIndex, build_index
+
+
+@dataclass
+class Color(DictModel):
+    name: str
+    warm: bool
+
+
+def test_hash_index_get_returns_ids_with_value():
+    index = HashIndex("warm")
+    index.add(Color(id=1, name="red", warm=True))
+    index.add(Color(id=2, name="blue", warm=False))
+    index.add(Color(id=3, name="orange", warm=True))
+    assert index.get(True) == {1, 3}
+    assert index.get(None) == set()
+
+
+def test_hash_index_get_many_returns_ids_with_any_value():
+    index = HashIndex("name")
+    index.add(Color(id=1, name="red", warm=True))
+    index.add(Color(id=2, name="blue", warm=False))
+    index.add(Color(id=3, name="orange", warm=True))
+    assert index.get_many(["red", "blue", "green"]) == {1, 2}
+
+
+def test_hash_index_add_replaces_previous_value_of_object():
+    index = HashIndex("name")
+    color = Color(id=1, name="red", warm=True)
+    index.add(color)
+    color.name = "crimson"
+    index.add(color)
+    assert index.get("red") == set()
+    assert index.get("crimson") == {1}
+    assert len(index) == 1
+
+
+def test_hash_index_remove_drops_object():
+    index = HashIndex("name")
+    index.add(Color(id=1, name="red", warm=True))
+    index.remove(1)
+    index.remove(2)
+    assert index.get("red") == set()
+    assert len(index) == 0
+
+
+@dataclass
+class Event(DictModel):
+    name: str
+    day: Optional[int]
+
+
+EVENTS = [
+    Event(id=1, name="launch", day=5),
+    Event(id=2, name="review", day=2),
+    Event(id=3, name="party", day=None),
+    Event(id=4, name="retro", day=5),
+    Event(id=5, name="kickoff", day=1),
+]
+
+
+@pytest.fixture
+def sorted_index():
+    index = SortedIndex("day")
+    index.build(EVENTS)
+    return index
+
+
+@pytest.mark.parametrize(
+    "lookup, value, ids",
+    [
+        ("exact", 5, {1, 4}),
+        ("exact", None, {3}),
+        ("in", [1, 2, 3], {2, 5}),
+        ("gt", 2, {1, 4}),
+        ("gte", 2, {1, 2, 4}),
+        ("lt", 5, {2, 5}),
+        ("lte", 5, {1, 2, 4, 5}),
+        ("range", (2, 4), {2}),
+        ("gt", None, None),
+        ("contains", 5, None),
+    ],
+)
+def test_sorted_index_lookup(sorted_index, lookup, value, ids):
+    assert sorted_index.lookup(lookup, value) == ids
+
+
+def test_sorted_index_ordered_ids_matches_stable_sort(sorted_index):
+    assert list(sorted_index.ordered_ids()) == [5, 2, 1, 4, 3]
+    assert list(sorted_index.ordered_ids(reverse=True)) == [3, 1, 4, 2, 5]
+
+
+def test_sorted_index_add_keeps_entries_sorted(sorted_index):
+    event = Event(id=6, name="demo", day=3)
+    sorted_index.add(event)
+    event.day = 0
+    sorted_index.add(event)
+    assert list(sorted_index.ordered_ids()) == [6, 5, 2, 1, 4, 3]
+    assert len(sorted_index) == 6
+
+
+def test_sorted_index_remove(sorted_index):
+    sorted_index.remove(1)
+    sorted_index.remove(3)
+    assert list(sorted_index.ordered_ids()) == [5, 2, 4]
+    assert sorted_index.lookup("exact", None) == set()
+
+
+def test_build_index_returns_new_index_for_declaration():
+    declaration = SortedIndex("day")
+    index = build_index(declaration)
+    assert isinstance(index, SortedIndex)
+    assert index is not declaration
+    assert isinstance(build_index("name"), HashIndex)
+
+
+def test_id_index_keeps_ids_sorted():
+    index = IdIndex()
+    index.build([Color(id=3, name="red", warm=True), Color(id=1, name="blue", warm=0)])
+    for id in (4, 2, 4):
+        index.add(Color(id=id, name="green", warm=False))
+    index.remove(3)
+    index.remove(10)
+    assert list(index) == [1, 2, 4]
+    assert list(index.ordered_ids(reverse=True)) == [4, 2, 1]
+
+
+@pytest.mark.parametrize(
+    "lookup, value, ids",
+    [
+        ("gt", 2, {3, 4}),
+        ("gte", 2, {2, 3, 4}),
+        ("lt", 2, {1}),
+        ("lte", 2, {1, 2}),
+        ("range", (2, 3), {2, 3}),
+        ("exact", 2, None),
+        ("lt", None, None),
+    ],
+)
+def test_id_index_lookup(lookup, value, ids):
+    index = IdIndex()
+    index.build([Color(id=id, name="red", warm=True) for id in (1, 2, 3, 4)])
+    assert index.lookup(lookup, value) == ids
+
+
+@pytest.mark.parametrize("step", [100, 2])
+def test_indexes_remove_many(step):
+    colors = [Color(id=id, name=f"color {id % 3}", warm=True) for id in range(300)]
+    removed = set(range(0, 300, step))
+    expected = {id for id in range(0, 300, 3)} - removed
+
+    hash_index = HashIndex("name")
+    hash_index.build(colors)
+    hash_index.remove_many(removed)
+    assert hash_index.get("color 0") == expected
+
+    sorted_index = SortedIndex("name")
+    sorted_index.build(colors)
+    sorted_index.remove_many(removed)
+    assert sorted_index.get("color 0") == expected
+
+    id_index = IdIndex()
+    id_index.build(colors)
+    id_index.remove_many(removed)
+    assert list(id_index) == sorted(set(range(300)) - removed)
+
+
+@pytest.mark.parametrize("index", [HashIndex("warm"), SortedIndex("warm"), IdIndex()])
+def test_indexes_copy_changes_independently(index):
+    red, blue = Color(id=1, name="red", warm=True), Color(id=2, name="blue", warm=False)
+    index.add(red)
+    copied = index.copy()
+    copied.add(blue)
+    copied.remove(1)
+    if isinstance(index, IdIndex):
+        assert list(index) == [1]
+        assert list(copied) == [2]
+    else:
+        assert (index.get(True), index.get(False)) == ({1}, set())
+        assert (copied.get(True), copied.get(False)) == (set(), {2})
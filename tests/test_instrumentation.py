@@ -0,0 +1,99 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from dict_model import DictModel, instrumentation
+
+
+@pytest.fixture
+def indexed_model():
+    @dataclass
+    class Planet(DictModel):
+        name: str
+        moons: int
+
+        indexes = ("moons",)
+
+        object_data = {
+            1: {"name": "Mercury", "moons": 0},
+            2: {"name": "Venus", "moons": 0},
+            3: {"name": "Earth", "moons": 1},
+            4: {"name": "Mars", "moons": 2},
+        }
+
+    return Planet.init()
+
+
+def test_instrumentation_is_disabled_by_default(indexed_model, mocker):
+    query_trace = mocker.patch.object(instrumentation, "QueryTrace")
+    assert not instrumentation.enabled
+    assert len(indexed_model.objects.filter(moons=0)) == 2
+    assert query_trace.call_count == 0
+
+
+def test_record_queries_records_scanned_and_returned_rows(indexed_model):
+    with instrumentation.record_queries() as events:
+        assert instrumentation.enabled
+        len(indexed_model.objects.filter(moons=0))
+        indexed_model.objects.filter(name__startswith="M").order_by("-name").first()
+        indexed_model.objects.get(id=3)
+    assert not instrumentation.enabled
+
+    assert [
+        (event.full_scan, event.rows_scanned, event.rows_returned) for event in events
+    ] == [(False, 2, 2), (True, 4, 2), (False, 1, 1)]
+    assert events[0].dict_model_class is indexed_model
+    assert events[0].filters == (({"moons": 0}, False),)
+    assert events[1].ordering == ("-name",)
+    assert all(event.seconds >= 0 for event in events)
+
+
+def test_record_queries_only_records_queries_above_threshold(indexed_model):
+    with instrumentation.record_queries(threshold=60) as slow_events:
+        with instrumentation.record_queries() as events:
+            indexed_model.objects.first()
+    assert len(events) == 1
+    assert slow_events == []
+
+
+def test_record_queries_records_async_queries(indexed_model):
+    async def query():
+        with instrumentation.record_queries() as events:
+            assert await indexed_model.objects.filter(moons__gt=0).acount() == 2
+        return events
+
+    events = asyncio.run(query())
+    assert [(event.rows_scanned, event.rows_returned) for event in events] == [(4, 2)]
+
+
+def test_listeners_are_called_with_queries_above_threshold(indexed_model):
+    all_events, slow_events = [], []
+    instrumentation.add_listener(all_events.append)
+    instrumentation.add_listener(slow_events.append, threshold=60)
+    try:
+        indexed_model.objects.filter(moons=1).first()
+    finally:
+        instrumentation.remove_listener(all_events.append)
+        instrumentation.remove_listener(slow_events.append)
+    assert not instrumentation.enabled
+
+    indexed_model.objects.filter(moons=1).first()
+    assert [event.rows_returned for event in all_events] == [1]
+    assert slow_events == []
+
+
+def test_collect_stats_adds_up_queries_per_model(indexed_model):
+    instrumentation.collect_stats()
+    try:
+        indexed_model.objects.filter(moons=0).values_list("name")
+        indexed_model.objects.exclude(moons=0).values_list("name")
+    finally:
+        instrumentation.collect_stats(False)
+    indexed_model.objects.all().values_list("name")
+
+    stats = indexed_model.objects.query_stats()
+    assert (stats.queries, stats.full_scans) == (2, 1)
+    assert (stats.rows_scanned, stats.rows_returned) == (6, 4)
+    instrumentation.reset_stats()
+    assert indexed_model.objects.query_stats() == instrumentation.QueryStats()
@@ -0,0 +1,52 @@
+import threading
+import time
+
+from dict_model.lazy import PendingInit
+
+
+def test_pending_init_loads_once_for_all_threads():
+    calls = []
+
+    def load():
+        time.sleep(0.01)
+        calls.append(threading.get_ident())
+
+    pending_init = PendingInit(load)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(pending_init.run()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [True] * 8
+    assert pending_init.done
+
+
+def test_pending_init_is_not_done_while_loading():
+    results = []
+    pending_init = PendingInit(lambda: results.append(pending_init.run()))
+    assert pending_init.run()
+    assert results == [False]
+
+
+def test_pending_init_can_be_retried_after_failing():
+    attempts = []
+
+    def load():
+        attempts.append(None)
+        if len(attempts) == 1:
+            raise ValueError()
+
+    pending_init = PendingInit(load)
+    try:
+        pending_init.run()
+    except ValueError:
+        pass
+    assert not pending_init.done
+    assert pending_init.run()
+    assert len(attempts) == 2
@@ -0,0 +1,88 @@
+import enum
+import gc
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+import pytest
+
+import dict_model
+from dict_model import mapped
+
+from . import TEST_FILES
+
+
+class Size(enum.Enum):
+    SMALL = "s"
+    LARGE = "l"
+
+
+@pytest.fixture
+def crate_model():
+    @dataclass
+    class Crate(dict_model.DictModel):
+        name: str
+        weight: Optional[int] = None
+        price: Optional[Decimal] = None
+        ratio: float = 0.0
+        sealed: bool = False
+        size: Size = Size.SMALL
+        shipped: Optional[date] = None
+        tags: Optional[List[str]] = None
+
+        object_data = {
+            2: {"name": "apples", "weight": 12, "price": "3.50", "ratio": 0.5},
+            5: {"name": "pears", "sealed": True, "size": "l", "shipped": "2023-01-02"},
+            9: {"name": "", "weight": -(2**63), "tags": ["fragile"]},
+        }
+
+    return Crate.init()
+
+
+def test_mapped_object_lookup_reads_objects_written(crate_model):
+    objects = dict(crate_model.object_lookup)
+    mapped.write(crate_model, TEST_FILES / "test.mapped")
+    object_lookup = mapped.MappedObjectLookup(crate_model, TEST_FILES / "test.mapped")
+
+    assert len(object_lookup) == 3
+    assert list(object_lookup) == [2, 5, 9]
+    assert dict(object_lookup) == objects
+    assert 5 in object_lookup
+    assert 3 not in object_lookup
+    assert "5" not in object_lookup
+    with pytest.raises(KeyError):
+        object_lookup[4]
+
+
+def test_mapped_object_lookup_keeps_objects_only_while_in_use(crate_model):
+    mapped.write(crate_model, TEST_FILES / "test.mapped")
+    object_lookup = mapped.MappedObjectLookup(crate_model, TEST_FILES / "test.mapped")
+
+    crate = object_lookup[2]
+    assert object_lookup[2] is crate
+    del crate
+    gc.collect()
+    assert len(object_lookup._objects) == 0
+    assert object_lookup[2].name == "apples"
+
+
+def test_mapped_object_lookup_partial_objects_hold_one_field(crate_model):
+    mapped.write(crate_model, TEST_FILES / "test.mapped")
+    object_lookup = mapped.MappedObjectLookup(crate_model, TEST_FILES / "test.mapped")
+
+    assert [(obj.id, obj.size) for obj in object_lookup.partial_objects("size")] == [
+        (2, Size.SMALL),
+        (5, Size.LARGE),
+        (9, Size.SMALL),
+    ]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", b"not a mapped file", mapped.MAGIC + b"\x02\x00", mapped.MAGIC + b"\xff" * 8],
+)
+def test_mapped_object_lookup_rejects_other_files(crate_model, content):
+    (TEST_FILES / "test.mapped").write_bytes(content)
+    with pytest.raises(dict_model.DictModel.IncompatibleMappedFile):
+        mapped.MappedObjectLookup(crate_model, TEST_FILES / "test.mapped")
@@ -0,0 +1,136 @@
+import threading
+from dataclasses import dataclass
+
+import pytest
+
+from dict_model import DictModel
+from dict_model.query_cache import QueryCache, get_query_key
+from dict_model.query_sets import DictModelQuerySet
+
+
+@pytest.fixture
+def cached_model():
+    @dataclass
+    class Country(DictModel):
+        name: str
+        continent: str
+
+        query_cache_size = 2
+
+        object_data = {
+            1: {"name": "France", "continent": "Europe"},
+            2: {"name": "Japan", "continent": "Asia"},
+            3: {"name": "Spain", "continent": "Europe"},
+        }
+
+    return Country.init()
+
+
+def test_get_query_key_ignores_keyword_order_but_not_value_types():
+    assert get_query_key(
+        (({"a": 1, "b__in": [1, 2]}, False),), ("a",)
+    ) == get_query_key((({"b__in": [1, 2], "a": 1}, False),), ("a",))
+    assert get_query_key((({"a": [1]}, False),), ()) != get_query_key(
+        (({"a": (1,)}, False),), ()
+    )
+    assert get_query_key((({"a": 1}, False),), ()) != get_query_key(
+        (({"a": 1}, True),), ()
+    )
+    assert get_query_key((({"a": 1}, False),), ()) != get_query_key(
+        (({"a": True}, False),), ()
+    )
+    assert get_query_key((({"a": {"b": [1]}}, False),), ()) == get_query_key(
+        (({"a": {"b": [1]}}, False),), ()
+    )
+    assert get_query_key((({"a": bytearray(b"1")}, False),), ()) is None
+
+
+def test_query_cache_drops_least_recently_used_results():
+    query_cache = QueryCache(2)
+    query_cache.set(1, "a", [1])
+    query_cache.set(1, "b", [2])
+    assert query_cache.get(1, "a") == [1]
+    query_cache.set(1, "c", [3])
+    assert query_cache.get(1, "b") is None
+    assert query_cache.get(1, "a") == [1]
+    assert (query_cache.hits, query_cache.misses) == (2, 1)
+
+
+def test_query_cache_drops_results_of_other_generations():
+    query_cache = QueryCache(2)
+    query_cache.set(1, "a", [1])
+    assert query_cache.get(2, "a") is None
+    # Results computed before the generation changed are not kept.
+    query_cache.set(1, "a", [1])
+    assert query_cache.get(2, "a") is None
+    assert len(query_cache) == 0
+
+
+def test_query_sets_reuse_cached_results(cached_model, mocker):
+    matches = mocker.spy(DictModelQuerySet, "_matches")
+    europe = cached_model.objects.filter(continent="Europe").order_by("name")
+    assert [country.name for country in europe] == ["France", "Spain"]
+    again = cached_model.objects.filter(continent="Europe").order_by("name")
+    assert len(again) == 2
+    # The query sets read the cached results until one of them changes its own.
+    assert again._result_cache is europe._result_cache
+    again.pop()
+    assert again._result_cache is not europe._result_cache
+    assert europe.values_list("name", flat=True) == ["France", "Spain"]
+    assert matches.call_count == 1
+
+
+def test_query_cache_is_invalidated_by_writes(cached_model):
+    def europe():
+        return [c.name for c in cached_model.objects.filter(continent="Europe")]
+
+    assert europe() == ["France", "Spain"]
+    cached_model.objects.create(name="Italy", continent="Europe")
+    assert europe() == ["France", "Spain", "Italy"]
+    cached_model.objects.get(name="France").delete()
+    assert europe() == ["Spain", "Italy"]
+    cached_model.objects.filter(name="Spain").update(continent="Spain")
+    assert europe() == ["Italy"]
+    cached_model.objects.bulk_create([cached_model(name="Malta", continent="Europe")])
+    assert europe() == ["Italy", "Malta"]
+    cached_model.init({1: {"name": "France", "continent": "Europe"}}, force=True)
+    assert europe() == ["France"]
+
+
+def test_query_sets_cannot_change_cached_results(cached_model):
+    query_set = cached_model.objects.filter(continent="Europe")
+    assert len(query_set) == 2
+    cached_model.objects.filter(continent="Europe").data.append("junk")
+    query_set.pop()
+    query_set.append(cached_model.objects.get(name="Japan"))
+    assert [country.name for country in query_set] == ["France", "Japan"]
+    assert [
+        country.name for country in cached_model.objects.filter(continent="Europe")
+    ] == ["France", "Spain"]
+
+
+def test_query_cache_is_not_used_by_default():
+    @dataclass
+    class City(DictModel):
+        name: str
+
+    City.init()
+    assert City._get_query_cache() is None
+    assert list(City.objects.filter(name="Paris")) == []
+
+
+def test_query_cache_is_safe_to_use_from_threads(cached_model):
+    errors = []
+
+    def query():
+        for _ in range(200):
+            names = [c.name for c in cached_model.objects.filter(continent="Asia")]
+            if names != ["Japan"]:
+                errors.append(names)
+
+    threads = [threading.Thread(target=query) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
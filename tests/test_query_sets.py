@@ -1,9 +1,12 @@
+import asyncio
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
 
 import pytest
 
-from dict_model import DictModel
-from dict_model.query_sets import DictModelQuerySet
+from dict_model import DictModel, SortedIndex, instrumentation
+from dict_model.query_sets import DictModelQuerySet, IndexUse, get_pk_candidates
 
 
 def test_dict_model_query_set_assigns_dict_model_class_explicitly_if_assigned():
@@ -334,3 +337,345 @@ def test_query_set_order_by_descending_order():
             Number(id=4, value=25),
         ]
     )
+
+
+@pytest.mark.parametrize(
+    "filters, candidates",
+    [
+        ({"name": "Fork"}, None),
+        ({"id": 2, "name": "Fork"}, [2]),
+        ({"pk": 2}, [2]),
+        ({"id__in": [3, 1, 3]}, [3, 1]),
+        ({"id__in": [3, 1], "pk": 1}, [1]),
+        ({"id": 2, "pk": 1}, []),
+        ({"id": [2]}, None),
+    ],
+)
+def test_get_pk_candidates(filters, candidates):
+    assert get_pk_candidates(filters) == candidates
+
+
+def test_query_set_chained_calls_are_evaluated_once_when_needed(mocker):
+    @dataclass
+    class Score(DictModel):
+        value: int
+        final: bool
+
+    query_set = DictModelQuerySet(
+        [
+            Score(id=1, value=3, final=True),
+            Score(id=2, value=1, final=True),
+            Score(id=3, value=2, final=False),
+            Score(id=4, value=5, final=True),
+        ]
+    )
+    evaluate = mocker.spy(DictModelQuerySet, "_evaluate")
+
+    chained = query_set.filter(final=True).exclude(value=5).order_by("-value")
+    assert evaluate.call_count == 0
+
+    assert len(chained) == 2
+    assert bool(chained) is True
+    assert [score.id for score in chained] == [1, 2]
+    assert chained[0] == Score(id=1, value=3, final=True)
+    assert evaluate.call_count == 1
+
+
+def test_query_set_slicing_returns_query_set():
+    @dataclass
+    class Step(DictModel):
+        number: int
+
+    query_set = DictModelQuerySet([Step(id=1, number=1), Step(id=2, number=2)])
+    assert query_set[1:] == DictModelQuerySet([Step(id=2, number=2)])
+    assert query_set[5:] == DictModelQuerySet([], dict_model_class=Step)
+
+
+def test_query_set_covering_dict_model_reflects_changes_until_evaluated():
+    @dataclass
+    class Bird(DictModel):
+        name: str
+        flies: bool
+
+        object_data = {1: {"name": "Crow", "flies": True}}
+
+    Bird.init()
+    query_set = Bird.objects.filter(flies=True)
+    Bird.objects.create(name="Swallow", flies=True)
+    Bird.objects.create(name="Penguin", flies=False)
+    assert [bird.name for bird in query_set] == ["Crow", "Swallow"]
+
+
+def test_query_set_filter_and_exclude_support_comparison_lookups():
+    @dataclass
+    class Mountain(DictModel):
+        name: str
+        height: int
+
+    query_set = DictModelQuerySet(
+        [
+            Mountain(id=1, name="Everest", height=8849),
+            Mountain(id=2, name="Mont Blanc", height=4806),
+            Mountain(id=3, name="Kilimanjaro", height=5895),
+        ]
+    )
+    assert query_set.filter(height__gt=5000).exclude(name__icontains="rest") == (
+        DictModelQuerySet([Mountain(id=3, name="Kilimanjaro", height=5895)])
+    )
+
+
+@pytest.fixture
+def dated_model():
+    @dataclass
+    class Post(DictModel):
+        title: str
+        created: datetime
+
+        indexes = (SortedIndex("created"),)
+
+        object_data = {
+            1: {"title": "first", "created": datetime(2023, 1, 3)},
+            2: {"title": "second", "created": datetime(2023, 1, 1)},
+            3: {"title": "third", "created": datetime(2023, 1, 2)},
+            4: {"title": "fourth", "created": datetime(2023, 1, 2)},
+        }
+
+    return Post.init()
+
+
+def test_query_set_range_filters_use_sorted_index(dated_model, mocker):
+    plan = mocker.spy(DictModelQuerySet, "_plan")
+    query_set = dated_model.objects.filter(
+        created__range=(datetime(2023, 1, 2), datetime(2023, 1, 3))
+    ).exclude(created__gt=datetime(2023, 1, 2))
+    assert [post.title for post in query_set] == ["third", "fourth"]
+    ids, checks, excluded = plan.spy_return
+    assert ids == {1, 3, 4}
+    assert excluded == {1}
+
+
+@pytest.mark.parametrize(
+    "ordering, titles",
+    [
+        ("created", ["second", "third", "fourth", "first"]),
+        ("-created", ["first", "third", "fourth", "second"]),
+    ],
+)
+def test_query_set_order_by_reads_sorted_index(dated_model, mocker, ordering, titles):
+    candidates = mocker.spy(DictModelQuerySet, "_candidates")
+    query_set = dated_model.objects.order_by(ordering)
+    assert [post.title for post in query_set] == titles
+    assert [post.title for post in query_set.filter(id__gt=0)] == titles
+    assert isinstance(candidates.call_args.args[3], SortedIndex)
+    assert query_set.first().title == titles[0]
+
+
+def test_query_set_order_by_sorts_few_candidates_without_sorted_index(
+    dated_model, mocker
+):
+    mocker.patch("dict_model.query_sets.SORTED_INDEX_MIN_SELECTIVITY", 2)
+    candidates = mocker.spy(DictModelQuerySet, "_candidates")
+    query_set = dated_model.objects.filter(id=2).order_by("-created")
+    assert [post.title for post in query_set] == ["second"]
+    assert candidates.call_args.args[3] is None
+
+
+@pytest.mark.parametrize(
+    "ordering, ids", [("rank", [3, 1, 2, 4]), ("-rank", [2, 4, 1, 3])]
+)
+def test_query_set_order_by_orders_nulls_like_sorted_index(mocker, ordering, ids):
+    @dataclass
+    class Runner(DictModel):
+        rank: Optional[int] = None
+
+        indexes = (SortedIndex("rank"),)
+
+        object_data = {1: {"rank": 2}, 2: {}, 3: {"rank": 1}, 4: {}}
+
+    Runner.init()
+    assert [runner.id for runner in Runner.objects.order_by(ordering)] == ids
+    # Sorting the few candidates directly orders them the same way.
+    mocker.patch("dict_model.query_sets.SORTED_INDEX_MIN_SELECTIVITY", 1)
+    candidates = mocker.spy(DictModelQuerySet, "_candidates")
+    query_set = Runner.objects.filter(id__in=[1, 2]).order_by(ordering)
+    assert [runner.id for runner in query_set] == [id for id in ids if id < 3]
+    assert candidates.call_args.args[3] is None
+
+
+def test_query_set_update_sets_fields_on_matching_objects(dated_model):
+    count = dated_model.objects.filter(created__gte=datetime(2023, 1, 2)).update(
+        created=datetime(2022, 12, 31)
+    )
+    assert count == 3
+    assert [post.title for post in dated_model.objects.order_by("created")] == [
+        "first",
+        "third",
+        "fourth",
+        "second",
+    ]
+
+
+def test_query_set_update_raises_error_for_unknown_fields(dated_model):
+    with pytest.raises(DictModel.UnknownField):
+        dated_model.objects.all().update(body="")
+    assert not hasattr(dated_model.objects.get(id=1), "body")
+
+
+def test_query_set_delete_removes_matching_objects(dated_model):
+    query_set = dated_model.objects.exclude(title="third")
+    assert query_set.delete() == 3
+    assert list(dated_model.object_lookup) == [3]
+    assert list(query_set) == []
+
+
+def test_query_set_values_returns_field_values_of_matches(dated_model):
+    query_set = dated_model.objects.filter(created__lt=datetime(2023, 1, 3))
+    assert query_set.values("pk", "title") == [
+        {"pk": 2, "title": "second"},
+        {"pk": 3, "title": "third"},
+        {"pk": 4, "title": "fourth"},
+    ]
+    assert query_set.order_by("-title").values()[0] == {
+        "created": datetime(2023, 1, 2),
+        "id": 3,
+        "title": "third",
+    }
+
+
+def test_query_set_values_list_returns_tuples_or_flat_values(dated_model):
+    query_set = dated_model.objects.order_by("created")
+    assert query_set.values_list("id", "title")[:2] == [(2, "second"), (3, "third")]
+    assert query_set.values_list("title", flat=True) == [
+        "second",
+        "third",
+        "fourth",
+        "first",
+    ]
+    assert query_set.values_list("id")[0] == (2,)
+
+
+def test_query_set_values_list_flat_requires_single_field(dated_model):
+    with pytest.raises(DictModelQuerySet.FlatRequiresSingleField):
+        dated_model.objects.values_list("id", "title", flat=True)
+
+
+def test_query_set_values_raises_error_for_unknown_fields(dated_model):
+    with pytest.raises(DictModel.UnknownField):
+        dated_model.objects.all().values("body")
+
+
+def test_query_set_async_methods_match_sync_ones(dated_model):
+    async def query():
+        query_set = dated_model.objects.exclude(title="third").order_by("-created")
+        return (
+            [post.title async for post in query_set],
+            await query_set.acount(),
+            (await query_set.afirst()).title,
+            (await query_set.aget(created__lt=datetime(2023, 1, 2))).title,
+            await query_set.filter(title="fifth").afirst(),
+        )
+
+    assert asyncio.run(query()) == (
+        ["first", "fourth", "second"],
+        3,
+        "first",
+        "second",
+        None,
+    )
+
+
+def test_query_set_async_methods_read_evaluated_results(dated_model):
+    query_set = dated_model.objects.filter(title__in=["first", "second"])
+    assert len(query_set) == 2
+    dated_model.objects.create(title="first", created=datetime(2023, 1, 4))
+
+    async def query():
+        return [post.id async for post in query_set], await query_set.acount()
+
+    assert asyncio.run(query()) == ([1, 2], 2)
+
+
+def test_query_set_aget_raises_errors_like_get(dated_model):
+    with pytest.raises(DictModelQuerySet.DoesNotExist):
+        asyncio.run(dated_model.objects.aget(title="fifth"))
+    with pytest.raises(DictModelQuerySet.MultipleResultsFound):
+        asyncio.run(dated_model.objects.aget(created=datetime(2023, 1, 2)))
+
+
+def test_query_set_async_scans_let_other_tasks_run(dated_model, mocker):
+    mocker.patch("dict_model.query_sets.ASYNC_SCAN_BATCH_SIZE", 2)
+    events = []
+
+    async def other_task():
+        events.append("other task")
+
+    async def scan():
+        task = asyncio.create_task(other_task())
+        async for post in dated_model.objects.filter(title__startswith="f"):
+            events.append(post.title)
+        await task
+
+    asyncio.run(scan())
+    assert events == ["first", "other task", "fourth"]
+
+
+def test_query_set_explain_shows_indexes_residual_filters_and_sort(dated_model):
+    plan = (
+        dated_model.objects.filter(created__gte=datetime(2023, 1, 2))
+        .exclude(created__gt=datetime(2023, 1, 2))
+        .filter(title__startswith="f")
+        .order_by("-created")
+        .explain()
+    )
+    assert not plan.full_scan
+    assert plan.index_uses == (
+        IndexUse(("created__gte",), "SortedIndex('created')", False, 3),
+        IndexUse(("created__gt",), "SortedIndex('created')", True, 1),
+    )
+    assert plan.residual == (
+        "filter(created__gte=datetime.datetime(2023, 1, 2, 0, 0))",
+        "filter(title__startswith='f')",
+        "id not in 1 excluded ids",
+    )
+    assert plan.sort == "SortedIndex('created') (-created)"
+    assert (plan.candidates, plan.rows_scanned, plan.rows_returned) == (3, 3, 1)
+    assert str(plan).splitlines()[0] == "Index scan of Post"
+
+
+def test_query_set_explain_shows_full_scans_and_sorting(dated_model):
+    plan = dated_model.objects.filter(title__contains="i").order_by("title").explain()
+    assert plan.full_scan
+    assert plan.index_uses == ()
+    assert plan.sort == "sorted(title)"
+    assert (plan.candidates, plan.rows_scanned, plan.rows_returned) == (4, 4, 2)
+    assert "  candidates: 4 estimated, 4 actual" in str(plan).splitlines()
+
+
+def test_query_set_explain_without_analyze_does_not_run_query(dated_model, mocker):
+    scan = mocker.spy(DictModelQuerySet, "_scan")
+    plan = dated_model.objects.filter(pk__in=[1, 5]).explain(analyze=False)
+    assert plan.index_uses == (IndexUse(("pk__in",), "primary key", False, 1),)
+    assert plan.sort == "id order"
+    assert plan.rows_scanned is None and plan.rows_returned is None
+    assert "rows:" not in str(plan)
+    scan.assert_not_called()
+
+
+def test_query_set_explain_is_not_reported_as_query(dated_model):
+    with instrumentation.record_queries() as events:
+        dated_model.objects.filter(title="first").explain()
+    assert events == []
+
+
+def test_query_set_async_iteration_reads_objects_as_of_its_start(dated_model):
+    async def scan():
+        titles = []
+        async for post in dated_model.objects.all():
+            titles.append(post.title)
+            post.delete()
+            dated_model.objects.filter(id=3).delete()
+            dated_model.objects.create(title="new", created=datetime(2023, 1, 5))
+        return titles
+
+    assert asyncio.run(scan()) == ["first", "second", "fourth"]
+    assert [post.title for post in dated_model.objects.all()] == ["new"] * 3
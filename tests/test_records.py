@@ -0,0 +1,68 @@
+import dataclasses
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+import dict_model
+from dict_model.records import RecordLookup
+
+
+@dataclass
+class Launch(dict_model.DictModel):
+    name: str
+    day: Optional[date] = None
+    crew: list = dataclasses.field(default_factory=list)
+
+
+def test_record_lookup_creates_objects_when_first_read():
+    object_lookup = RecordLookup(Launch)
+    object_lookup.add_record(1, {"name": "Apollo 11", "day": "1969-07-16"})
+    assert not object_lookup.is_hydrated(1)
+    assert 1 in object_lookup
+    assert list(object_lookup) == [1]
+
+    launch = object_lookup[1]
+    assert launch == Launch(id=1, name="Apollo 11", day=date(1969, 7, 16))
+    assert object_lookup.is_hydrated(1)
+    assert object_lookup[1] is launch
+
+
+def test_record_lookup_can_hold_objects_and_records():
+    object_lookup = RecordLookup(Launch)
+    object_lookup.add_record(1, {"name": "Vostok 1"})
+    object_lookup[2] = launch = Launch(id=2, name="Gemini 3")
+    assert object_lookup.is_hydrated(2)
+    assert object_lookup[2] is launch
+    assert len(object_lookup) == 2
+
+    del object_lookup[1]
+    assert 1 not in object_lookup
+    assert object_lookup.get(1) is None
+
+
+def test_record_lookup_partial_objects_read_fields_as_objects_would():
+    object_lookup = RecordLookup(Launch)
+    object_lookup.add_record(1, {"name": "Soyuz 1", "day": "1967-04-23"})
+    object_lookup.add_record(2, {"name": "Mercury 3"})
+    object_lookup[3] = launch = Launch(id=3, name="Skylab 2", crew=["Conrad"])
+
+    days = [(obj.id, obj.day) for obj in object_lookup.partial_objects("day")]
+    assert days == [(1, date(1967, 4, 23)), (2, None), (3, None)]
+    crews = list(object_lookup.partial_objects("crew"))
+    assert [obj.crew for obj in crews] == [[], [], ["Conrad"]]
+    assert crews[2] is launch
+    assert not object_lookup.is_hydrated(1)
+    assert not object_lookup.is_hydrated(2)
+
+
+def test_record_lookup_copy_changes_independently_and_shares_created_objects():
+    object_lookup = RecordLookup(Launch)
+    object_lookup.add_record(1, {"name": "Sputnik 1"})
+    object_lookup.add_record(2, {"name": "Explorer 1"})
+    copied = object_lookup.copy()
+    del copied[2]
+    copied[3] = Launch(id=3, name="Luna 2")
+
+    assert list(object_lookup) == [1, 2]
+    assert list(copied) == [1, 3]
+    assert copied[1] is object_lookup[1]
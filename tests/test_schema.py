@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from dict_model import DictModel
+from dict_model.schema import DictModelSchema
+
+
+def test_dict_model_schema_from_dict_model_class():
+    @dataclass
+    class Meeting(DictModel):
+        topic: str
+        starts: Optional[datetime] = None
+
+    schema = DictModelSchema.from_dict_model_class(Meeting)
+    assert schema.field_names == ("id", "starts", "topic")
+    assert schema.field_name_set == frozenset(["id", "starts", "topic"])
+    assert schema.field_types == {
+        "id": Optional[int],
+        "topic": str,
+        "starts": Optional[datetime],
+    }
+
+
+def test_dict_model_schema_keeps_unresolvable_annotations_as_written():
+    @dataclass
+    class Ticket(DictModel):
+        owner: "UnknownModel"  # noqa: F821
+
+    schema = DictModelSchema.from_dict_model_class(Ticket)
+    assert schema.field_types["owner"] == "UnknownModel"
@@ -0,0 +1,38 @@
+import threading
+
+from dict_model.sequences import IdSequence
+
+
+def test_id_sequence_next_id_counts_up_from_last_id():
+    sequence = IdSequence(last_id=41)
+    assert sequence.next_id() == 42
+    assert sequence.next_id() == 43
+
+
+def test_id_sequence_observe_skips_past_explicit_ids():
+    sequence = IdSequence()
+    sequence.observe(10)
+    sequence.observe(3)
+    assert sequence.next_id() == 11
+
+
+def test_id_sequence_next_id_is_unique_across_threads():
+    sequence = IdSequence()
+    ids = []
+
+    def take_ids():
+        ids.extend(sequence.next_id() for _ in range(1000))
+
+    threads = [threading.Thread(target=take_ids) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(ids) == list(range(1, 4001))
+
+
+def test_id_sequence_reserve_takes_consecutive_ids():
+    sequence = IdSequence(last_id=2)
+    assert sequence.reserve(3) == range(3, 6)
+    assert sequence.next_id() == 6
@@ -1,5 +1,8 @@
+import enum
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Union
 
 import pytest
 
@@ -31,3 +34,43 @@ def test_dict_model_serialzier_raises_error_without_id():
     bar = Bar(id=None, foo=True)
     with pytest.raises(dict_model.DictModel.NotPersisted):
         dict_model.serializers.dict_model(bar)
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+@pytest.mark.parametrize(
+    "field_type, value, expected",
+    [
+        (datetime, datetime(2023, 1, 1, 12), "2023-01-01T12:00:00"),
+        (date, date(2023, 1, 1), "2023-01-01"),
+        (Optional[date], None, None),
+        (Decimal, Decimal("1.10"), "1.10"),
+        (Color, Color.RED, "red"),
+        (List[date], [date(2023, 1, 1)], ["2023-01-01"]),
+        (Union[date, int], 3, 3),
+        (Any, datetime(2023, 1, 1), "2023-01-01T00:00:00"),
+        (date, "2023-01-01", "2023-01-01"),
+    ],
+)
+def test_for_type_serializes_values(field_type, value, expected):
+    assert dict_model.serializers.for_type(field_type)(value) == expected
+
+
+@pytest.mark.parametrize(
+    "field_type",
+    [str, int, Optional[str], bool, dict, list, List[str], Union[int, str], Dict],
+)
+def test_for_type_returns_none_for_types_without_conversion(field_type):
+    assert dict_model.serializers.for_type(field_type) is None
+
+
+def test_for_type_serializes_dict_model_references():
+    @dataclass
+    class Qux(dict_model.DictModel):
+        baz: bool
+
+    serializer = dict_model.serializers.for_type(Optional[Qux])
+    assert serializer(Qux(id=2, baz=True)) == {"dict_model_name": "Qux", "id": 2}
+    assert serializer(None) is None
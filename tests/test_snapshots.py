@@ -0,0 +1,43 @@
+import pickle
+from dataclasses import dataclass
+
+import pytest
+
+import dict_model
+from dict_model import snapshots
+
+from . import TEST_FILES
+
+
+@pytest.fixture
+def shrub_model():
+    @dataclass
+    class Shrub(dict_model.DictModel):
+        name: str
+
+        object_data = [{"name": "holly"}]
+
+    return Shrub.init()
+
+
+def test_read_returns_stored_objects(shrub_model):
+    snapshots.write(shrub_model, TEST_FILES / "test.snapshot")
+    snapshot = snapshots.read(shrub_model, TEST_FILES / "test.snapshot")
+    assert snapshot["objects"] == [shrub_model(id=1, name="holly")]
+    assert list(snapshot["indexes"]) == ["id"]
+    assert snapshot["last_id"] == 1
+    assert snapshot["lookup_constants"] == [("HOLLY", 1)]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"not a snapshot",
+        pickle.dumps({"version": snapshots.SNAPSHOT_VERSION + 1}),
+        pickle.dumps({"version": snapshots.SNAPSHOT_VERSION, "dict_model_name": "X"}),
+    ],
+)
+def test_read_rejects_other_files(shrub_model, content):
+    (TEST_FILES / "test.snapshot").write_bytes(content)
+    with pytest.raises(dict_model.DictModel.IncompatibleSnapshot):
+        snapshots.read(shrub_model, TEST_FILES / "test.snapshot")